@@ -0,0 +1,101 @@
+"""
+Headless tool-quality analysis of the servers saved in the server registry.
+
+Runs the checks of the Inspect page (descriptions, input schemas, output schemas, annotations,
+transport and URL security) on several servers concurrently and prints a summary per server.
+The full reports can be written as JSON.
+
+Run from the repository root:
+
+    python analyze_cli.py "BMI Server"
+    python analyze_cli.py --all --output analysis.json
+    python analyze_cli.py --all --json > analysis.json
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+
+from lib.analysis_lib import analyze_servers, report_to_json, ANALYSIS_CONCURRENCY, ANALYSIS_TIMEOUT, OK, TOOL_CHECKS
+from lib.server_lib import get_servers
+
+LOG = logging.getLogger(os.path.splitext(os.path.basename(__file__))[0])
+
+
+async def _collect_reports(servers: dict, timeout: float, max_concurrency: int) -> list:
+    reports = []
+    async for report in analyze_servers(servers, timeout, max_concurrency):
+        LOG.info(f"{report['SERVER']}: {report['STATUS']} in {report['DURATION (S)']:.2f} s")
+        reports.append(report)
+    # Report in the order the servers were given, not the order they finished in
+    order = {name: index for index, name in enumerate(servers)}
+    return sorted(reports, key=lambda report: order[report["SERVER"]])
+
+
+def _print_summary(reports: list):
+    print(f"{'SERVER':<32}{'STATUS':<8}{'TOOLS':>7}" + "".join(f"{check:>18}" for check in TOOL_CHECKS)
+          + f"{'TIME (S)':>10}  SERVER CHECKS / ERROR")
+    for report in reports:
+        # Tools passing each check, out of all tools
+        tool_count = len(report["TOOL CHECKS"])
+        passed = "".join(f"{report['SUMMARY'][check].get(OK, 0):>13}/{tool_count:<4}" for check in TOOL_CHECKS)
+        failed_checks = [row["CHECK"] for row in report["SERVER CHECKS"] if row["RESULT"] != OK]
+        details = report["ERROR"] if report["ERROR"] else (f"FAILED: {', '.join(failed_checks)}" if failed_checks else OK)
+        print(f"{report['SERVER'][:31]:<32}{report['STATUS']:<8}{tool_count:>7}{passed}"
+              f"{report['DURATION (S)']:>10.2f}  {details}")
+
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(description="Analyze the tool quality of saved MCP servers")
+    parser.add_argument("servers", nargs="*", help="Names of servers saved in the server registry")
+    parser.add_argument("--all", action="store_true", help="Analyze every saved server")
+    parser.add_argument("--output", help="Write the full reports as JSON to this file")
+    parser.add_argument("--json", action="store_true", help="Print the full reports as JSON instead of the summary")
+    parser.add_argument("--concurrency", type=int, default=ANALYSIS_CONCURRENCY,
+                        help="Maximum number of servers analyzed at the same time")
+    parser.add_argument("--timeout", type=float, default=ANALYSIS_TIMEOUT,
+                        help="Seconds one server may take to connect and list its tools")
+    args = parser.parse_args(argv)
+
+    # The libraries log every tool they parse; keep the console to the summary
+    logging.basicConfig(level=logging.WARNING, format="%(asctime)s %(name)s %(levelname)s %(message)s")
+    LOG.setLevel(logging.WARNING if args.json else logging.INFO)
+
+    if args.all == bool(args.servers):
+        parser.error("give either server names or --all")
+
+    saved_servers = get_servers() or {}
+    if args.all:
+        servers = saved_servers
+    else:
+        unknown = [name for name in args.servers if name not in saved_servers]
+        if unknown:
+            parser.error(f"unknown server(s): {', '.join(unknown)}")
+        servers = {name: saved_servers[name] for name in dict.fromkeys(args.servers)}
+    if not servers:
+        LOG.warning("No servers to analyze")
+        return 0
+
+    start_time = time.perf_counter()
+    reports = asyncio.run(_collect_reports(servers, args.timeout, args.concurrency))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(report_to_json(reports))
+        LOG.info(f"Reports written to {args.output}")
+
+    failed = sum(report["STATUS"] != OK for report in reports)
+    if args.json:
+        print(report_to_json(reports))
+    else:
+        _print_summary(reports)
+        print(f"\n{len(reports) - failed} of {len(reports)} server(s) analyzed in "
+              f"{time.perf_counter() - start_time:.2f} s")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,7 +2,8 @@ import logging
 import streamlit as st
 
 from app_pages.menu import pages
-from lib.st_lib import configure_page, configure_sidebar, initialize_mcp_metadata
+from lib.st_lib import configure_page, configure_sidebar, initialize_mcp_metadata, start_rerun_profile, \
+    profile_step, show_rerun_profile
 
 logging.basicConfig(
     level=logging.INFO,
@@ -15,9 +16,19 @@ LOG = logging.getLogger(__name__)
 
 LOG.info("Started the app...")
 
-initialize_mcp_metadata()
+start_rerun_profile()
 
-configure_page()
-configure_sidebar()
+with profile_step("initialize_mcp_metadata"):
+    initialize_mcp_metadata()
 
-st.navigation(pages=pages(), expanded=True, position="sidebar").run()
\ No newline at end of file
+with profile_step("configure_page"):
+    configure_page()
+with profile_step("configure_sidebar"):
+    configure_sidebar()
+
+with profile_step("navigation"):
+    page = st.navigation(pages=pages(), expanded=True, position="sidebar")
+with profile_step(f"page: {page.title}"):
+    page.run()
+# Only reached when the page completes; st.stop and st.rerun end the script before this
+show_rerun_profile()
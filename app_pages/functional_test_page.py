@@ -1,12 +1,18 @@
+import json
 import logging
 import os
+
+import pandas as pd
 import streamlit as st
 
-from lib.common_icons import TEST_ICON, SERVER_ICON
-from lib.st_lib import set_current_page, show_info
+from lib.async_lib import run_async
+from lib.common_icons import TEST_ICON, SERVER_ICON, PLAY_ICON
+from lib.fastmcp_lib import get_tools
+from lib.load_lib import run_load_test
+from lib.st_lib import set_current_page, show_info, show_error, show_warning, h5
 
 LOG = logging.getLogger(os.path.splitext(os.path.basename(__file__))[0])
-LOG.info("Starting Manage Servers page")
+LOG.info("Starting Functional Test page")
 
 set_current_page("functional_test_page")
 
@@ -19,4 +25,76 @@ transport_type = st.session_state.mcp_metadata.get("transport_type", "")
 server_name = st.session_state.mcp_metadata.get("name", "")
 server_url = st.session_state.mcp_metadata.get("url", "")
 
-st.subheader(f"{TEST_ICON} Functional Testing [Server Name: `{server_name}`]")
\ No newline at end of file
+st.subheader(f"{TEST_ICON} Functional Testing [Server Name: `{server_name}`]")
+
+tools, tool_status = run_async(get_tools(transport_type, server_url))
+if not tools:
+    show_error(f"No tools found on the MCP server. Message from server: `{tool_status}`")
+    st.stop()
+
+h5(f"{PLAY_ICON} Load Test")
+
+with st.form("load_test_form"):
+    c1, c2 = st.columns(2, vertical_alignment="top", gap="large")
+    with c1:
+        tool_name = st.selectbox("Tool", [tool.name for tool in tools],
+                                 help="The tool that will be called repeatedly during the test.")
+        argument_sets_json = st.text_area("Argument Sets (JSON list)",
+                                          height=200,
+                                          value="[{}]",
+                                          help="A JSON list of argument objects. The workers cycle through them in order.")
+    with c2:
+        concurrency = st.slider("Concurrency", min_value=1, max_value=200, value=10, step=1,
+                                help="Number of closed-loop workers. Each worker sends the next call as soon as the previous one returns. "
+                                     "All workers share one MCP session, so this measures concurrent requests over a single connection.")
+        ramp_up_steps = st.slider("Ramp-up Steps", min_value=1, max_value=10, value=1, step=1,
+                                  help="Concurrency is increased in equal steps up to the target. Each step gets an equal share of the duration/calls.")
+        stop_mode = st.radio("Stop After", ["Duration", "Call Count"], horizontal=True)
+        stop_value = st.number_input("Duration (seconds) / Call Count", min_value=1, max_value=100000, value=10, step=1)
+
+    run_button = st.form_submit_button("Run Load Test", type="primary", icon=PLAY_ICON)
+
+if run_button:
+    try:
+        argument_sets = json.loads(argument_sets_json)
+        if isinstance(argument_sets, dict):
+            argument_sets = [argument_sets]
+        if not isinstance(argument_sets, list) or not all(isinstance(a, dict) for a in argument_sets):
+            raise ValueError("Argument sets must be a JSON list of objects.")
+    except ValueError as e:
+        show_error(f"Invalid argument sets: {e}")
+        st.stop()
+
+    with st.spinner("Running load test...", show_time=True):
+        try:
+            report = run_async(run_load_test(transport_type, server_url, tool_name, argument_sets,
+                                             concurrency=concurrency,
+                                             duration=float(stop_value) if stop_mode == "Duration" else None,
+                                             call_count=int(stop_value) if stop_mode == "Call Count" else None,
+                                             ramp_up_steps=ramp_up_steps))
+        except Exception as e:
+            show_error(f"Error running load test: {e}")
+            LOG.error(f"Error running load test: {e}")
+            st.stop()
+
+    summary = report["SUMMARY"]
+    if report["ERROR"]:
+        show_error(f"The load test stopped early: {report['ERROR']}")
+        LOG.error(f"The load test stopped early: {report['ERROR']}")
+    if summary["ERRORS"]:
+        show_warning(f"{summary['ERRORS']} of {summary['CALLS']} calls failed.")
+
+    m1, m2, m3, m4, m5, m6 = st.columns(6)
+    m1.metric("Throughput", f"{summary['THROUGHPUT (CALLS/S)']:.1f}/s")
+    m2.metric("Error Rate", f"{summary['ERROR RATE']:.1%}")
+    m3.metric("p50", f"{summary['P50 (MS)']:.0f} ms")
+    m4.metric("p90", f"{summary['P90 (MS)']:.0f} ms")
+    m5.metric("p99", f"{summary['P99 (MS)']:.0f} ms")
+    m6.metric("Max", f"{summary['MAX (MS)']:.0f} ms")
+
+    steps_df = pd.DataFrame(report["STEPS"])
+    st.write("###### Ramp-up Steps")
+    st.dataframe(steps_df, use_container_width=True, hide_index=True)
+    if len(steps_df) > 1:
+        st.write("###### Latency vs Concurrency")
+        st.line_chart(steps_df.set_index("CONCURRENCY")[["P50 (MS)", "P90 (MS)", "P99 (MS)"]])
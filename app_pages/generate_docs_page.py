@@ -1,12 +1,13 @@
-import asyncio
+import datetime
 import logging
 import os
-import shutil
 
 import streamlit as st
 
+from lib.async_lib import run_async
 from lib.common_icons import SERVER_ICON, TEST_ICON, DOCS_ICON, GENERATE_ICON, DOWNLOAD_ICON
 from lib.mcpdoc_lib import MCPServerDoc
+from lib.sink_lib import ZipSink
 from lib.st_lib import set_current_page, show_info, show_error
 
 LOG = logging.getLogger(os.path.splitext(os.path.basename(__file__))[0])
@@ -29,23 +30,20 @@ if st.button("Generate Documentation", type="primary", icon=GENERATE_ICON):
     with st.spinner("Generating documentation..."):
         try:
             mcpdoc = MCPServerDoc(server_name, transport_type, server_url)
-            asyncio.run(mcpdoc.load_schema())
-            report_folder = mcpdoc.generate_documentation()
-            # get 2nd part of the report folder path
-            report_folder_name = os.path.basename(report_folder)
-
-            # Create a zip file of the report folder
-            shutil.make_archive("reports/" + report_folder_name, 'zip', report_folder)
-
-            with open("reports/" + report_folder_name + ".zip", "rb") as f:
-                st.download_button(
-                    label="Download Documentation",
-                    data=f,
-                    file_name=report_folder_name + ".zip",
-                    mime="application/zip",
-                    icon=DOWNLOAD_ICON
-                )
+            run_async(mcpdoc.load_schema())
+            # Build the archive in memory straight from the rendered pages (no report folder on disk)
+            report_name = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+            zip_sink = ZipSink()
+            mcpdoc.generate_documentation(sink=zip_sink)
+
+            st.download_button(
+                label="Download Documentation",
+                data=zip_sink.getvalue(),
+                file_name=report_name + ".zip",
+                mime="application/zip",
+                icon=DOWNLOAD_ICON
+            )
 
         except Exception as e:
             show_error(f"Error generating documentation: {e}")
-            LOG.error(f"Error generating documentation: {e}")
\ No newline at end of file
+            LOG.error(f"Error generating documentation: {e}")
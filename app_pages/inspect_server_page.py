@@ -1,21 +1,22 @@
-import asyncio
+import contextlib
 import logging
 import os
 
 import pandas as pd
 import streamlit as st
 
+from lib.analysis_lib import analyze_tool, analyze_server_config, OK, MISSING, NOT_APPLICABLE
 from lib.common_icons import TOOL_ICON, RESOURCE_ICON, PROMPT_ICON, INPUT_ICON, INFO_ICON, OUTPUT_ICON, ANNOTATION_ICON, \
-    ANALYSIS_ICON, LIGHTBULB_ICON, GAPS_ICON, TROUBLESHOOT_ICON, CROSS_ICON, CHECK_ICON
-from lib.fastmcp_lib import get_tools
+    ANALYSIS_ICON, LIGHTBULB_ICON, GAPS_ICON, TROUBLESHOOT_ICON, CROSS_ICON, CHECK_ICON, REFRESH_ICON
+from lib.async_lib import iterate_async
+from lib.fastmcp_lib import iter_tools
 from lib.st_lib import set_current_page, show_info, h5, h6, show_error, set_compact_cols
-from lib.tool_lib import get_input_schema, get_output_schema, get_annotations, make_analysis_colorful
+from lib.tool_lib import get_input_schema, get_output_schema, get_annotations, make_analysis_colorful, \
+    NO_INPUT_PARAMS_MESSAGE, NO_OUTPUT_SCHEMA_MESSAGE, NO_OUTPUT_PARAMS_MESSAGE, NO_ANNOTATIONS_MESSAGE
 
 LOG = logging.getLogger(os.path.splitext(os.path.basename(__file__))[0])
 LOG.info("Starting MCP Explore page")
 
-asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
-
 set_compact_cols()
 
 set_current_page("inspect_server_page")
@@ -35,6 +36,9 @@ server_url = st.session_state.mcp_metadata.get("url", "")
 
 st.subheader(f"{TROUBLESHOOT_ICON} Inspect MCP Server capabilities [Server Name: `{server_name}`]")
 
+refresh_tools = st.button("Reload from server", type="secondary", icon=REFRESH_ICON,
+                          help="Capabilities are cached between page interactions. Click to fetch them again from the server.")
+
 # if st.button(f"Load Server Details",
 #              key="load_mcp_details",
 #              help="Click to load MCP supported tools",
@@ -48,84 +52,93 @@ server_summary_slot = st.empty()
 tabTools, tabResources, tabPrompts = st.tabs([f"{TOOL_ICON} Tools", f"{RESOURCE_ICON} Resources", f"{PROMPT_ICON} Prompts"])
 
 with tabTools:
-    with st.spinner("Fetching tools from the MCP server...", show_time=True):
-        # mcp_client = asyncio.run(get_client())
-        mcp_tools, status_message = asyncio.run(get_tools())
-
-        if len(mcp_tools) == 0:
-            st.error(f"No tools found on the MCP server. Message from server: `{status_message}`")
-            LOG.error(f"No tools found on the MCP server. Message from server: {status_message}")
-            # st.stop()
-
-    if mcp_tools:
-        # st.success(f"Successfully fetched {len(mcp_tools)} tools from the MCP server.")
-        LOG.info(f"Successfully fetched {len(mcp_tools)} tools from the MCP server.")
-
-        # This section holds summary & recommendations
-        with st.container(border=True):
-            observations = []
-            tool_heading_slot = st.empty()
-            summary_slot = st.empty()
-            summary_recommendations_slot = st.empty()
-
-        with st.container(border=True):
-            h5(f"{GAPS_ICON} In-depth Tool-level Checks")
-            for tool in mcp_tools:
-                with st.status(f"{TOOL_ICON} Inspecting tool: `{tool['NAME']}`...",) as status:
-                    tool_observations = {"TOOL NAME": tool["NAME"]}
-
-                    h5(f"{TOOL_ICON} {tool['NAME']}")
+    # This section holds summary & recommendations
+    with st.container(border=True):
+        observations = []
+        tool_heading_slot = st.empty()
+        tool_list_error_slot = st.empty()
+        summary_slot = st.empty()
+        summary_recommendations_slot = st.empty()
+
+    fetch_error = None
+    with st.container(border=True):
+        h5(f"{GAPS_ICON} In-depth Tool-level Checks")
+        # Tools are rendered page by page as they arrive from the server. Only fetching the next tool is
+        # guarded, so a failing page of the tool list is reported as a server error and a rendering bug is not
+        with st.spinner("Fetching tools from the MCP server...", show_time=True), \
+                contextlib.closing(iterate_async(iter_tools(transport_type, server_url, refresh=refresh_tools))) as tools:
+            while True:
+                try:
+                    tool = next(tools)
+                except StopIteration:
+                    break
+                except Exception as e:
+                    fetch_error = e
+                    break
+
+                with st.status(f"{TOOL_ICON} Inspecting tool: `{tool.name}`...",) as status:
+                    tool_observations = analyze_tool(tool)
+
+                    h5(f"{TOOL_ICON} {tool.name}")
                     h6(f"{INFO_ICON} Description")
-                    if tool.get("DESCRIPTION", ""):
-                        st.code(tool["DESCRIPTION"], language="text", wrap_lines=True)
-                        tool_observations["TOOL DESCRIPTION"] = "OK"
+                    if tool_observations["TOOL DESCRIPTION"] == OK:
+                        st.code(tool.description, language="text", wrap_lines=True)
                     else:
                         show_error("No description found for this tool.")
-                        tool_observations["TOOL DESCRIPTION"] = "MISSING"
 
                     h6(f"{INPUT_ICON} Input Parameters")
-                    try:
-                        input_schema, result = get_input_schema(tool)
-                        st.dataframe(input_schema, hide_index=True)
-                        tool_observations["INPUT SCHEMA"] = result
-                    except ValueError as e:
-                        st.error(f"No input parameters found!: `[{e}]`")
-                        LOG.error(f"No input parameters found!: [{e}]")
-                        tool_observations["INPUT SCHEMA"] = "NA"
+                    if tool_observations["INPUT SCHEMA"] != NOT_APPLICABLE:
+                        st.dataframe(get_input_schema(tool)[0], hide_index=True)
+                    else:
+                        st.error(f"No input parameters found!: `[{NO_INPUT_PARAMS_MESSAGE}]`")
+                        LOG.error(f"No input parameters found!: [{NO_INPUT_PARAMS_MESSAGE}]")
 
                     h6(f"{OUTPUT_ICON} Output Parameters")
-                    try:
-                        output_schema = get_output_schema(tool)
-                        st.dataframe(output_schema, hide_index=True)
-                        tool_observations["OUTPUT SCHEMA"] = "OK"
-                    except ValueError as e:
-                        st.error(f"No output parameters found!: `[{e}]`")
-                        LOG.error(f"No output parameters found!: [{e}]")
-                        tool_observations["OUTPUT SCHEMA"] = "MISSING"
+                    if tool_observations["OUTPUT SCHEMA"] == OK:
+                        st.dataframe(get_output_schema(tool), hide_index=True)
+                    else:
+                        reason = NO_OUTPUT_SCHEMA_MESSAGE if not tool.output_schema else NO_OUTPUT_PARAMS_MESSAGE
+                        st.error(f"No output parameters found!: `[{reason}]`")
+                        LOG.error(f"No output parameters found!: [{reason}]")
 
                     h6(f"{ANNOTATION_ICON} Annotations")
-                    try:
-                        annotations, result = get_annotations(tool)
-                        st.dataframe(annotations, hide_index=True)
-                        tool_observations["ANNOTATIONS"] = result
-                    except ValueError as e:
-                        st.error(f"No annotations found!: `[{e}]`")
-                        LOG.error(f"No annotations found!: [{e}]")
-                        tool_observations["ANNOTATIONS"] = "MISSING"
-
-                    status.update(label=f"{TOOL_ICON} {tool['NAME']}", state="complete", expanded=False)
+                    if tool_observations["ANNOTATIONS"] != MISSING:
+                        st.dataframe(get_annotations(tool)[0], hide_index=True)
+                    else:
+                        st.error(f"No annotations found!: `[{NO_ANNOTATIONS_MESSAGE}]`")
+                        LOG.error(f"No annotations found!: [{NO_ANNOTATIONS_MESSAGE}]")
+
+                    status.update(label=f"{TOOL_ICON} {tool.name}", state="complete", expanded=False)
                     observations.append(tool_observations)
 
+    if fetch_error is not None and observations:
+        # The heading slot is filled with the summary below, so the error gets a slot of its own
+        tool_list_error_slot.error(f"The tool list is incomplete: only {len(observations)} tools were fetched before "
+                                   f"the server returned an error. Message from server: `{fetch_error}`")
+        LOG.error(f"The tool list is incomplete after {len(observations)} tools. Message from server: {fetch_error}")
+    elif fetch_error is not None:
+        tool_heading_slot.error(f"No tools found on the MCP server. Message from server: `{fetch_error}`")
+        LOG.error(f"No tools found on the MCP server. Message from server: {fetch_error}")
+    elif not observations:
+        tool_heading_slot.error("No tools found on the MCP server.")
+        LOG.error("No tools found on the MCP server.")
+
+    if observations:
+        # st.success(f"Successfully fetched {len(observations)} tools from the MCP server.")
+        LOG.info(f"Successfully fetched {len(observations)} tools from the MCP server.")
+
         # Display summary of observations
         summary_heading_slot.markdown(f"##### {ANALYSIS_ICON} Server-level Checks",
                                       help="This section provides an overview of the server's transport type and URL security.")
 
-        if transport_type == "SSE":
-            transport_msg = f":red-background[❌ Server uses **SSE Transport** which is _deprecated_ as of 2025-03-26]. Recommend switching to **Streamable-HTTP Transport**. [See specs.](https://modelcontextprotocol.io/docs/concepts/transports#server-sent-events-sse-deprecated)"
-        elif transport_type == "Streamable-HTTP":
+        # Server-level checks come from the analysis engine; only their presentation lives here
+        server_checks = {row["CHECK"]: row for row in analyze_server_config(transport_type, server_url)}
+        if server_checks["TRANSPORT"]["RESULT"] == OK:
             transport_msg = f":green-background[✅ Server is using **Streamable-HTTP Transport** which is the recommended transport as of 2025-03-26]."
+        else:
+            transport_msg = f":red-background[❌ Server uses **SSE Transport** which is _deprecated_ as of 2025-03-26]. Recommend switching to **Streamable-HTTP Transport**. [See specs.](https://modelcontextprotocol.io/docs/concepts/transports#server-sent-events-sse-deprecated)"
 
-        if "https://" in server_url:
+        if server_checks["SECURE URL"]["RESULT"] == OK:
             url_msg = f":green-background[✅ Server URL uses **Secure http**]"
         else:
             url_msg = f":red-background[❌ Server URL does not use **Secure http**. Consider using **https** for secure communication.]"
@@ -1,16 +1,17 @@
-import asyncio
 import logging
 import os
 import time
 
-import pandas as pd
 import streamlit as st
 
-from lib.common_icons import SERVER_ICON, PRIORITY_ICON, DELETE_ICON, TEST_SERVER_ICON, ADD_ICON
-from lib.fastmcp_lib import test_selected_server
-from lib.server_lib import get_servers, save_server_in_file, delete_server
+from lib.async_lib import run_async, iterate_async
+from lib.common_icons import SERVER_ICON, PRIORITY_ICON, DELETE_ICON, TEST_SERVER_ICON, ADD_ICON, HEALTH_CHECK_ICON, \
+    REFRESH_ICON
+from lib.fastmcp_lib import test_selected_server, check_servers, SERVER_CHECK_TIMEOUT, SERVER_CHECK_CONCURRENCY
+from lib.probe_lib import probe_server, PROBE_SAMPLES
+from lib.server_lib import get_servers, save_server_in_file, delete_server, import_servers_from_file, SERVERS_FILE
 from lib.st_lib import set_current_page, set_compact_cols, show_warning, show_success, \
-    reset_mcp_metadata, show_error, h6
+    reset_mcp_metadata, show_error, h6, get_servers_dataframe, profile_step, clear_ui_caches
 
 LOG = logging.getLogger(os.path.splitext(os.path.basename(__file__))[0])
 LOG.info("Starting Manage Servers page")
@@ -21,12 +22,14 @@ set_current_page("manage_servers_page")
 
 st.subheader(f"{SERVER_ICON} Manage MCP Servers")
 
+# One registry read per rerun (cached per registry version); the DataFrame is built from it and cached per content
 servers = get_servers()
-df = pd.DataFrame(servers).transpose()
+with profile_step("servers_dataframe"):
+    df = get_servers_dataframe(servers)
 if df.empty:
     show_warning("No MCP servers found. Please add a new server.")
 
-tab_main, tab_add_server = st.tabs(["Manage Existing Servers", "Add New Server"])
+tab_main, tab_health_check, tab_add_server = st.tabs(["Manage Existing Servers", "Check All Servers", "Add New Server"])
 
 with tab_main:
     saved_servers = st.dataframe(df, use_container_width=True, hide_index=False, selection_mode="single-row", on_select="rerun")
@@ -66,6 +69,7 @@ with tab_main:
         if delete_server_button_clicked:
             try:
                 delete_server(selected_index)
+                clear_ui_caches()
                 reset_mcp_metadata()
                 show_success(f"Server [{selected_index}] deleted successfully.")
                 LOG.info(f"Server [{selected_index}] deleted successfully.")
@@ -76,16 +80,76 @@ with tab_main:
                 LOG.error(f"Error deleting server [{selected_index}]: {e}")
 
         if test_server_button_clicked:
-            server_available, server_error = asyncio.run(test_selected_server(selected_row["TRANSPORT_TYPE"], selected_row["URL"]))
+            server_available, server_error = run_async(test_selected_server(selected_row["TRANSPORT_TYPE"], selected_row["URL"]))
             if server_available:
                 show_success(f"Server [{selected_index}] is reachable.")
                 LOG.info(f"Server [{selected_index}] is reachable.")
+
+                # Only a reachable server is worth probing; a dead one would just time out every sample
+                with st.spinner(f"Measuring connection phases ({PROBE_SAMPLES} samples)...", show_time=True):
+                    phase_rows, probe_errors = run_async(probe_server(selected_row["TRANSPORT_TYPE"], selected_row["URL"]))
+                h6("Connection Phases")
+                st.dataframe(phase_rows, use_container_width=True, hide_index=True,
+                             column_config={
+                                 "MIN (MS)": st.column_config.NumberColumn(format="%.1f"),
+                                 "MEDIAN (MS)": st.column_config.NumberColumn(format="%.1f"),
+                                 "MAX (MS)": st.column_config.NumberColumn(format="%.1f"),
+                             })
+                st.caption("DNS, TCP, TLS and first byte are measured on a raw connection to the server URL; "
+                           "MCP initialize and ping on a fresh MCP session. TLS applies to https URLs only.")
+                for probe_error in probe_errors:
+                    show_warning(probe_error)
+                    LOG.warning(f"Connection probe of [{selected_index}] failed: {probe_error}")
             else:
                 show_error(f"Error connecting to server [{selected_index}]: {server_error}")
                 LOG.error(f"Error connecting to server [{selected_index}]: {server_error}")
 
 
 
+
+with tab_health_check:
+    st.markdown("**Check All Registered Servers**")
+    c1, c2, c3 = st.columns(3, vertical_alignment="bottom")
+    with c1:
+        check_timeout = st.number_input("Timeout per Server (seconds)", min_value=1.0, max_value=120.0,
+                                        value=SERVER_CHECK_TIMEOUT, step=1.0,
+                                        help="Servers that do not complete the handshake and tool listing in time are reported as timed out.")
+    with c2:
+        check_concurrency = st.number_input("Servers Checked in Parallel", min_value=1, max_value=64,
+                                            value=SERVER_CHECK_CONCURRENCY, step=1)
+    with c3:
+        check_all_button_clicked = st.button("Check All", type="primary", icon=HEALTH_CHECK_ICON,
+                                             disabled=not servers)
+
+    check_column_config = {
+        "HANDSHAKE (MS)": st.column_config.NumberColumn(format="%.1f"),
+        "TOOLS": st.column_config.NumberColumn(format="%d"),
+    }
+    check_table = st.empty()
+
+    if check_all_button_clicked:
+        LOG.info(f"Checking {len(servers)} servers")
+        check_rows = []
+        check_progress = st.progress(0.0, text="Checking servers...")
+        for check_row in iterate_async(check_servers(servers, timeout=check_timeout,
+                                                     max_concurrency=int(check_concurrency))):
+            check_rows.append(check_row)
+            check_progress.progress(len(check_rows) / len(servers),
+                                    text=f"Checked {len(check_rows)} of {len(servers)} servers")
+            check_table.dataframe(check_rows, use_container_width=True, hide_index=True,
+                                  column_config=check_column_config)
+        check_progress.empty()
+        st.session_state["server_check_rows"] = check_rows
+    elif st.session_state.get("server_check_rows"):
+        check_table.dataframe(st.session_state["server_check_rows"], use_container_width=True, hide_index=True,
+                              column_config=check_column_config)
+
+    check_rows = st.session_state.get("server_check_rows", [])
+    if check_rows:
+        reachable_count = sum(1 for row in check_rows if row["STATUS"] == "Reachable")
+        st.caption(f"`{reachable_count}` of `{len(check_rows)}` servers reachable. Click a column header to sort.")
+
+
 with tab_add_server:
     st.markdown("**Add New MCP Server**")
 
@@ -108,10 +172,26 @@ with tab_add_server:
             else:
                 try:
                     save_server_in_file(server_name, transport_type, url)
+                    clear_ui_caches()
                     show_success(f"Server [{server_name}] added successfully.")
                     LOG.info(f"Server [{server_name}] added successfully.")
                     time.sleep(5)
                     st.rerun()
                 except Exception as e:
                     show_warning(f"Error adding server: {e}")
-                    LOG.error(f"Error adding server [{server_name}]: {e}")
\ No newline at end of file
+                    LOG.error(f"Error adding server [{server_name}]: {e}")
+
+    st.markdown("**Reload Servers from File**")
+    st.caption(f"`{SERVERS_FILE}` mirrors the saved servers and is rewritten after every change. "
+               f"After editing it by hand, reload it to replace the saved servers with its content.")
+    if st.button("Reload from File", type="secondary", icon=REFRESH_ICON):
+        try:
+            imported_count = import_servers_from_file()
+            clear_ui_caches()
+            show_success(f"Reloaded {imported_count} server(s) from `{SERVERS_FILE}`.")
+            LOG.info(f"Reloaded {imported_count} server(s) from {SERVERS_FILE}")
+            time.sleep(3)
+            st.rerun()
+        except Exception as e:
+            show_warning(f"Error reloading servers from file: {e}")
+            LOG.error(f"Error reloading servers from {SERVERS_FILE}: {e}")
@@ -1,6 +1,6 @@
 import streamlit as st
 
-from lib.common_icons import SERVER_ICON, HOME_ICON, TROUBLESHOOT_ICON, PLAY_ICON, TEST_ICON, DOCS_ICON
+from lib.common_icons import SERVER_ICON, HOME_ICON, TROUBLESHOOT_ICON, PLAY_ICON, TEST_ICON, DOCS_ICON, METRICS_ICON
 
 about_page = st.Page("app_pages/about_page.py",
                      title="About",
@@ -27,11 +27,15 @@ generate_docs_page = st.Page("app_pages/generate_docs_page.py",
                              title="Generate Server Documentation",
                              icon=DOCS_ICON)
 
+metrics_page = st.Page("app_pages/metrics_page.py",
+                       title="Request Metrics",
+                       icon=METRICS_ICON)
+
 
 def pages():
     return {
         "Home": [about_page, manage_servers_page, ],
         "Explore Server Capabilities": [inspect_server_page, playground_page],
         "Documentation": [generate_docs_page],
-        "Test MCP Server": [functional_test_page],
+        "Test MCP Server": [functional_test_page, metrics_page],
     }
\ No newline at end of file
@@ -0,0 +1,49 @@
+import logging
+import os
+
+import pandas as pd
+import streamlit as st
+
+from lib.common_icons import METRICS_ICON, DELETE_ICON, REFRESH_ICON
+from lib.metrics_lib import get_metrics_registry
+from lib.st_lib import set_current_page, show_info
+
+LOG = logging.getLogger(os.path.splitext(os.path.basename(__file__))[0])
+LOG.info("Starting Request Metrics page")
+
+set_current_page("metrics_page")
+
+st.subheader(f"{METRICS_ICON} Request Metrics")
+st.caption("Latency, errors and payload sizes of the MCP requests made by this app since the last reset. "
+           "Percentiles are approximate (log-bucketed histograms).")
+
+metrics_registry = get_metrics_registry()
+
+c1, c2, c3 = st.columns([4, 1, 1], vertical_alignment="bottom")
+with c1:
+    group_by = st.multiselect("Group By",
+                              ["SERVER", "METHOD", "TOOL"],
+                              default=["SERVER", "METHOD", "TOOL"],
+                              help="Requests of the keys in a group are merged into one row.")
+with c2:
+    st.button("Refresh", icon=REFRESH_ICON, use_container_width=True)
+with c3:
+    if st.button("Reset", icon=DELETE_ICON, use_container_width=True):
+        metrics_registry.reset()
+        LOG.info("Request metrics reset")
+
+rows = metrics_registry.summary_rows(tuple(group_by))
+if not rows:
+    show_info("No MCP requests recorded yet.")
+    st.stop()
+
+st.dataframe(pd.DataFrame(rows),
+             use_container_width=True,
+             hide_index=True,
+             column_config={
+                 "MEAN (MS)": st.column_config.NumberColumn(format="%.1f"),
+                 "P50 (MS)": st.column_config.NumberColumn(format="%.1f"),
+                 "P90 (MS)": st.column_config.NumberColumn(format="%.1f"),
+                 "P99 (MS)": st.column_config.NumberColumn(format="%.1f"),
+                 "MAX (MS)": st.column_config.NumberColumn(format="%.1f"),
+             })
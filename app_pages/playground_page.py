@@ -1,15 +1,18 @@
-import asyncio
 import json
 import logging
 import os
+import time
 
 import streamlit as st
 
 from lib.common_icons import EXPLORE_ICON, PLAY_ICON, PROMPT_ICON, LLM_ICON, QUESTION_ICON, PLUGIN_ICON, TOOL_ICON, \
     SELECT_ICON, EXECUTE_ICON
-from lib.fastmcp_lib import get_client, get_tools, call_tool
-from lib.openai_lib import get_llm_tool_selection_response
+from lib.async_lib import run_async, iterate_async
+from lib.fastmcp_lib import get_tools, call_tools, get_tool_result_cache
+from lib.openai_lib import get_llm_tool_selection_response_async, stream_llm_tool_selection_response_async, \
+    get_llm_response_cache
 from lib.st_lib import set_current_page, show_info, show_error, show_success
+from lib.trace_lib import start_trace, span, get_waterfall_rows, TRACE_DIR
 
 LOG = logging.getLogger(os.path.splitext(os.path.basename(__file__))[0])
 LOG.info("Starting MCP Explore page")
@@ -45,6 +48,12 @@ with st.expander("LLM Settings", expanded=False, icon=":material/settings:"):
                                 help="Controls the randomness of the output. Lower values make the output more deterministic, while higher values make it more random.")
         top_p = st.slider("Top P", min_value=0.0, max_value=1.0, value=0.9, step=0.1,
                           help="Controls the diversity of the output by considering only the top P probability mass. A value of 1.0 means no restriction.")
+        max_parallel_calls = st.slider("Max Parallel Tool Calls", min_value=1, max_value=8, value=4, step=1,
+                                       help="Maximum number of tool calls executed at the same time. Only read-only and idempotent (non-destructive) tools are run in parallel.")
+        bypass_tool_cache = st.checkbox("Bypass Tool Result Cache", value=False,
+                                        help="Results of read-only and idempotent tools are cached for a short time. Check to always call the MCP server.")
+        llm_cache_mode = st.selectbox("Tool Selection Cache", ["Auto", "On", "Off"], index=0,
+                                      help="Cache LLM tool-selection responses on local disk. **Auto** caches only deterministic requests (Temperature 0).")
         LOG.info(f"LLM settings - Max Tokens: {max_tokens}, Temperature: {temperature}, Top P: {top_p}")
 
 c21, c22 = st.columns(2, vertical_alignment="bottom", gap="large")
@@ -65,133 +74,185 @@ if submit_button:
     else:
         LOG.info(f"Question submitted: {question[:50]}...")  # Log first 50 chars for brevity
 
-        with st.status(f"{PLUGIN_ICON} Plug-in the MCP Server", expanded=True) as plugin_status:
-            data = [{"SERVER NAME": server_name, "SERVER URL": server_url, "TRANSPORT TYPE": transport_type}]
-            st.dataframe(data, use_container_width=True, hide_index=True)
-            plugin_status.update(label=f"{PLUGIN_ICON} Plug-in the MCP Server", state="complete", expanded=False)
-
-
-        with st.status(f"{TOOL_ICON} Fetch MCP tools", expanded=True) as tool_list_status:
-            tools, tool_status = asyncio.run(get_tools())
-            tools_list = []
-            for tool in tools:
-                record = {"TOOL _NAME": tool["NAME"], "DESCRIPTION": tool["DESCRIPTION"]}
-                tools_list.append(record)
-
-            st.write("###### Available Tools")
-            st.dataframe(tools_list, use_container_width=True, hide_index=True)
-            tool_list_status.update(label=f"{TOOL_ICON} Fetch MCP tools.", state="complete", expanded=False)
-
-
-        with st.status(f"{SELECT_ICON} Request tool selection by the LLM", expanded=True) as tool_sent_status:
-            aoai_tools = [
-                {
-                    "type": "function",
-                    "function": {
-                        "name": tool["NAME"],
-                        "description": tool["DESCRIPTION"],
-                        "parameters": tool["INPUT_SCHEMA"]
-                    }
-                } for tool in tools
-            ]
-
-            aoai_tools_json = json.dumps(aoai_tools, indent=2)
-            st.write("##### Details sent to LLM")
-            c31, c32 = st.columns(2, vertical_alignment="top")
-            with c31:
-                st.write("###### System Prompt")
-                st.code(system_prompt, language="text", wrap_lines=True, height=100)
-            with c32:
-                st.write("###### Question")
-                st.code(question, language="text", wrap_lines=True, height=100)
-            st.write("###### Tools Details")
-            st.json(aoai_tools_json, expanded=True)
-
-            tool_sent_status.update(label=f"{SELECT_ICON} Request tool selection by the LLM.", state="complete", expanded=False)
-
-        with st.status(f"{LLM_ICON} Receive Tool Selection by LLM", expanded=True) as llm_response_status:
-            try:
-                messages = [{"role": "system", "content": system_prompt},
-                            {"role": "user", "content": question}]
-                message = get_llm_tool_selection_response(
-                    model="gpt-4.1-mini",
-                    max_tokens=max_tokens,
-                    temperature=temperature,
-                    top_p=top_p,
-                    messages=messages,
-                    tools=aoai_tools
-                )
-            except Exception as e:
-                show_error(f"Error getting LLM response: {e}")
-                LOG.error(f"Error getting LLM response: {e}")
-                llm_response_status.update(label=f":red[Error getting LLM response: {e}]", state="error", expanded=False)
-                st.stop()
-
-            if message.content:
-                st.write("###### LLM Response")
-                st.code(message.content, language="text", wrap_lines=True, height=100)
-            if message.tool_calls:
-                st.write("###### LLM selected the following tool calls along with arguments:")
-
-                calls = []
-                for tool_call in message.tool_calls:
-                    call_record = {
-                        "TOOL CALL ID": tool_call.id,
-                        "TOOL NAME": tool_call.function.name,
-                        "TOOL ARGUMENTS": tool_call.function.arguments,
-                    }
-                    calls.append(call_record)
-                st.dataframe(calls, use_container_width=True, hide_index=True)
-            else:
-                show_info("No tools were selected by the LLM.")
-            llm_response_status.update(label=f"{LLM_ICON} Receive Tool Selection by LLM.", state="complete", expanded=False)
-
-        if message.tool_calls:
-            with st.status(f"{EXECUTE_ICON} Execute Selected Tools", expanded=True) as tool_exec_status:
-                for call in message.tool_calls:
-                    call_result, call_status = asyncio.run(call_tool(call))
-                    if call_status != "Success":
-                        show_error(f"Error calling tool `{call.function.name}`: {call_status}")
-                        LOG.error(f"Error calling tool `{call.function.name}`: {call_status}")
-                    else:
-                        with st.container(border=True):
-                            tool_summary = [{"ID": call.id, "TOOL": call.function.name, "ARGUMENTS": call.function.arguments}]
-                            st.write("###### Tool Call Summary")
-                            st.dataframe(tool_summary, use_container_width=True, hide_index=True)
-                            st.write("###### Tool Call Result")
-                            st.write(f"**Result**: {call_result.content if call_result.content else ''}")
-                            st.write(f"**Structured Result**: {call_result.structured_content if call_result.structured_content else ''}  :primary-badge[*This is part of the MCP protocol version 2025-06-18.*]")
-
-                        messages.append({
-                            "role": "assistant",
-                            "tool_call_id": call.id,
-                            "content": call_result.content[0].text
-                        })
-
-                tool_exec_status.update(label=f"{EXECUTE_ICON} Execute Selected Tools.", state="complete", expanded=False)
-
-            with st.status(f"{LLM_ICON} Final LLM Response", expanded=True) as final_llm_status:
+        with start_trace("playground_run", server=server_url, model="gpt-4.1-mini") as trace:
+            with st.status(f"{PLUGIN_ICON} Plug-in the MCP Server", expanded=True) as plugin_status, span("plug_in_server"):
+                data = [{"SERVER NAME": server_name, "SERVER URL": server_url, "TRANSPORT TYPE": transport_type}]
+                st.dataframe(data, use_container_width=True, hide_index=True)
+                plugin_status.update(label=f"{PLUGIN_ICON} Plug-in the MCP Server", state="complete", expanded=False)
+
+
+            with st.status(f"{TOOL_ICON} Fetch MCP tools", expanded=True) as tool_list_status, span("fetch_tools"):
+                tools, tool_status = run_async(get_tools(transport_type, server_url))
+                tools_list = []
+                for tool in tools:
+                    record = {"TOOL _NAME": tool.name, "DESCRIPTION": tool.description}
+                    tools_list.append(record)
+
+                st.write("###### Available Tools")
+                st.dataframe(tools_list, use_container_width=True, hide_index=True)
+                tool_list_status.update(label=f"{TOOL_ICON} Fetch MCP tools.", state="complete", expanded=False)
+
+
+            with st.status(f"{SELECT_ICON} Request tool selection by the LLM", expanded=True) as tool_sent_status, \
+                    span("build_tool_payload") as payload_span:
+                aoai_tools = [
+                    {
+                        "type": "function",
+                        "function": {
+                            "name": tool.name,
+                            "description": tool.description,
+                            "parameters": tool.input_schema
+                        }
+                    } for tool in tools
+                ]
+
+                aoai_tools_json = json.dumps(aoai_tools, indent=2)
+                payload_span.set_attributes(tool_count=len(aoai_tools), payload_bytes=len(aoai_tools_json.encode("utf-8")))
+                st.write("##### Details sent to LLM")
+                c31, c32 = st.columns(2, vertical_alignment="top")
+                with c31:
+                    st.write("###### System Prompt")
+                    st.code(system_prompt, language="text", wrap_lines=True, height=100)
+                with c32:
+                    st.write("###### Question")
+                    st.code(question, language="text", wrap_lines=True, height=100)
+                st.write("###### Tools Details")
+                st.json(aoai_tools_json, expanded=True)
+
+                tool_sent_status.update(label=f"{SELECT_ICON} Request tool selection by the LLM.", state="complete", expanded=False)
+
+            with st.status(f"{LLM_ICON} Receive Tool Selection by LLM", expanded=True) as llm_response_status, \
+                    span("tool_selection"):
                 try:
-                    final_message = get_llm_tool_selection_response(
+                    messages = [{"role": "system", "content": system_prompt},
+                                {"role": "user", "content": question}]
+                    message = run_async(get_llm_tool_selection_response_async(
                         model="gpt-4.1-mini",
                         max_tokens=max_tokens,
                         temperature=temperature,
                         top_p=top_p,
                         messages=messages,
                         tools=aoai_tools,
-                        tool_choice="none"
-                    )
-
-                    st.write("###### Final LLM Response")
-                    st.markdown(final_message.content,)
-
+                        use_cache={"Auto": None, "On": True, "Off": False}[llm_cache_mode]
+                    ))
                 except Exception as e:
-                    show_error(f"Error getting final LLM response: {e}")
-                    LOG.error(f"Error getting final LLM response: {e}")
-                    final_llm_status.update(label=f":red[Error getting final LLM response: {e}]", state="error", expanded=True)
-
-        else:
-            show_error("No tools were selected by the LLM.")
-
+                    show_error(f"Error getting LLM response: {e}")
+                    LOG.error(f"Error getting LLM response: {e}")
+                    llm_response_status.update(label=f":red[Error getting LLM response: {e}]", state="error", expanded=False)
+                    st.stop()
+
+                if message.content:
+                    st.write("###### LLM Response")
+                    st.code(message.content, language="text", wrap_lines=True, height=100)
+                if message.tool_calls:
+                    st.write("###### LLM selected the following tool calls along with arguments:")
+
+                    calls = []
+                    for tool_call in message.tool_calls:
+                        call_record = {
+                            "TOOL CALL ID": tool_call.id,
+                            "TOOL NAME": tool_call.function.name,
+                            "TOOL ARGUMENTS": tool_call.function.arguments,
+                        }
+                        calls.append(call_record)
+                    st.dataframe(calls, use_container_width=True, hide_index=True)
+                else:
+                    show_info("No tools were selected by the LLM.")
+                llm_cache_stats = get_llm_response_cache().stats()
+                st.caption(f"Tool selection cache: `{llm_cache_stats['HITS']}` hits / `{llm_cache_stats['MISSES']}` misses "
+                           f"({llm_cache_stats['ENTRIES']} cached responses)")
+                llm_response_status.update(label=f"{LLM_ICON} Receive Tool Selection by LLM.", state="complete", expanded=False)
 
+            if message.tool_calls:
+                with st.status(f"{EXECUTE_ICON} Execute Selected Tools", expanded=True) as tool_exec_status, \
+                        span("tool_execution"):
+                    call_results = run_async(call_tools(transport_type, server_url, message.tool_calls, tools,
+                                                        max_concurrency=max_parallel_calls,
+                                                        use_cache=not bypass_tool_cache))
+                    for call, (call_result, call_status) in zip(message.tool_calls, call_results):
+                        if call_status != "Success":
+                            show_error(f"Error calling tool `{call.function.name}`: {call_status}")
+                            LOG.error(f"Error calling tool `{call.function.name}`: {call_status}")
+                        else:
+                            with st.container(border=True):
+                                tool_summary = [{"ID": call.id, "TOOL": call.function.name, "ARGUMENTS": call.function.arguments}]
+                                st.write("###### Tool Call Summary")
+                                st.dataframe(tool_summary, use_container_width=True, hide_index=True)
+                                st.write("###### Tool Call Result")
+                                st.write(f"**Result**: {call_result.content if call_result.content else ''}")
+                                st.write(f"**Structured Result**: {call_result.structured_content if call_result.structured_content else ''}  :primary-badge[*This is part of the MCP protocol version 2025-06-18.*]")
+
+                            messages.append({
+                                "role": "assistant",
+                                "tool_call_id": call.id,
+                                "content": call_result.content[0].text
+                            })
+
+                    tool_cache_stats = get_tool_result_cache().stats()
+                    if tool_cache_stats:
+                        st.write("###### Tool Result Cache")
+                        st.dataframe(tool_cache_stats, use_container_width=True, hide_index=True,
+                                     column_config={"HIT RATE": st.column_config.ProgressColumn("HIT RATE", format="percent",
+                                                                                                min_value=0.0, max_value=1.0)})
+
+                    tool_exec_status.update(label=f"{EXECUTE_ICON} Execute Selected Tools.", state="complete", expanded=False)
+
+                with st.status(f"{LLM_ICON} Final LLM Response", expanded=True) as final_llm_status, \
+                        span("final_answer"):
+                    try:
+                        final_deltas = iterate_async(stream_llm_tool_selection_response_async(
+                            model="gpt-4.1-mini",
+                            max_tokens=max_tokens,
+                            temperature=temperature,
+                            top_p=top_p,
+                            messages=messages,
+                            tools=aoai_tools,
+                            tool_choice="none"
+                        ))
+
+                        st.write("###### Final LLM Response")
+                        stream_timings = {}
+
+                        def timed_deltas(deltas):
+                            """Pass the deltas through while recording time to first token and total time."""
+                            start_time = time.perf_counter()
+                            for delta in deltas:
+                                if "TTFT" not in stream_timings:
+                                    stream_timings["TTFT"] = time.perf_counter() - start_time
+                                yield delta
+                            stream_timings["TOTAL"] = time.perf_counter() - start_time
+
+                        st.write_stream(timed_deltas(final_deltas))
+                        st.caption(f"Time to first token: `{stream_timings.get('TTFT', 0) * 1000:.0f} ms` | "
+                                   f"Total time: `{stream_timings.get('TOTAL', 0) * 1000:.0f} ms`")
+                        LOG.info(f"Final LLM response streamed: {stream_timings}")
+
+                    except Exception as e:
+                        show_error(f"Error getting final LLM response: {e}")
+                        LOG.error(f"Error getting final LLM response: {e}")
+                        final_llm_status.update(label=f":red[Error getting final LLM response: {e}]", state="error", expanded=True)
 
+            else:
+                show_error("No tools were selected by the LLM.")
+
+        st.write("###### Latency Waterfall")
+        st.caption(f"Trace `{trace.trace_id}` (exported to `{TRACE_DIR}`)")
+        waterfall_rows = get_waterfall_rows(trace)
+        st.vega_lite_chart(
+            waterfall_rows,
+            {
+                "mark": {"type": "bar", "cornerRadius": 2},
+                "encoding": {
+                    "y": {"field": "SPAN", "type": "nominal", "sort": {"field": "ORDER"}, "title": None,
+                          "axis": {"labelLimit": 300}},
+                    "x": {"field": "START (MS)", "type": "quantitative", "title": "Time since submit (ms)"},
+                    "x2": {"field": "END (MS)"},
+                    "color": {"field": "STATUS", "type": "nominal", "legend": None},
+                    "tooltip": [{"field": "SPAN"}, {"field": "DURATION (MS)"}, {"field": "ATTRIBUTES"}],
+                },
+            },
+            use_container_width=True,
+        )
+        with st.expander("Span Details", expanded=False):
+            st.dataframe(waterfall_rows, use_container_width=True, hide_index=True,
+                         column_order=["SPAN", "START (MS)", "DURATION (MS)", "STATUS", "ATTRIBUTES"])
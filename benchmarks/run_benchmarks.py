@@ -0,0 +1,310 @@
+"""
+Benchmark suite for the schema extraction and documentation pipeline.
+
+Starts a synthetic FastMCP server in-process (or uses one running on localhost), then times
+`get_mcp_schema`, `common_lib.get_tool_schema`, the `tool_lib` schema functions, `MarkdownCreator`
+and `MCPServerDoc.generate_documentation`. Results are written as JSON and can be saved as a
+baseline and compared against it on later runs.
+
+Run from the repository root:
+
+    python -m benchmarks.run_benchmarks --preset medium --output results.json
+    python -m benchmarks.run_benchmarks --preset medium --save-baseline
+    python -m benchmarks.run_benchmarks --preset medium --compare
+
+Baselines are machine specific: save them on the machine the comparisons run on.
+"""
+
+import argparse
+import asyncio
+import datetime
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from importlib import metadata
+
+from fastmcp import Client
+
+from benchmarks.synthetic_mcp_server import create_synthetic_server
+from lib.common_lib import create_client, get_mcp_schema, get_tool_schema
+from lib.mcpdoc_lib import MCPServerDoc
+from lib.md_lib import MarkdownCreator
+from lib.tool_lib import get_input_schema, get_output_schema, get_annotations
+
+LOG = logging.getLogger(os.path.splitext(os.path.basename(__file__))[0])
+
+PRESETS = {
+    "small": {"tools": 10, "resources": 10, "resource_templates": 5, "prompts": 10, "depth": 2},
+    "medium": {"tools": 1000, "resources": 100, "resource_templates": 20, "prompts": 100, "depth": 2},
+    "large": {"tools": 10000, "resources": 1000, "resource_templates": 100, "prompts": 1000, "depth": 2},
+}
+BENCHMARKS = ["get_mcp_schema", "get_tool_schema", "tool_lib", "markdown_creator", "generate_documentation"]
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines")
+DEFAULT_REPEAT = 5  # Timed runs per benchmark (after one warm-up run)
+REGRESSION_THRESHOLD = 0.25  # Relative slowdown of the median that counts as a regression
+
+
+def time_runs(func, repeat: int = DEFAULT_REPEAT, setup=None) -> dict:
+    """
+    Time a function over several runs after one warm-up run.
+    :param func: Function to time (called without arguments)
+    :param repeat: Number of timed runs
+    :param setup: Optional function called (untimed) before every run
+    :return: Dictionary with the run count and min/median/mean/max/stdev in seconds
+    """
+    timings = []
+    for run in range(repeat + 1):
+        if setup is not None:
+            setup()
+        start_time = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start_time
+        if run > 0:
+            timings.append(elapsed)
+    return {
+        "runs": len(timings),
+        "min_s": min(timings),
+        "median_s": statistics.median(timings),
+        "mean_s": statistics.fmean(timings),
+        "max_s": max(timings),
+        "stdev_s": statistics.stdev(timings) if len(timings) > 1 else 0.0,
+    }
+
+
+def _render_tool_page(tool) -> str:
+    """Build the Markdown page of a tool in memory, the way the documentation generator does."""
+    mc = MarkdownCreator(os.devnull)
+    mc.h1(f"🛠️ {tool.name}")
+    mc.paragraph("**Tool Description:**")
+    mc.code(tool.description)
+    mc.h2("📥 Input Parameters")
+    for input_param in tool.input_params:
+        mc.h3(f"<kbd>{input_param.get('PARAMETER', 'N/A')}</kbd>")
+        mc.table_from_list_of_dict([input_param])
+    mc.h2("📤 Output Schema")
+    mc.table_from_list_of_dict(tool.output_params)
+    mc.h2("🏷️ Annotations")
+    mc.table_from_list_of_dict([tool.annotation_row])
+    return mc.md_doc()
+
+
+def _run_tool_lib(tools: list):
+    """Call the tool_lib schema functions for every tool, as the Inspect page does."""
+    for tool in tools:
+        # Each function raises ValueError when the tool has nothing to show (e.g. no annotations)
+        for schema_function in (get_input_schema, get_output_schema, get_annotations):
+            try:
+                schema_function(tool)
+            except ValueError:
+                pass
+
+
+def run_benchmarks(config: dict, repeat: int = DEFAULT_REPEAT, only: list = None) -> dict:
+    """
+    Run the benchmark suite.
+    :param config: Server configuration (preset values, or a `url` and `transport` of a running server)
+    :param repeat: Number of timed runs per benchmark
+    :param only: Names of the benchmarks to run (all if None)
+    :return: Benchmark report (environment, configuration and results)
+    """
+    selected = only or BENCHMARKS
+    loop = asyncio.new_event_loop()
+
+    if config.get("url"):
+        def make_client():
+            return create_client(config.get("transport", "SSE"), config["url"])
+    else:
+        build_start = time.perf_counter()
+        server = create_synthetic_server(config["tools"], config["resources"], config["resource_templates"],
+                                         config["prompts"], config["depth"])
+        LOG.info(f"Built synthetic server in {time.perf_counter() - build_start:.1f}s")
+
+        def make_client():
+            return Client(server)
+
+    async def _list_raw_tools():
+        async with make_client() as client:
+            return await client.list_tools()
+
+    raw_tools = loop.run_until_complete(_list_raw_tools())
+    tool_records = get_tool_schema(raw_tools)
+    results = {}
+
+    if "get_mcp_schema" in selected:
+        LOG.info("Benchmarking get_mcp_schema")
+        results["get_mcp_schema"] = time_runs(lambda: loop.run_until_complete(get_mcp_schema(make_client(), use_cache=False)),
+                                              repeat)
+
+    if "get_tool_schema" in selected:
+        LOG.info("Benchmarking common_lib.get_tool_schema")
+        results["get_tool_schema"] = time_runs(lambda: get_tool_schema(raw_tools), repeat)
+
+    if "tool_lib" in selected:
+        LOG.info("Benchmarking tool_lib schema functions")
+        results["tool_lib"] = time_runs(lambda: _run_tool_lib(tool_records), repeat)
+
+    if "markdown_creator" in selected:
+        LOG.info("Benchmarking MarkdownCreator")
+        results["markdown_creator"] = time_runs(lambda: [_render_tool_page(tool) for tool in tool_records], repeat)
+
+    if "generate_documentation" in selected:
+        LOG.info("Benchmarking MCPServerDoc.generate_documentation")
+        doc = MCPServerDoc("Synthetic MCP Server", config.get("transport", "SSE"), config.get("url", "in-process"),
+                           client=make_client())
+        loop.run_until_complete(doc.load_schema(use_cache=False))
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory(prefix="mxp-bench-") as temp_dir:
+            def fresh_output_dir():
+                # generate_documentation writes to ./reports/<timestamp>; use a new directory per run
+                os.chdir(tempfile.mkdtemp(dir=temp_dir))
+
+            try:
+                results["generate_documentation"] = time_runs(doc.generate_documentation, repeat,
+                                                              setup=fresh_output_dir)
+            finally:
+                os.chdir(cwd)
+
+    loop.close()
+    return {
+        "created_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "environment": get_environment(),
+        "config": config,
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def get_environment() -> dict:
+    """Describe the machine and package versions the benchmarks ran with."""
+    environment = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "cpu_count": os.cpu_count(),
+    }
+    for package in ("fastmcp", "mcp", "pydantic", "pandas"):
+        try:
+            environment[package] = metadata.version(package)
+        except metadata.PackageNotFoundError:
+            environment[package] = None
+    return environment
+
+
+def compare_results(report: dict, baseline: dict, threshold: float = REGRESSION_THRESHOLD) -> list:
+    """
+    Compare the median timings of a report with a baseline.
+    :param report: Current benchmark report
+    :param baseline: Baseline benchmark report
+    :param threshold: Relative slowdown that counts as a regression (0.25 = 25% slower)
+    :return: List of comparison rows
+    """
+    rows = []
+    for name, result in report["results"].items():
+        baseline_result = baseline.get("results", {}).get(name)
+        if baseline_result is None:
+            rows.append({"BENCHMARK": name, "BASELINE (MS)": None, "CURRENT (MS)": result["median_s"] * 1000,
+                         "CHANGE": None, "STATUS": "NEW"})
+            continue
+        change = result["median_s"] / baseline_result["median_s"] - 1 if baseline_result["median_s"] else 0.0
+        if change > threshold:
+            status = "REGRESSION"
+        elif change < -threshold:
+            status = "IMPROVED"
+        else:
+            status = "OK"
+        rows.append({"BENCHMARK": name,
+                     "BASELINE (MS)": baseline_result["median_s"] * 1000,
+                     "CURRENT (MS)": result["median_s"] * 1000,
+                     "CHANGE": change,
+                     "STATUS": status})
+    return rows
+
+
+def _print_results(report: dict):
+    print(f"{'BENCHMARK':<24}{'MEDIAN (MS)':>14}{'MIN (MS)':>12}{'MAX (MS)':>12}")
+    for name, result in report["results"].items():
+        print(f"{name:<24}{result['median_s'] * 1000:>14.2f}{result['min_s'] * 1000:>12.2f}"
+              f"{result['max_s'] * 1000:>12.2f}")
+
+
+def _print_comparison(rows: list):
+    print(f"\n{'BENCHMARK':<24}{'BASELINE (MS)':>15}{'CURRENT (MS)':>15}{'CHANGE':>10}  STATUS")
+    for row in rows:
+        baseline = f"{row['BASELINE (MS)']:.2f}" if row["BASELINE (MS)"] is not None else "-"
+        change = f"{row['CHANGE']:+.1%}" if row["CHANGE"] is not None else "-"
+        print(f"{row['BENCHMARK']:<24}{baseline:>15}{row['CURRENT (MS)']:>15.2f}{change:>10}  {row['STATUS']}")
+
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the mxp schema and documentation pipeline")
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="small", help="Size of the synthetic server")
+    parser.add_argument("--tools", type=int, help="Override the number of tools of the preset")
+    parser.add_argument("--resources", type=int, help="Override the number of resources of the preset")
+    parser.add_argument("--resource-templates", type=int, help="Override the number of resource templates")
+    parser.add_argument("--prompts", type=int, help="Override the number of prompts of the preset")
+    parser.add_argument("--depth", type=int, help="Override the nesting depth of the tool argument schemas")
+    parser.add_argument("--url", help="Benchmark a server already running at this URL instead of an in-process one")
+    parser.add_argument("--transport", choices=["SSE", "Streamable-HTTP"], default="SSE",
+                        help="Transport type of the server given with --url")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="Timed runs per benchmark")
+    parser.add_argument("--only", nargs="+", choices=BENCHMARKS, help="Run only these benchmarks")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    parser.add_argument("--save-baseline", action="store_true", help="Save the report as the baseline")
+    parser.add_argument("--compare", action="store_true", help="Compare the report with the baseline")
+    parser.add_argument("--baseline", help="Baseline file (default: benchmarks/baselines/<preset>.json)")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD,
+                        help="Relative slowdown of the median that counts as a regression")
+    args = parser.parse_args(argv)
+
+    # The libraries under test log every table and header they build; logging them would dominate the timings
+    logging.basicConfig(level=logging.ERROR, format="%(asctime)s %(name)s %(levelname)s %(message)s")
+    LOG.setLevel(logging.INFO)
+
+    if args.url:
+        config = {"url": args.url, "transport": args.transport}
+        baseline_name = "url"
+    else:
+        config = dict(PRESETS[args.preset])
+        for key in ("tools", "resources", "resource_templates", "prompts", "depth"):
+            if getattr(args, key) is not None:
+                config[key] = getattr(args, key)
+        baseline_name = args.preset if config == PRESETS[args.preset] else "custom"
+    baseline_file = args.baseline or os.path.join(BASELINE_DIR, f"{baseline_name}.json")
+
+    report = run_benchmarks(config, repeat=args.repeat, only=args.only)
+    _print_results(report)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        LOG.info(f"Report written to {args.output}")
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(baseline_file)), exist_ok=True)
+        with open(baseline_file, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        LOG.info(f"Baseline saved to {baseline_file}")
+
+    if args.compare:
+        if not os.path.exists(baseline_file):
+            LOG.error(f"No baseline found at {baseline_file}. Run with --save-baseline first.")
+            return 2
+        with open(baseline_file, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("config") != report["config"]:
+            LOG.warning("The baseline was recorded with a different server configuration")
+        rows = compare_results(report, baseline, args.threshold)
+        _print_comparison(rows)
+        if any(row["STATUS"] == "REGRESSION" for row in rows):
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,148 @@
+"""
+Synthetic MCP server for benchmarks.
+
+Builds a FastMCP server (modelled on servers/sample_mcp_server.py) with a configurable number of
+tools, resources, resource templates and prompts. Tool arguments are pydantic models nested
+`schema_depth` levels deep, so the size of the tool schemas can be varied as well.
+
+Run it on localhost to benchmark over a real transport:
+
+    python benchmarks/synthetic_mcp_server.py --tools 1000 --port 8060
+"""
+
+import argparse
+from typing import Literal
+
+from fastmcp import FastMCP
+from mcp.types import ToolAnnotations
+from pydantic import BaseModel, Field, create_model
+
+ANNOTATION_VARIANTS = [
+    ToolAnnotations(title="Read-only tool", readOnlyHint=True, openWorldHint=False),
+    ToolAnnotations(title="Idempotent tool", idempotentHint=True, destructiveHint=False),
+    ToolAnnotations(title="Destructive tool", destructiveHint=True),
+    None,
+]  # Tools cycle through these annotations so every annotation layout is exercised
+
+
+def create_argument_model(schema_depth: int, fields_per_level: int = 3) -> type[BaseModel]:
+    """
+    Create a pydantic model nested `schema_depth` levels deep.
+    Every level has `fields_per_level` scalar fields (with descriptions) plus a `child` field
+    holding the next level, except the innermost one.
+    :param schema_depth: Number of nested levels (1 means a flat model)
+    :param fields_per_level: Number of scalar fields on each level
+    :return: Outermost model class
+    """
+    model = None
+    for level in range(max(1, schema_depth), 0, -1):
+        fields = {}
+        for index in range(fields_per_level):
+            field_type = (str, int, float)[index % 3]
+            fields[f"field_{index}"] = (field_type, Field(description=f"Field {index} of level {level}"))
+        fields["mode"] = (Literal["fast", "safe", "full"], Field(default="fast", description="Processing mode"))
+        if model is not None:
+            fields["child"] = (model, Field(description=f"Nested level {level + 1}"))
+        model = create_model(f"Level{level}Arguments", **fields)
+    return model
+
+
+class SyntheticResult(BaseModel):
+    """Structured result of the synthetic tools (gives every tool an output schema)."""
+    tool: str = Field(description="Name of the called tool")
+    status: str = Field(description="Status of the call")
+    checksum: int = Field(description="Checksum of the arguments")
+
+
+def _make_tool_function(tool_name: str, argument_model: type[BaseModel]):
+    """Create a tool function with its own name, taking the argument model and a scalar parameter."""
+
+    def tool_function(payload: argument_model, limit: int = 10) -> SyntheticResult:
+        return SyntheticResult(tool=tool_name, status="OK", checksum=len(payload.model_dump_json()) + limit)
+
+    tool_function.__name__ = tool_name
+    return tool_function
+
+
+def _make_resource_function(resource_name: str):
+    def resource_function() -> str:
+        return f"Contents of {resource_name}"
+
+    resource_function.__name__ = resource_name
+    return resource_function
+
+
+def _make_template_function(template_name: str):
+    def template_function(item_id: str) -> str:
+        return f"Contents of {template_name} for {item_id}"
+
+    template_function.__name__ = template_name
+    return template_function
+
+
+def _make_prompt_function(prompt_name: str):
+    def prompt_function(text: str, tone: str = "neutral") -> str:
+        return f"Please rewrite the following text in a {tone} tone:\n\n{text}"
+
+    prompt_function.__name__ = prompt_name
+    return prompt_function
+
+
+def create_synthetic_server(tool_count: int = 10,
+                            resource_count: int = 10,
+                            resource_template_count: int = 5,
+                            prompt_count: int = 10,
+                            schema_depth: int = 2) -> FastMCP:
+    """
+    Create a FastMCP server with synthetic capabilities.
+    :param tool_count: Number of tools
+    :param resource_count: Number of static resources
+    :param resource_template_count: Number of resource templates
+    :param prompt_count: Number of prompts
+    :param schema_depth: Nesting depth of the tool argument models
+    :return: FastMCP server (not running)
+    """
+    mcp = FastMCP(name=f"Synthetic MCP Server ({tool_count} tools)")
+    argument_model = create_argument_model(schema_depth)
+
+    for index in range(tool_count):
+        tool_name = f"synthetic_tool_{index:05d}"
+        mcp.tool(name=tool_name,
+                 description=f"Synthetic tool number {index}. Processes the payload and returns a checksum.",
+                 annotations=ANNOTATION_VARIANTS[index % len(ANNOTATION_VARIANTS)])(
+            _make_tool_function(tool_name, argument_model))
+
+    for index in range(resource_count):
+        resource_name = f"synthetic_resource_{index:05d}"
+        mcp.resource(uri=f"synthetic://resources/{index}",
+                     name=resource_name,
+                     description=f"Synthetic resource number {index}",
+                     mime_type="text/plain")(_make_resource_function(resource_name))
+
+    for index in range(resource_template_count):
+        template_name = f"synthetic_template_{index:05d}"
+        mcp.resource(uri=f"synthetic://templates/{index}/{{item_id}}",
+                     name=template_name,
+                     description=f"Synthetic resource template number {index}")(_make_template_function(template_name))
+
+    for index in range(prompt_count):
+        prompt_name = f"synthetic_prompt_{index:05d}"
+        mcp.prompt(name=prompt_name,
+                   description=f"Synthetic prompt number {index}")(_make_prompt_function(prompt_name))
+
+    return mcp
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a synthetic MCP server for benchmarks")
+    parser.add_argument("--tools", type=int, default=10, help="Number of tools")
+    parser.add_argument("--resources", type=int, default=10, help="Number of resources")
+    parser.add_argument("--resource-templates", type=int, default=5, help="Number of resource templates")
+    parser.add_argument("--prompts", type=int, default=10, help="Number of prompts")
+    parser.add_argument("--depth", type=int, default=2, help="Nesting depth of the tool argument schemas")
+    parser.add_argument("--transport", choices=["sse", "streamable-http"], default="sse", help="Transport to serve")
+    parser.add_argument("--port", type=int, default=8060, help="Port to listen on")
+    args = parser.parse_args()
+
+    server = create_synthetic_server(args.tools, args.resources, args.resource_templates, args.prompts, args.depth)
+    server.run(transport=args.transport, port=args.port)
@@ -0,0 +1,189 @@
+"""
+Headless documentation generator for the servers saved in the server registry.
+
+Loads the schemas of several servers concurrently (at most --concurrency at a time), renders the
+pages of all servers in one shared process pool and prints a timing summary per server. Every
+server gets its own folder under the output directory.
+
+Run from the repository root:
+
+    python docs_cli.py "BMI Server" "Zerodha MCP Server"
+    python docs_cli.py --all --output-dir reports/fleet --incremental
+    python docs_cli.py --all --zip
+"""
+
+import argparse
+import asyncio
+import concurrent.futures
+import logging
+import os
+import sys
+import time
+
+from lib.md_lib import create_report_folder, get_output_name
+from lib.mcpdoc_lib import MCPServerDoc, DOC_WORKERS
+from lib.server_lib import get_servers
+from lib.sink_lib import DirectorySink, StreamingZipSink
+
+LOG = logging.getLogger(os.path.splitext(os.path.basename(__file__))[0])
+
+DOCS_LOAD_CONCURRENCY = 8  # Servers whose schema is loaded at the same time
+DOCS_LOAD_TIMEOUT = 60.0  # Seconds the schema of one server may take to load
+DOCS_RENDER_PROCESSES = os.cpu_count() or 1  # Processes rendering the pages of all servers
+
+
+def _write_documentation(doc: MCPServerDoc, output_path: str, incremental: bool, as_zip: bool,
+                         executor: concurrent.futures.Executor) -> dict:
+    """
+    Write the documentation of a loaded server (runs in a worker thread; the pages are rendered by the executor).
+    :return: Dictionary with the number of pages written and deleted
+    """
+    if incremental:
+        summary = doc.update_documentation(output_path, executor=executor)
+        return {"WRITTEN": len(summary["WRITTEN"]), "DELETED": len(summary["DELETED"])}
+    if as_zip:
+        with open(output_path, "wb") as f, StreamingZipSink(f) as sink:
+            doc.generate_documentation(sink, executor=executor)
+    else:
+        doc.generate_documentation(DirectorySink(output_path), executor=executor)
+    return {"WRITTEN": len(doc.get_page_jobs()), "DELETED": 0}
+
+
+async def document_server(name: str, server: dict, output_dir: str, semaphore: asyncio.Semaphore,
+                          executor: concurrent.futures.Executor, incremental: bool = False, as_zip: bool = False,
+                          timeout: float = DOCS_LOAD_TIMEOUT) -> dict:
+    """
+    Load the schema of one server and write its documentation.
+    :param name: Name of the server
+    :param server: Saved server details (TRANSPORT_TYPE and URL)
+    :param output_dir: Folder holding the documentation of all servers
+    :param semaphore: Limits the number of schemas loaded at the same time
+    :param executor: Executor shared by all servers that renders the pages
+    :param incremental: Update the server folder in place, rewriting only changed pages
+    :param as_zip: Write a ZIP archive per server instead of a folder
+    :param timeout: Seconds the schema may take to load
+    :return: Summary row of the server
+    """
+    row = {"SERVER": name, "STATUS": "OK", "TOOLS": None, "PAGES": None, "DELETED": None,
+           "LOAD (S)": None, "RENDER (S)": None, "TOTAL (S)": None, "OUTPUT": None, "ERROR": ""}
+    output_path = os.path.join(output_dir, get_output_name(name) + (".zip" if as_zip else ""))
+    start_time = time.perf_counter()
+    try:
+        async with semaphore:
+            doc = MCPServerDoc(name, server["TRANSPORT_TYPE"], server["URL"])
+            async with asyncio.timeout(timeout):
+                await doc.load_schema()
+        row["LOAD (S)"] = time.perf_counter() - start_time
+        row["TOOLS"] = len(doc.tools)
+
+        # Writing happens outside the semaphore, so the next schemas load while this one renders
+        render_start_time = time.perf_counter()
+        counts = await asyncio.to_thread(_write_documentation, doc, output_path, incremental, as_zip, executor)
+        row["RENDER (S)"] = time.perf_counter() - render_start_time
+        row["PAGES"] = counts["WRITTEN"]
+        row["DELETED"] = counts["DELETED"]
+        row["OUTPUT"] = output_path
+    except TimeoutError:
+        row["STATUS"] = "ERROR"
+        row["ERROR"] = f"Schema not loaded within {timeout:g} seconds"
+    except Exception as e:
+        row["STATUS"] = "ERROR"
+        row["ERROR"] = f"{type(e).__name__}: {e}"
+    row["TOTAL (S)"] = time.perf_counter() - start_time
+    LOG.info(f"{name}: {row['STATUS']} in {row['TOTAL (S)']:.2f} s {row['ERROR']}")
+    return row
+
+
+async def document_servers(servers: dict, output_dir: str, executor: concurrent.futures.Executor,
+                           max_concurrency: int = DOCS_LOAD_CONCURRENCY, incremental: bool = False,
+                           as_zip: bool = False, timeout: float = DOCS_LOAD_TIMEOUT) -> list:
+    """
+    Generate the documentation of several servers concurrently.
+    :param servers: Dictionary of server name to saved server details
+    :param output_dir: Folder holding the documentation of all servers
+    :param executor: Executor shared by all servers that renders the pages
+    :param max_concurrency: Maximum number of schemas loaded at the same time
+    :param incremental: Update the server folders in place, rewriting only changed pages
+    :param as_zip: Write a ZIP archive per server instead of a folder
+    :param timeout: Seconds the schema of one server may take to load
+    :return: Summary rows in the order of the servers
+    """
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+    return await asyncio.gather(*(document_server(name, server, output_dir, semaphore, executor,
+                                                  incremental, as_zip, timeout)
+                                  for name, server in servers.items()))
+
+
+def _format_seconds(value) -> str:
+    return f"{value:.2f}" if value is not None else "-"
+
+
+def _print_summary(rows: list):
+    print(f"{'SERVER':<32}{'STATUS':<8}{'TOOLS':>7}{'PAGES':>7}{'LOAD (S)':>10}{'RENDER (S)':>12}"
+          f"{'TOTAL (S)':>11}  OUTPUT / ERROR")
+    for row in rows:
+        tools = row["TOOLS"] if row["TOOLS"] is not None else "-"
+        pages = row["PAGES"] if row["PAGES"] is not None else "-"
+        print(f"{row['SERVER'][:31]:<32}{row['STATUS']:<8}{tools:>7}{pages:>7}{_format_seconds(row['LOAD (S)']):>10}"
+              f"{_format_seconds(row['RENDER (S)']):>12}{_format_seconds(row['TOTAL (S)']):>11}  "
+              f"{row['OUTPUT'] or row['ERROR']}")
+
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(description="Generate the MkDocs documentation of saved MCP servers")
+    parser.add_argument("servers", nargs="*", help="Names of servers saved in the server registry")
+    parser.add_argument("--all", action="store_true", help="Document every saved server")
+    parser.add_argument("--output-dir", help="Folder for the documentation (default: reports/<timestamp>)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Update existing server folders in place, rewriting only the pages that changed")
+    parser.add_argument("--zip", action="store_true", help="Write one ZIP archive per server instead of a folder")
+    parser.add_argument("--concurrency", type=int, default=DOCS_LOAD_CONCURRENCY,
+                        help="Maximum number of schemas loaded at the same time")
+    parser.add_argument("--processes", type=int, default=DOCS_RENDER_PROCESSES,
+                        help="Processes rendering the pages (0 renders in threads of this process)")
+    parser.add_argument("--timeout", type=float, default=DOCS_LOAD_TIMEOUT,
+                        help="Seconds the schema of one server may take to load")
+    args = parser.parse_args(argv)
+
+    # The documentation libraries log every page element they build; keep the console to the summary
+    logging.basicConfig(level=logging.WARNING, format="%(asctime)s %(name)s %(levelname)s %(message)s")
+    LOG.setLevel(logging.INFO)
+
+    if args.incremental and args.zip:
+        parser.error("--incremental updates folders and cannot be combined with --zip")
+    if args.all == bool(args.servers):
+        parser.error("give either server names or --all")
+
+    saved_servers = get_servers() or {}
+    if args.all:
+        servers = saved_servers
+    else:
+        unknown = [name for name in args.servers if name not in saved_servers]
+        if unknown:
+            parser.error(f"unknown server(s): {', '.join(unknown)}")
+        servers = {name: saved_servers[name] for name in dict.fromkeys(args.servers)}
+    if not servers:
+        LOG.warning("No servers to document")
+        return 0
+
+    output_dir = args.output_dir or create_report_folder()
+    os.makedirs(output_dir, exist_ok=True)
+
+    start_time = time.perf_counter()
+    if args.processes > 0:
+        executor = concurrent.futures.ProcessPoolExecutor(max_workers=args.processes)
+    else:
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=DOC_WORKERS, thread_name_prefix="mcpdoc")
+    with executor:
+        rows = asyncio.run(document_servers(servers, output_dir, executor, args.concurrency, args.incremental,
+                                            args.zip, args.timeout))
+
+    _print_summary(rows)
+    failed = sum(row["STATUS"] != "OK" for row in rows)
+    print(f"\n{len(rows) - failed} of {len(rows)} server(s) documented in {time.perf_counter() - start_time:.2f} s "
+          f"({output_dir})")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,203 @@
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import time
+
+from lib.common_lib import create_client, iter_tool_schema
+from lib.record_lib import ToolRecord
+
+LOG = logging.getLogger(os.path.splitext(os.path.basename(__file__))[0])
+
+ANALYSIS_TIMEOUT = 60.0  # Seconds one server may take to connect and list its tools
+ANALYSIS_CONCURRENCY = 8  # Servers analyzed at the same time by analyze_servers
+
+OK = "OK"
+MISSING = "MISSING"
+INCOMPLETE = "MISSING/INCOMPLETE"
+NOT_APPLICABLE = "NA"
+FAILED = "FAILED"  # Result of a failed server-level check
+
+TOOL_CHECKS = ["TOOL DESCRIPTION", "INPUT SCHEMA", "OUTPUT SCHEMA", "ANNOTATIONS"]  # Columns of a tool analysis row
+ANNOTATION_KEYS = ["title", "readOnlyHint", "destructiveHint", "idempotentHint", "openWorldHint"]
+
+
+def check_description(tool: ToolRecord) -> str:
+    """
+    Check that a tool has a description.
+    :param tool: ToolRecord of the tool
+    :return: OK or MISSING
+    """
+    return OK if tool.description else MISSING
+
+
+def check_input_schema(tool: ToolRecord) -> str:
+    """
+    Check that every input parameter of a tool is described.
+    :param tool: ToolRecord of the tool
+    :return: OK, MISSING/INCOMPLETE (a parameter without description) or NA (no parameters)
+    """
+    if not tool.input_params:
+        return NOT_APPLICABLE
+    if any(row["DESCRIPTION"] is None for row in tool.input_params):
+        return INCOMPLETE
+    return OK
+
+
+def check_output_schema(tool: ToolRecord) -> str:
+    """
+    Check that a tool declares an output schema with at least one property.
+    :param tool: ToolRecord of the tool
+    :return: OK or MISSING
+    """
+    return OK if tool.output_schema and tool.output_params else MISSING
+
+
+def check_annotations(tool: ToolRecord) -> str:
+    """
+    Check that a tool declares its title and all behavior hints.
+    :param tool: ToolRecord of the tool
+    :return: OK, MISSING/INCOMPLETE (some are not set) or MISSING (no annotations)
+    """
+    if not tool.annotations:
+        return MISSING
+    if any(tool.annotations.get(key) is None for key in ANNOTATION_KEYS):
+        return INCOMPLETE
+    return OK
+
+
+def analyze_tool(tool: ToolRecord) -> dict:
+    """
+    Run the tool-level checks on a tool.
+    :param tool: ToolRecord of the tool
+    :return: Row with the TOOL NAME and the result of each of TOOL_CHECKS
+    """
+    return {
+        "TOOL NAME": tool.name,
+        "TOOL DESCRIPTION": check_description(tool),
+        "INPUT SCHEMA": check_input_schema(tool),
+        "OUTPUT SCHEMA": check_output_schema(tool),
+        "ANNOTATIONS": check_annotations(tool),
+    }
+
+
+def analyze_server_config(transport_type: str, url: str) -> list:
+    """
+    Run the server-level checks on the connection settings of a server.
+    :param transport_type: Transport type of the MCP server
+    :param url: URL of the MCP server
+    :return: Rows with the CHECK name, its RESULT (OK or FAILED) and a MESSAGE
+    """
+    if transport_type == "Streamable-HTTP":
+        transport_row = {"CHECK": "TRANSPORT", "RESULT": OK,
+                         "MESSAGE": "Server uses the Streamable-HTTP transport, recommended as of 2025-03-26"}
+    else:
+        transport_row = {"CHECK": "TRANSPORT", "RESULT": FAILED,
+                         "MESSAGE": f"Server uses the {transport_type} transport, deprecated as of 2025-03-26; "
+                                    f"switch to Streamable-HTTP"}
+
+    if url.startswith("https://"):
+        url_row = {"CHECK": "SECURE URL", "RESULT": OK, "MESSAGE": "Server URL uses https"}
+    else:
+        url_row = {"CHECK": "SECURE URL", "RESULT": FAILED,
+                   "MESSAGE": "Server URL does not use https; use https for secure communication"}
+    return [transport_row, url_row]
+
+
+def summarize_tool_rows(tool_rows: list) -> dict:
+    """
+    Count the results of each tool-level check.
+    :param tool_rows: Rows returned by analyze_tool
+    :return: Dictionary of check name to a dictionary of result to count
+    """
+    summary = {check: {} for check in TOOL_CHECKS}
+    for row in tool_rows:
+        for check in TOOL_CHECKS:
+            summary[check][row[check]] = summary[check].get(row[check], 0) + 1
+    return summary
+
+
+def analyze_tools(name: str, transport_type: str, url: str, tools: list) -> dict:
+    """
+    Analyze a server whose tools are already loaded.
+    :param name: Name of the server
+    :param transport_type: Transport type of the MCP server
+    :param url: URL of the MCP server
+    :param tools: ToolRecord objects of the server
+    :return: Report with the server details, SERVER CHECKS, TOOL CHECKS and SUMMARY (plain data, JSON serializable)
+    """
+    tool_rows = [analyze_tool(tool) for tool in tools]
+    return {
+        "SERVER": name,
+        "TRANSPORT_TYPE": transport_type,
+        "URL": url,
+        "STATUS": OK,
+        "ERROR": None,
+        "SERVER CHECKS": analyze_server_config(transport_type, url),
+        "TOOL CHECKS": tool_rows,
+        "SUMMARY": summarize_tool_rows(tool_rows),
+    }
+
+
+async def analyze_server(name: str, transport_type: str, url: str, timeout: float = ANALYSIS_TIMEOUT) -> dict:
+    """
+    Connect to a server with a fresh client, list its tools and analyze them.
+    :param name: Name of the server
+    :param transport_type: Transport type of the MCP server
+    :param url: URL of the MCP server
+    :param timeout: Seconds the connection and the tool listing may take together
+    :return: Report as returned by analyze_tools, with STATUS ERROR and the ERROR message if the tools
+             could not be listed, and the DURATION (S) of the analysis
+    """
+    start_time = time.perf_counter()
+    try:
+        async with asyncio.timeout(timeout):
+            client = create_client(transport_type, url)
+            async with client:
+                tools = [tool async for tool in iter_tool_schema(client)]
+        report = analyze_tools(name, transport_type, url, tools)
+    except Exception as e:
+        error = f"No response within {timeout:g} seconds" if isinstance(e, TimeoutError) else f"{type(e).__name__}: {e}"
+        LOG.error(f"Error analyzing server [{name}]: {error}")
+        report = analyze_tools(name, transport_type, url, [])
+        report["STATUS"] = "ERROR"
+        report["ERROR"] = error
+    report["DURATION (S)"] = round(time.perf_counter() - start_time, 3)
+    LOG.info(f"Analyzed server [{name}]: {report['STATUS']} ({len(report['TOOL CHECKS'])} tools)")
+    return report
+
+
+async def analyze_servers(servers: dict, timeout: float = ANALYSIS_TIMEOUT, max_concurrency: int = ANALYSIS_CONCURRENCY):
+    """
+    Analyze several servers concurrently, yielding each report as soon as it is available.
+    :param servers: Registered servers as returned by server_lib.get_servers ({name: {"TRANSPORT_TYPE", "URL"}})
+    :param timeout: Seconds per server
+    :param max_concurrency: Maximum number of servers analyzed at the same time
+    :return: Async generator of reports in completion order
+    """
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def analyze_one(name: str, server: dict) -> dict:
+        async with semaphore:
+            return await analyze_server(name, server["TRANSPORT_TYPE"], server["URL"], timeout)
+
+    tasks = [asyncio.ensure_future(analyze_one(name, server)) for name, server in servers.items()]
+    try:
+        for next_report in asyncio.as_completed(tasks):
+            yield await next_report
+    finally:
+        for task in tasks:
+            task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def report_to_json(report, indent: int = 2) -> str:
+    """
+    Serialize one report or a list of reports to JSON.
+    :param report: Report (or list of reports) as returned by analyze_server
+    :param indent: Indentation of the JSON text
+    :return: JSON text
+    """
+    return json.dumps(report, indent=indent, ensure_ascii=False)
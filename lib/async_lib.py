@@ -0,0 +1,104 @@
+import asyncio
+import concurrent.futures
+import contextvars
+import logging
+import os
+import threading
+
+LOG = logging.getLogger(os.path.splitext(os.path.basename(__file__))[0])
+
+_LOOP = None
+_LOOP_THREAD = None
+_LOOP_LOCK = threading.Lock()
+
+
+def _run_loop_forever(loop: asyncio.AbstractEventLoop):
+    """Thread target that runs the background event loop until it is stopped."""
+    asyncio.set_event_loop(loop)
+    LOG.info("Background event loop started")
+    loop.run_forever()
+    LOG.info("Background event loop stopped")
+
+
+def get_event_loop() -> asyncio.AbstractEventLoop:
+    """
+    Get the process-wide background event loop, starting it on first use.
+
+    The loop runs in a daemon thread and lives for the lifetime of the process, so async
+    resources created on it (pooled MCP sessions, HTTP clients, tasks) survive Streamlit reruns.
+    :return: Running background event loop
+    """
+    global _LOOP, _LOOP_THREAD
+    with _LOOP_LOCK:
+        if _LOOP is None or _LOOP.is_closed() or _LOOP_THREAD is None or not _LOOP_THREAD.is_alive():
+            LOG.info("Starting background event loop")
+            _LOOP = asyncio.new_event_loop()
+            _LOOP_THREAD = threading.Thread(target=_run_loop_forever,
+                                            args=(_LOOP,),
+                                            name="mxp-event-loop",
+                                            daemon=True)
+            _LOOP_THREAD.start()
+        return _LOOP
+
+
+def submit(coro) -> concurrent.futures.Future:
+    """
+    Schedule a coroutine on the background event loop without waiting for it.
+    The coroutine runs in a copy of the caller's context, so context variables such as the
+    current trace span (lib.trace_lib) carry over from the Streamlit script thread.
+    :param coro: Coroutine to run
+    :return: Future that resolves to the coroutine's result
+    """
+    loop = get_event_loop()
+    # run_coroutine_threadsafe schedules the task from a handle that captures the current context
+    return contextvars.copy_context().run(asyncio.run_coroutine_threadsafe, coro, loop)
+
+
+def run_async(coro, timeout: float = None):
+    """
+    Run a coroutine on the background event loop and wait for its result.
+    This replaces `asyncio.run(...)` in the Streamlit pages.
+    :param coro: Coroutine to run
+    :param timeout: Seconds to wait for the result (None waits forever)
+    :return: Result of the coroutine
+    """
+    if threading.current_thread() is _LOOP_THREAD:
+        raise RuntimeError("run_async() cannot be called from the background event loop thread")
+
+    future = submit(coro)
+    try:
+        return future.result(timeout=timeout)
+    except concurrent.futures.TimeoutError:
+        future.cancel()
+        raise
+
+
+async def _anext(async_iterator):
+    """Await the next item of an async iterator (wrapped so it can be submitted as a coroutine)."""
+    return await async_iterator.__anext__()
+
+
+def iterate_async(async_iterable, timeout: float = None):
+    """
+    Consume an async iterable on the background event loop from synchronous code.
+    Items are yielded as soon as they are produced, so a page can render the first results
+    while the rest are still in flight.
+    :param async_iterable: Async iterable (e.g. an async generator) to consume
+    :param timeout: Seconds to wait for each item (None waits forever)
+    :return: Generator of the items
+    """
+    async_iterator = async_iterable.__aiter__()
+    finished = False
+    try:
+        while True:
+            try:
+                item = run_async(_anext(async_iterator), timeout=timeout)
+            except StopAsyncIteration:
+                finished = True
+                return
+            yield item
+    finally:
+        # Release resources held by the async generator (e.g. pooled sessions) if iteration stopped early
+        aclose = getattr(async_iterator, "aclose", None)
+        if not finished and aclose is not None:
+            run_async(aclose())
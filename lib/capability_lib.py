@@ -0,0 +1,154 @@
+import collections
+import logging
+import os
+import threading
+import time
+
+import mcp.types
+from fastmcp.client.messages import MessageHandler
+
+LOG = logging.getLogger(os.path.splitext(os.path.basename(__file__))[0])
+
+CAPABILITY_CACHE_TTL = 300.0  # Seconds for which a cached capability listing is served
+CAPABILITY_CACHE_MAX_SERVERS = 32  # Maximum number of servers kept in the cache
+
+TOOLS = "tools"
+RESOURCES = "resources"
+RESOURCE_TEMPLATES = "resource_templates"
+PROMPTS = "prompts"
+CATEGORIES = (TOOLS, RESOURCES, RESOURCE_TEMPLATES, PROMPTS)
+
+
+class CapabilityCache:
+    """
+    Thread-safe cache of the capabilities (tools, resources, resource templates and prompts)
+    exposed by MCP servers, keyed by server URL.
+
+    Each category of a server is cached independently with a time-to-live. The number of
+    servers held is bounded, with the least recently used server evicted first.
+    """
+
+    def __init__(self, ttl: float = CAPABILITY_CACHE_TTL, max_servers: int = CAPABILITY_CACHE_MAX_SERVERS):
+        """
+        Initialize the capability cache.
+        :param ttl: Seconds for which a cached listing is served (0 disables caching)
+        :param max_servers: Maximum number of servers kept in the cache
+        """
+        self.ttl = ttl
+        self.max_servers = max_servers
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def configure(self, ttl: float = None, max_servers: int = None):
+        """
+        Change the TTL and/or size bound of the cache.
+        :param ttl: Seconds for which a cached listing is served
+        :param max_servers: Maximum number of servers kept in the cache
+        """
+        with self._lock:
+            if ttl is not None:
+                self.ttl = ttl
+            if max_servers is not None:
+                self.max_servers = max_servers
+                self._evict()
+
+    def get(self, url: str, category: str):
+        """
+        Get the cached listing of a category for a server.
+        :param url: URL of the MCP server
+        :param category: One of CATEGORIES
+        :return: Cached listing, or None if it is missing or expired
+        """
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is None or category not in entry:
+                return None
+
+            stored_at, value = entry[category]
+            if time.monotonic() - stored_at > self.ttl:
+                LOG.info(f"Cached {category} for {url} expired")
+                del entry[category]
+                return None
+
+            self._entries.move_to_end(url)
+            return value
+
+    def put(self, url: str, category: str, value):
+        """
+        Store the listing of a category for a server.
+        :param url: URL of the MCP server
+        :param category: One of CATEGORIES
+        :param value: Listing to cache
+        """
+        if category not in CATEGORIES:
+            raise ValueError(f"Unknown capability category: {category}")
+
+        with self._lock:
+            entry = self._entries.setdefault(url, {})
+            entry[category] = (time.monotonic(), value)
+            self._entries.move_to_end(url)
+            self._evict()
+
+    def invalidate(self, url: str, *categories: str):
+        """
+        Drop cached listings for a server.
+        :param url: URL of the MCP server
+        :param categories: Categories to drop (all categories if none given)
+        """
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is None:
+                return
+            if not categories:
+                del self._entries[url]
+            else:
+                for category in categories:
+                    entry.pop(category, None)
+        LOG.info(f"Invalidated cached {', '.join(categories) if categories else 'capabilities'} for {url}")
+
+    def clear(self):
+        """Drop everything from the cache."""
+        with self._lock:
+            self._entries.clear()
+
+    def _evict(self):
+        """Evict least recently used servers until the size bound is met. Caller holds the lock."""
+        while len(self._entries) > self.max_servers:
+            url, _ = self._entries.popitem(last=False)
+            LOG.info(f"Evicted cached capabilities for {url}")
+
+
+CAPABILITY_CACHE = CapabilityCache()
+
+
+def get_capability_cache() -> CapabilityCache:
+    """
+    Get the process-wide capability cache.
+    :return: Capability cache
+    """
+    return CAPABILITY_CACHE
+
+
+class CapabilityChangeHandler(MessageHandler):
+    """
+    MCP message handler that invalidates the capability cache when the server announces
+    that its tool, resource or prompt list has changed.
+    """
+
+    def __init__(self, url: str, cache: CapabilityCache = CAPABILITY_CACHE):
+        """
+        Initialize the handler.
+        :param url: URL of the MCP server the client is connected to
+        :param cache: Capability cache to invalidate
+        """
+        self.url = url
+        self.cache = cache
+
+    async def on_tool_list_changed(self, message: mcp.types.ToolListChangedNotification) -> None:
+        self.cache.invalidate(self.url, TOOLS)
+
+    async def on_resource_list_changed(self, message: mcp.types.ResourceListChangedNotification) -> None:
+        self.cache.invalidate(self.url, RESOURCES, RESOURCE_TEMPLATES)
+
+    async def on_prompt_list_changed(self, message: mcp.types.PromptListChangedNotification) -> None:
+        self.cache.invalidate(self.url, PROMPTS)
@@ -30,6 +30,9 @@ DOCS_ICON = ":material/menu_book:"
 ADD_ICON = ":material/add_box:"
 GENERATE_ICON = ":material/autoplay:"
 DOWNLOAD_ICON = ":material/download:"
+REFRESH_ICON = ":material/refresh:"
+METRICS_ICON = ":material/monitoring:"
+HEALTH_CHECK_ICON = ":material/monitor_heart:"
 
 TROUBLESHOOT_ICON = ":material/troubleshoot:"
 WARNING_ICON = ":material/emergency_home:"
@@ -1,102 +1,54 @@
+import asyncio
 import json
 import logging
 import os
 
 import fastmcp
+from fastmcp import Client
+from fastmcp.client import SSETransport, StreamableHttpTransport
 from mcp import McpError
 
+from lib.capability_lib import CAPABILITY_CACHE, CATEGORIES, TOOLS, RESOURCES, RESOURCE_TEMPLATES, PROMPTS
+from lib.metrics_lib import METRICS
+from lib.record_lib import ToolRecord
+from lib.trace_lib import span
+
 LOG = logging.getLogger(os.path.splitext(os.path.basename(__file__))[0])
 
 
+def create_client(transport_type: str, url: str, message_handler=None) -> Client:
+    """
+    Create a (not yet connected) FastMCP client for the given transport and URL.
+    :param transport_type: Transport type of the MCP server
+    :param url: URL of the MCP server
+    :param message_handler: Optional handler for messages/notifications sent by the server
+    :return: FastMCP client
+    """
+    if transport_type == 'SSE':
+        transport = SSETransport(url)
+    elif transport_type == 'Streamable-HTTP':
+        transport = StreamableHttpTransport(url)
+    else:
+        raise ValueError(f"Unsupported transport type: {transport_type}")
+
+    return Client(transport=transport, message_handler=message_handler)
+
+
 def get_tool_schema(tools) -> list:
     """
     Extract and format the schema for a list of tools.
 
     :param tools: List of tool objects
-    :return: List of tool schema dictionaries
+    :return: List of ToolRecord objects
     """
     LOG.info("Starting to extract tool schemas")
     tool_list = []
     for tool in tools:
-        LOG.info(f"Processing tool: {tool.name}")
-        model = tool.model_dump_json()
-        # Convert JSON string to json object
-        model_json = json.loads(model)
-
-        tool_row = {
-            "NAME": tool.name,
-            "TITLE": tool.title,
-            "DESCRIPTION": tool.description,
-        }
-
-        input_param_list = []
-        input_schema = model_json.get("inputSchema", {})
-        required_params = input_schema.get("required", [])
-        LOG.info(f"Extracting input parameters for tool: {tool.name}")
-        for key, value in input_schema.get("properties", {}).items():
-            row = {"PARAMETER": key, "TITLE": value.get("title", "")}
-            if key in required_params:
-                row["REQUIRED"] = True
-            else:
-                row["REQUIRED"] = False
-
-            for k, v in value.items():
-                if k != "title":
-                    row[k.upper()] = v
-
-            if "DESCRIPTION" not in row:
-                row["DESCRIPTION"] = None
-
-            input_param_list.append(row)
-
-        tool_row["INPUT_PARAMS"] = input_param_list
-
-        output_params_list = []
-        output_schema = model_json.get("outputSchema", {})
-        if not output_schema:
-            LOG.info(f"No output schema found for tool: {tool.name}")
-            pass
-        else:
-            LOG.info(f"Extracting output parameters for tool: {tool.name}")
-            for key, value in output_schema.get("properties", {}).items():
-                row = {"PARAMETER": key, "TITLE": value.get("title", "")}
-
-                for k, v in value.items():
-                    if k != "title":
-                        row[k.upper()] = v
-
-                # if "description" not in row:
-                #     row["DESCRIPTION"] = None
-
-                output_params_list.append(row)
-
-        tool_row["OUTPUT_PARAMS"] = output_params_list
-
-        LOG.info(f"Extracting annotations for tool: {tool.name}")
-        annotations = model_json.get("annotations", {})
-
-        if annotations:
-            annotations_dict = {
-                "TITLE": annotations.get("title", ""),
-                "READ ONLY HINT": "✅" if annotations["readOnlyHint"] == True else annotations["readOnlyHint"],
-                "DESTRUCTIVE HINT": "✅" if annotations["destructiveHint"] == True else annotations["destructiveHint"],
-                "IDEMPOTENT HINT": "✅" if annotations["idempotentHint"] == True else annotations["idempotentHint"],
-                "OPEN WORLD HINT": "✅" if annotations["openWorldHint"] == True else annotations["openWorldHint"],
-            }
-        else:
+        LOG.debug(f"Processing tool: {tool.name}")
+        tool_record = ToolRecord.from_tool(tool)
+        if not tool_record.annotations:
             LOG.warning(f"No annotations found for tool: {tool.name}")
-            annotations_dict = {
-                "TITLE": "",
-                "READ ONLY HINT": "",
-                "DESTRUCTIVE HINT": "",
-                "IDEMPOTENT HINT": "",
-                "OPEN WORLD HINT": "",
-            }
-
-        tool_row["ANNOTATIONS"] = annotations_dict
-
-        tool_list.append(tool_row)
-        LOG.info(f"Finished processing tool: {tool.name}")
+        tool_list.append(tool_record)
 
     LOG.info("Completed extraction of all tool schemas")
     return tool_list
@@ -213,56 +165,179 @@ def get_prompt_schema(prompts) -> list:
     return prompt_list
 
 
-async def get_mcp_schema(client: fastmcp.Client):
+def get_server_id(client: fastmcp.Client) -> str:
     """
-    Get the MCP server schema including tools, resources, and prompts.
+    Get the identifier (URL) of the server a client talks to, used to key metrics.
 
     :param client: FastMCP client instance
-    :return: Tuple containing lists of tools, resources, and prompts
+    :return: Server URL, or a description of the transport if it has no URL
+    """
+    return getattr(client.transport, "url", None) or repr(client.transport)
+
+
+async def iter_pages(list_page, items_attr: str, server: str = None, method: str = None):
+    """
+    Iterate over a paginated MCP listing, following `nextCursor` until the last page.
+
+    The request for the next page is issued before the current page is handed to the
+    caller, so processing of one page overlaps the network wait for the next one. At most
+    two pages are held in memory at a time.
+
+    :param list_page: Coroutine function taking a `cursor` argument (e.g. `client.session.list_tools`)
+    :param items_attr: Name of the attribute of the result that holds the page items (e.g. "tools")
+    :param server: Server identifier used to record request metrics
+    :param method: MCP method name used to record request metrics (e.g. "tools/list")
+    :return: Async generator of pages (lists of items)
+    """
+    async def _list_page(cursor):
+        with span(method or "list", server=server) as page_span, METRICS.measure(server, method):
+            result = await list_page(cursor=cursor)
+            page_span.set_attribute("item_count", len(getattr(result, items_attr)))
+            return result
+
+    pending = asyncio.ensure_future(_list_page(None))
+    try:
+        while pending is not None:
+            result = await pending
+            next_cursor = result.nextCursor
+            pending = asyncio.ensure_future(_list_page(next_cursor)) if next_cursor else None
+            yield getattr(result, items_attr)
+    finally:
+        if pending is not None:
+            pending.cancel()
+
+
+async def iter_tool_pages(client: fastmcp.Client):
+    """
+    Iterate over the tools of a connected MCP client, one page at a time.
+
+    :param client: Connected FastMCP client instance
+    :return: Async generator of lists of tool objects
+    """
+    async for page in iter_pages(client.session.list_tools, "tools", get_server_id(client), "tools/list"):
+        LOG.info(f"Retrieved a page of {len(page)} tools from server")
+        yield page
+
+
+async def iter_tool_schema(client: fastmcp.Client):
+    """
+    Iterate over the tool schemas (ToolRecord objects) of a connected MCP client.
+    Tools are extracted page by page, so the first tools are available before the whole list is downloaded.
+
+    :param client: Connected FastMCP client instance
+    :return: Async generator of ToolRecord objects
+    """
+    async for page in iter_tool_pages(client):
+        for tool_record in await asyncio.to_thread(get_tool_schema, page):
+            yield tool_record
+
+
+async def _fetch_capability(label: str, list_page, items_attr: str, extract_schema, optional: bool = True,
+                            server: str = None, method: str = None, category: str = None,
+                            use_cache: bool = False) -> list:
+    """
+    Retrieve one capability category from the MCP server and extract its schema.
+
+    All pages of the listing are retrieved. Each page is extracted in a worker thread as soon
+    as it arrives, so that extraction does not hold up the event loop while the other
+    categories (or the next page) are still waiting on the network.
+
+    :param label: Human-readable name of the category (used for logging)
+    :param list_page: Coroutine function that lists one page of the category on the server
+    :param items_attr: Name of the attribute of the listing result that holds the items
+    :param extract_schema: Function that converts the listed objects to schema dictionaries
+    :param optional: If True, an McpError (category not supported) yields an empty list
+    :param server: Server identifier used to record request metrics and to key the capability cache
+    :param method: MCP method that lists the category (e.g. "tools/list")
+    :param category: Capability cache category (one of capability_lib.CATEGORIES)
+    :param use_cache: Serve the listing from the capability cache when available, and store it there
+    :return: List of schema dictionaries
+    """
+    if use_cache:
+        cached_list = CAPABILITY_CACHE.get(server, category)
+        if cached_list is not None:
+            LOG.info(f"Using cached {label} for {server}")
+            return cached_list
+
+    LOG.info(f"Retrieving {label} from MCP server")
+    schema_list = []
+    try:
+        async for page in iter_pages(list_page, items_attr, server, method):
+            LOG.info(f"Retrieved {len(page)} {label} from server")
+            LOG.info(f"Extracting {label} schemas from retrieved {label}")
+            schema_list.extend(await asyncio.to_thread(extract_schema, page))
+    except McpError as e:
+        if not optional:
+            raise
+        LOG.error(f"{label.capitalize()} not supported by MCP server: {e}")
+        schema_list = []
+
+    if use_cache:
+        CAPABILITY_CACHE.put(server, category, schema_list)
+    return schema_list
+
+
+async def fetch_capabilities(client: fastmcp.Client, use_cache: bool = True):
+    """
+    Get the tools, resources, resource templates and prompts of a connected MCP client.
+
+    The four capability listings are issued concurrently and every page of each listing
+    is retrieved (following `nextCursor`). Resources, resource templates
+    and prompts are optional: if the server does not support one of them, an empty list
+    is returned for that category. A failure to list tools is raised to the caller.
+
+    :param client: Connected FastMCP client instance
+    :param use_cache: Serve each category from the capability cache (keyed by server URL) when
+                      available, and store fetched categories there
+    :return: Tuple containing lists of tools, resources, resource templates and prompts
+    """
+    server = get_server_id(client)
+    return await asyncio.gather(
+        _fetch_capability("tools", client.session.list_tools, "tools",
+                          get_tool_schema, optional=False, server=server, method="tools/list",
+                          category=TOOLS, use_cache=use_cache),
+        _fetch_capability("resources", client.session.list_resources, "resources",
+                          get_resource_schema, server=server, method="resources/list",
+                          category=RESOURCES, use_cache=use_cache),
+        _fetch_capability("resource templates", client.session.list_resource_templates, "resourceTemplates",
+                          get_resource_template_schema, server=server, method="resources/templates/list",
+                          category=RESOURCE_TEMPLATES, use_cache=use_cache),
+        _fetch_capability("prompts", client.session.list_prompts, "prompts",
+                          get_prompt_schema, server=server, method="prompts/list",
+                          category=PROMPTS, use_cache=use_cache),
+    )
+
+
+async def get_mcp_schema(client: fastmcp.Client, use_cache: bool = True):
+    """
+    Get the MCP server schema including tools, resources, and prompts.
+
+    Categories are served from the capability cache (keyed by server URL, with its TTL and
+    list_changed invalidation) when available; the client only connects if at least one
+    category has to be fetched. See fetch_capabilities for how the listings are retrieved.
+
+    :param client: FastMCP client instance (not connected)
+    :param use_cache: Use the capability cache (False always fetches from the server)
+    :return: Tuple containing lists of tools, resources, resource templates and prompts
     """
     LOG.info("Fetching MCP server schema")
-    async with client:
+    server = get_server_id(client)
+    if use_cache:
+        cached_lists = [CAPABILITY_CACHE.get(server, category) for category in CATEGORIES]
+        if all(cached_list is not None for cached_list in cached_lists):
+            LOG.info(f"Using cached MCP server schema for {server}")
+            return tuple(cached_lists)
+
+    with METRICS.measure(server, "initialize"):
+        await client.__aenter__()
+    try:
         LOG.info("Connected to MCP client")
-
-        LOG.info("Retrieving tools from MCP server")
-        tools = await client.list_tools()
-        LOG.info(f"Retrieved {len(tools)} tools from server")
-        LOG.info("Extracting tool schemas from retrieved tools")
-        tool_list = get_tool_schema(tools)
-
-        LOG.info("Retrieving resources from MCP server")
-        try:
-            resources = await client.list_resources()
-            LOG.info(f"Retrieved {len(resources)} resources from server")
-            LOG.info("Extracting resource schemas from retrieved resources")
-            resource_list = get_resource_schema(resources)
-        except McpError as e:
-            LOG.error(f"Resources not supported by MCP server: {e}")
-            resource_list = []  # Placeholder for resources if not supported
-
-        LOG.info("Retrieving resource templates from MCP server")
-        try:
-            resource_templates = await client.list_resource_templates()
-            LOG.info(f"Retrieved {len(resource_templates)} resource templates from server")
-            LOG.info("Extracting resource template schemas from retrieved resource templates")
-            resource_template_list = get_resource_template_schema(
-                resource_templates)  # Placeholder for resource templates
-        except McpError as e:
-            LOG.error(f"Resource templates not supported by MCP server: {e}")
-            resource_template_list = []
-
-        LOG.info("Retrieving prompts from MCP server")
-        try:
-            prompts = await client.list_prompts()
-            LOG.info(f"Retrieved {len(prompts)} prompts from server")
-            LOG.info("Extracting prompt schemas from retrieved prompts")
-            prompt_list = get_prompt_schema(prompts)
-        except McpError as e:
-            LOG.error(f"Prompts not supported by MCP server: {e}")
-            prompt_list = []
+        tool_list, resource_list, resource_template_list, prompt_list = await fetch_capabilities(client, use_cache)
+    finally:
+        await client.__aexit__(None, None, None)
 
     LOG.info("Completed fetching and processing MCP server schema")
-    return tool_list, resource_list, resource_template_list, prompt_list  # Returning empty lists for resources and prompts as placeholders
+    return tool_list, resource_list, resource_template_list, prompt_list
 
 
 def get_report_config_dict(self):
@@ -277,7 +352,7 @@ def get_report_config_dict(self):
         'site_name': self.name,
         'nav': [
             {'🏠 Home': 'index.md'},
-            {'🛠️ Tools': [{tool['NAME']: f'tools/{tool["NAME"]}.md'} for tool in self.tools]},
+            {'🛠️ Tools': [{tool.name: f'tools/{tool.name}.md'} for tool in self.tools]},
             {'📦 Resources': [{resource['NAME']: f'resources/{resource["NAME"]}.md'} for resource in self.resources]},
             {'🧩 Resource Templates': [{template['NAME']: f'resource_templates/{template["NAME"]}.md'} for template in
                                       self.resource_templates]},
@@ -1,12 +1,34 @@
+import asyncio
+import collections
+import contextlib
 import json
 import logging
+import threading
+import time
 
 from fastmcp import Client
 import streamlit as st
-from fastmcp.client import SSETransport, StreamableHttpTransport
+from fastmcp.exceptions import ToolError
+from mcp import McpError
+
+from lib.capability_lib import CAPABILITY_CACHE, TOOLS, CapabilityChangeHandler
+from lib.common_lib import create_client, iter_tool_pages
+from lib.metrics_lib import METRICS, get_payload_size
+from lib.record_lib import ToolRecord
+from lib.trace_lib import span
 
 LOG = logging.getLogger(__name__)
 
+SESSION_IDLE_TIMEOUT = 300.0  # Seconds after which an unused pooled session is closed
+SESSION_HEALTH_CHECK_INTERVAL = 30.0  # Seconds after which a pooled session is pinged before reuse
+SESSION_CLOSE_TIMEOUT = 5.0  # Seconds allowed for closing a session left behind by a closed event loop
+TOOL_CACHE_LIMIT = 5000  # Streamed tool lists longer than this are not kept in the capability cache
+TOOL_CALL_CONCURRENCY = 4  # Default maximum number of tool calls executed at the same time
+TOOL_RESULT_CACHE_TTL = 60.0  # Default seconds for which a cached tool result is served
+TOOL_RESULT_CACHE_MAX_ENTRIES = 256  # Maximum number of cached tool results
+SERVER_CHECK_TIMEOUT = 10.0  # Seconds a server gets to answer a connection test before it is reported as timed out
+SERVER_CHECK_CONCURRENCY = 8  # Maximum number of servers probed at the same time by check_servers
+
 
 async def get_client() -> Client:
     """
@@ -14,42 +36,285 @@ async def get_client() -> Client:
     :return: FastMCP client
     """
     client = None
-    if st.session_state.mcp_metadata['transport_type'] == 'SSE':
-        transport = SSETransport(url=st.session_state.mcp_metadata['url'])
-        client = Client(transport=transport)
-    elif st.session_state.mcp_metadata['transport_type'] == 'Streamable-HTTP':
-        transport = StreamableHttpTransport(url=st.session_state.mcp_metadata['url'])
-        client = Client(transport=transport)
+    if st.session_state.mcp_metadata['transport_type'] in ('SSE', 'Streamable-HTTP'):
+        client = create_client(st.session_state.mcp_metadata['transport_type'],
+                               st.session_state.mcp_metadata['url'])
 
     return client
 
 
-async def get_tools() -> (list, str):
+class PooledSession:
+    """An initialized MCP client session held by the session pool."""
+
+    __slots__ = ("client", "loop", "created_at", "last_used", "last_checked", "in_use")
+
+    def __init__(self, client: Client, loop: asyncio.AbstractEventLoop):
+        now = time.monotonic()
+        self.client = client
+        self.loop = loop
+        self.created_at = now
+        self.last_used = now
+        self.last_checked = now
+        self.in_use = 0
+
+
+class MCPSessionPool:
     """
-    Get the list of tools from the MCP server.
-    :return: List of tools
+    Keeps initialized MCP client sessions alive so that callers do not pay for a new
+    connection and MCP `initialize` handshake on every request.
+
+    Sessions are keyed by (transport_type, url) and are bound to the event loop that
+    created them. A session that has been idle for longer than the health-check interval
+    is pinged before it is handed out again, and sessions idle for longer than the idle
+    timeout are closed by a background reaper task.
+    """
+
+    def __init__(self,
+                 idle_timeout: float = SESSION_IDLE_TIMEOUT,
+                 health_check_interval: float = SESSION_HEALTH_CHECK_INTERVAL):
+        """
+        Initialize the session pool.
+        :param idle_timeout: Seconds after which an unused session is closed
+        :param health_check_interval: Seconds after which a session is pinged before reuse
+        """
+        self.idle_timeout = idle_timeout
+        self.health_check_interval = health_check_interval
+        self._sessions = {}
+        self._locks = {}
+        self._reapers = {}
+
+    def _get_lock(self, key: tuple, loop: asyncio.AbstractEventLoop) -> asyncio.Lock:
+        """Get the lock guarding session creation for the key on the given loop."""
+        lock_loop, lock = self._locks.get(key, (None, None))
+        if lock_loop is not loop:
+            lock = asyncio.Lock()
+            self._locks[key] = (loop, lock)
+        return lock
+
+    def _ensure_reaper(self, loop: asyncio.AbstractEventLoop):
+        """Start the idle-session reaper on the given loop if it is not running yet."""
+        reaper = self._reapers.get(loop)
+        if reaper is None or reaper.done():
+            # Forget reapers that belonged to loops which are already closed
+            self._reapers = {l: t for l, t in self._reapers.items() if not l.is_closed()}
+            self._reapers[loop] = loop.create_task(self._reap_idle_sessions())
+
+    async def _reap_idle_sessions(self):
+        """Periodically close sessions that have been idle for too long."""
+        while True:
+            await asyncio.sleep(max(self.idle_timeout / 2, 1.0))
+            await self.close_idle()
+
+    async def acquire(self, transport_type: str, url: str) -> Client:
+        """
+        Get an initialized client for the server, creating and connecting it if needed.
+        :param transport_type: Transport type of the MCP server
+        :param url: URL of the MCP server
+        :return: Connected FastMCP client
+        """
+        loop = asyncio.get_running_loop()
+        key = (transport_type, url)
+        self._ensure_reaper(loop)
+
+        async with self._get_lock(key, loop):
+            entry = self._sessions.get(key)
+
+            if entry is not None and entry.loop is not loop:
+                # The session belongs to another (most probably closed) event loop and cannot be used here
+                LOG.info(f"Dropping pooled session for {key} created on another event loop")
+                self._close_foreign_entry(key, entry)
+                entry = None
+
+            if entry is not None and not entry.client.is_connected():
+                LOG.info(f"Pooled session for {key} is no longer connected")
+                await self._close_entry(key, entry)
+                entry = None
+
+            if entry is not None and time.monotonic() - entry.last_checked > self.health_check_interval:
+                try:
+                    with span("ping", server=url), METRICS.measure(url, "ping"):
+                        await entry.client.ping()
+                    entry.last_checked = time.monotonic()
+                except Exception as e:
+                    LOG.warning(f"Health check failed for pooled session {key}: {e}")
+                    await self._close_entry(key, entry)
+                    entry = None
+
+            if entry is None:
+                LOG.info(f"Opening new pooled session for {key}")
+                client = create_client(transport_type, url, message_handler=CapabilityChangeHandler(url))
+                with span("initialize", server=url), METRICS.measure(url, "initialize"):
+                    await client.__aenter__()
+                entry = PooledSession(client, loop)
+                self._sessions[key] = entry
+
+            entry.in_use += 1
+            entry.last_used = time.monotonic()
+            return entry.client
+
+    def release(self, transport_type: str, url: str):
+        """
+        Hand a client obtained through `acquire` back to the pool.
+        :param transport_type: Transport type of the MCP server
+        :param url: URL of the MCP server
+        """
+        entry = self._sessions.get((transport_type, url))
+        if entry is not None:
+            entry.in_use = max(0, entry.in_use - 1)
+            entry.last_used = time.monotonic()
+
+    @contextlib.asynccontextmanager
+    async def session(self, transport_type: str, url: str):
+        """
+        Async context manager that lends a pooled client for the duration of the block.
+        The session is discarded if the block fails with anything other than an MCP/tool error.
+        :param transport_type: Transport type of the MCP server
+        :param url: URL of the MCP server
+        """
+        client = await self.acquire(transport_type, url)
+        try:
+            yield client
+        except (McpError, ToolError):
+            raise
+        except Exception:
+            await self.discard(transport_type, url)
+            raise
+        finally:
+            self.release(transport_type, url)
+
+    async def discard(self, transport_type: str, url: str):
+        """
+        Close and forget the pooled session for the server, if any.
+        :param transport_type: Transport type of the MCP server
+        :param url: URL of the MCP server
+        """
+        key = (transport_type, url)
+        entry = self._sessions.get(key)
+        if entry is not None:
+            await self._close_entry(key, entry)
+
+    async def close_idle(self):
+        """Close sessions that are not in use and have been idle for longer than the idle timeout."""
+        now = time.monotonic()
+        loop = asyncio.get_running_loop()
+        for key, entry in list(self._sessions.items()):
+            if entry.loop is loop and entry.in_use == 0 and now - entry.last_used > self.idle_timeout:
+                LOG.info(f"Closing idle pooled session for {key}")
+                await self._close_entry(key, entry)
+
+    async def close_all(self):
+        """Close every session that belongs to the running event loop."""
+        loop = asyncio.get_running_loop()
+        for key, entry in list(self._sessions.items()):
+            if entry.loop is loop:
+                await self._close_entry(key, entry)
+
+    def _close_foreign_entry(self, key: tuple, entry: PooledSession):
+        """
+        Remove an entry created on another event loop and close its client on that loop if it is
+        still running; otherwise close it best-effort in the background on the running loop.
+        """
+        if self._sessions.get(key) is entry:
+            del self._sessions[key]
+        CAPABILITY_CACHE.invalidate(key[1])
+        if entry.loop.is_running() and not entry.loop.is_closed():
+            asyncio.run_coroutine_threadsafe(self._close_entry(key, entry), entry.loop)
+            return
+
+        async def close_best_effort():
+            # The transport of a client whose loop is gone may never finish closing
+            with contextlib.suppress(Exception):
+                async with asyncio.timeout(SESSION_CLOSE_TIMEOUT):
+                    await self._close_entry(key, entry)
+
+        close_task = asyncio.ensure_future(close_best_effort())
+        _BACKGROUND_TASKS.add(close_task)
+        close_task.add_done_callback(_BACKGROUND_TASKS.discard)
+
+    async def _close_entry(self, key: tuple, entry: PooledSession):
+        """Remove the entry from the pool and close its client."""
+        if self._sessions.get(key) is entry:
+            del self._sessions[key]
+        # Without a live session, list_changed notifications can no longer reach the cache
+        CAPABILITY_CACHE.invalidate(key[1])
+        try:
+            await entry.client.close()
+        except Exception as e:
+            LOG.warning(f"Error closing pooled session for {key}: {e}")
+
+
+SESSION_POOL = MCPSessionPool()
+_BACKGROUND_TASKS = set()  # Strong references to fire-and-forget tasks (e.g. closing probe clients)
+
+
+def get_session_pool() -> MCPSessionPool:
     """
+    Get the process-wide MCP session pool.
+    :return: MCP session pool
+    """
+    return SESSION_POOL
+
+
+async def iter_tools(transport_type: str, url: str, refresh: bool = False, cache_limit: int = TOOL_CACHE_LIMIT):
+    """
+    Iterate over the tools of the MCP server, page by page, as they arrive.
+    The cached tool list is replayed when available. Otherwise the listing follows `nextCursor`
+    and the tools are cached at the end, provided there are no more than `cache_limit` of them
+    (so that memory stays bounded by the page size for very large servers).
+    :param transport_type: Transport type of the MCP server
+    :param url: URL of the MCP server
+    :param refresh: If True, bypass the cache and refetch the tool list
+    :param cache_limit: Maximum number of tools to keep for the cache (None for no limit)
+    :return: Async generator of ToolRecord objects
+    """
+    if not refresh:
+        cached_tools = CAPABILITY_CACHE.get(url, TOOLS)
+        if cached_tools:
+            LOG.info(f"Using cached tool list for {url}")
+            for tool_row in cached_tools:
+                yield tool_row
+            return
 
     tool_list = []
+    async with SESSION_POOL.session(transport_type, url) as client:
+        async for page in iter_tool_pages(client):
+            for tool in page:
+                tool_row = ToolRecord.from_tool(tool)
+                if tool_list is not None:
+                    tool_list.append(tool_row)
+                    if cache_limit is not None and len(tool_list) > cache_limit:
+                        LOG.info(f"Server {url} has more than {cache_limit} tools, tool list will not be cached")
+                        tool_list = None
+                yield tool_row
 
-    client = await get_client()
+    if tool_list:
+        CAPABILITY_CACHE.put(url, TOOLS, tool_list)
 
-    try:
-        async with client:
-            tools = await client.list_tools()
-            for tool in tools:
-                tool_row = {
-                    "NAME": tool.name,
-                    "TITLE": tool.title,
-                    "DESCRIPTION": tool.description,
-                    "MODEL_JSON": tool.model_dump_json(),
-                    "INPUT_SCHEMA": tool.inputSchema
-                }
+
+async def get_tools(transport_type: str, url: str, refresh: bool = False) -> (list, str):
+    """
+    Get the list of tools (ToolRecord objects) from the MCP server.
+    The list is served from the capability cache when available; it is refetched when the
+    cached copy has expired or the server announced that its tool list changed.
+    :param transport_type: Transport type of the MCP server
+    :param url: URL of the MCP server
+    :param refresh: If True, bypass the cache and refetch the tool list
+    :return: List of tools
+    """
+
+    tool_list = []
+
+    with span("get_tools", server=url, refresh=refresh) as tools_span:
+        try:
+            async for tool_row in iter_tools(transport_type, url, refresh=refresh, cache_limit=None):
                 tool_list.append(tool_row)
 
-    except Exception as e:
-        # st.error(f"Error fetching tools: {e}")
-        return [], f"{e}"
+        except Exception as e:
+            # st.error(f"Error fetching tools: {e}")
+            tools_span.status = "ERROR"
+            tools_span.set_attribute("error", f"{e}")
+            return [], f"{e}"
+        tools_span.set_attribute("tool_count", len(tool_list))
 
     if len(tool_list) == 0:
         return [], "No tools found on the MCP server."
@@ -57,46 +322,331 @@ async def get_tools() -> (list, str):
     return tool_list, "Success"
 
 
-async def test_selected_server(transport_type: str, url: str):
+async def test_selected_server(transport_type: str, url: str, timeout: float = SERVER_CHECK_TIMEOUT):
     """
     Test the selected MCP server by checking if it is reachable.
+    A pooled session is reused when available and verified with a ping round trip.
     :param transport_type: Transport type of the MCP server
     :param url: URL of the MCP server
+    :param timeout: Seconds to wait for the server before giving up
     """
     try:
-        client = None
-        if transport_type == 'SSE':
-            transport = SSETransport(url)
-            client = Client(transport=transport)
-        elif transport_type == 'Streamable-HTTP':
-            transport = StreamableHttpTransport(url)
-            client = Client(transport=transport)
-        else:
-            raise ValueError(f"Unsupported transport type: {transport_type}")
-
-        async with client:
-            pass
-            # tools = await client.list_tools()
-            # if not tools:
-            #     raise Exception("Cannot fetch tools from the MCP server. Please check the server URL or transport type.")
+        async with asyncio.timeout(timeout):
+            async with SESSION_POOL.session(transport_type, url) as client:
+                with METRICS.measure(url, "ping"):
+                    await client.ping()
+                # tools = await client.list_tools()
+                # if not tools:
+                #     raise Exception("Cannot fetch tools from the MCP server. Please check the server URL or transport type.")
         return True, "Server is reachable"
+    except TimeoutError:
+        return False, f"No response from the server within {timeout:g} seconds"
     except Exception as e:
         return False, f"{e}"
 
 
+async def _close_client(client: Client, timeout: float):
+    """Close a probe client, giving up after `timeout` seconds."""
+    with contextlib.suppress(Exception):
+        async with asyncio.timeout(timeout):
+            await client.close()
+
+
+async def check_server(name: str, transport_type: str, url: str, timeout: float = SERVER_CHECK_TIMEOUT) -> dict:
+    """
+    Probe one MCP server with a fresh (unpooled) connection: time the handshake and count the tools.
+    :param name: Name of the server in the registry
+    :param transport_type: Transport type of the MCP server
+    :param url: URL of the MCP server
+    :param timeout: Deadline in seconds for the handshake and the tool listing together
+    :return: Result row with the status, handshake latency and tool count
+    """
+    row = {"SERVER": name, "TRANSPORT_TYPE": transport_type, "URL": url,
+           "STATUS": None, "HANDSHAKE (MS)": None, "TOOLS": None, "ERROR": None}
+    client = None
+    try:
+        client = create_client(transport_type, url)
+        async with asyncio.timeout(timeout):
+            start_time = time.perf_counter()
+            with METRICS.measure(url, "initialize"):
+                await client.__aenter__()
+            row["HANDSHAKE (MS)"] = round((time.perf_counter() - start_time) * 1000, 1)
+
+            tool_count = 0
+            async for page in iter_tool_pages(client):
+                tool_count += len(page)
+            row["TOOLS"] = tool_count
+        row["STATUS"] = "Reachable"
+    except TimeoutError:
+        row["STATUS"] = "Timeout"
+        row["ERROR"] = f"No response within {timeout:g} seconds"
+    except Exception as e:
+        row["STATUS"] = "Unreachable"
+        row["ERROR"] = f"{e}"
+    finally:
+        if client is not None:
+            # Closing a connection to a hung server can block as long as the probe itself; do it in the
+            # background so the result is reported as soon as it is known
+            close_task = asyncio.ensure_future(_close_client(client, timeout))
+            _BACKGROUND_TASKS.add(close_task)
+            close_task.add_done_callback(_BACKGROUND_TASKS.discard)
+
+    LOG.info(f"Checked server [{name}]: {row['STATUS']}")
+    return row
+
+
+async def check_servers(servers: dict, timeout: float = SERVER_CHECK_TIMEOUT,
+                        max_concurrency: int = SERVER_CHECK_CONCURRENCY):
+    """
+    Probe all registered MCP servers concurrently, yielding each result as soon as it is available.
+    At most `max_concurrency` servers are probed at a time and every probe has its own deadline,
+    so a dead host delays only its own row.
+    :param servers: Registered servers as returned by server_lib.get_servers ({name: {"TRANSPORT_TYPE", "URL"}})
+    :param timeout: Deadline in seconds per server
+    :param max_concurrency: Maximum number of servers probed at the same time
+    :return: Async generator of result rows (see check_server), in completion order
+    """
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def _check(name: str, details: dict) -> dict:
+        async with semaphore:
+            return await check_server(name, details.get("TRANSPORT_TYPE"), details.get("URL"), timeout)
+
+    tasks = [asyncio.ensure_future(_check(name, details)) for name, details in servers.items()]
+    try:
+        for next_result in asyncio.as_completed(tasks):
+            yield await next_result
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+
+class ToolResultCache:
+    """
+    In-memory cache of tool call results, keyed by (server URL, tool name, canonicalized arguments).
+
+    Only tools whose annotations declare them read-only or idempotent are cached. Entries expire
+    after a per-tool TTL and the number of entries is bounded, with the least recently used entry
+    evicted first. Hits and misses are counted per tool.
+    """
+
+    def __init__(self, default_ttl: float = TOOL_RESULT_CACHE_TTL, max_entries: int = TOOL_RESULT_CACHE_MAX_ENTRIES):
+        """
+        Initialize the cache.
+        :param default_ttl: Seconds for which a result is served, unless a per-tool TTL is set
+        :param max_entries: Maximum number of cached results
+        """
+        self.default_ttl = default_ttl
+        self.max_entries = max_entries
+        self._ttls = {}
+        self._entries = collections.OrderedDict()
+        self._counters = collections.defaultdict(lambda: {"HITS": 0, "MISSES": 0})
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def is_cacheable(tool: ToolRecord) -> bool:
+        """
+        Whether the results of the tool may be cached, based on its annotations.
+        :param tool: ToolRecord of the tool (None if the tool is unknown)
+        :return: True if the tool is read-only or idempotent
+        """
+        return tool is not None and (tool.is_read_only() or tool.is_idempotent())
+
+    @staticmethod
+    def make_key(url: str, tool_name: str, arguments: dict) -> tuple:
+        """
+        Build the cache key of a tool call. Arguments are canonicalized so that key order does not matter.
+        :param url: URL of the MCP server
+        :param tool_name: Name of the tool
+        :param arguments: Tool arguments
+        :return: Cache key
+        """
+        return url, tool_name, json.dumps(arguments, sort_keys=True, separators=(",", ":"), default=str)
+
+    def set_ttl(self, tool_name: str, ttl: float):
+        """
+        Set the TTL for the results of one tool.
+        :param tool_name: Name of the tool
+        :param ttl: Seconds for which results of the tool are served (0 disables caching for the tool)
+        """
+        with self._lock:
+            self._ttls[tool_name] = ttl
+
+    def get(self, key: tuple):
+        """
+        Get a cached result.
+        :param key: Cache key (see make_key)
+        :return: Cached result, or None on a miss
+        """
+        tool_name = key[1]
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] > self._ttls.get(tool_name, self.default_ttl):
+                del self._entries[key]
+                entry = None
+
+            if entry is None:
+                self._counters[tool_name]["MISSES"] += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._counters[tool_name]["HITS"] += 1
+            return entry[1]
+
+    def put(self, key: tuple, result):
+        """
+        Store a result, evicting the least recently used entries beyond the size bound.
+        :param key: Cache key (see make_key)
+        :param result: Tool call result
+        """
+        with self._lock:
+            if self._ttls.get(key[1], self.default_ttl) <= 0:
+                return
+            self._entries[key] = (time.monotonic(), result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> list:
+        """
+        Get the hit/miss statistics per tool.
+        :return: List of rows with tool name, hits, misses and hit rate
+        """
+        with self._lock:
+            rows = []
+            for tool_name, counter in sorted(self._counters.items()):
+                total = counter["HITS"] + counter["MISSES"]
+                rows.append({"TOOL": tool_name,
+                             "HITS": counter["HITS"],
+                             "MISSES": counter["MISSES"],
+                             "HIT RATE": counter["HITS"] / total if total else 0.0})
+            return rows
+
+    def clear(self):
+        """Drop every cached result and reset the statistics."""
+        with self._lock:
+            self._entries.clear()
+            self._counters.clear()
+
+
+TOOL_RESULT_CACHE = ToolResultCache()
 
-async def call_tool(tool_call: dict):
+
+def get_tool_result_cache() -> ToolResultCache:
+    """
+    Get the process-wide tool result cache.
+    :return: Tool result cache
+    """
+    return TOOL_RESULT_CACHE
+
+
+async def call_tool(transport_type: str, url: str, tool_call: dict, tool: ToolRecord = None, use_cache: bool = False):
     """
     Call a tool on the MCP server.
+    :param transport_type: Transport type of the MCP server
+    :param url: URL of the MCP server
     :param tool_call: Tool call dictionary containing tool name and arguments
+    :param tool: ToolRecord of the called tool (needed for result caching)
+    :param use_cache: If True, serve/store the result from/in the tool result cache when the tool annotations allow it
     :return: Tool response
     """
-    client = await get_client()
 
-    try:
-        async with client:
-            response = await client.call_tool(tool_call.function.name, json.loads(tool_call.function.arguments))
+    with span("call_tool", tool=tool_call.function.name, server=url) as call_span:
+        try:
+            arguments = json.loads(tool_call.function.arguments)
+            call_span.set_attribute("bytes_sent", len(tool_call.function.arguments.encode("utf-8")))
+            cache_key = None
+            if use_cache and ToolResultCache.is_cacheable(tool):
+                cache_key = ToolResultCache.make_key(url, tool_call.function.name, arguments)
+                cached_response = TOOL_RESULT_CACHE.get(cache_key)
+                call_span.set_attribute("cache_hit", cached_response is not None)
+                if cached_response is not None:
+                    LOG.info(f"Using cached result for tool `{tool_call.function.name}`")
+                    return cached_response, "Success"
+
+            async with SESSION_POOL.session(transport_type, url) as client:
+                with METRICS.measure(url, "tools/call", tool_call.function.name) as measurement:
+                    measurement.bytes_sent = call_span.attributes["bytes_sent"]
+                    response = await client.call_tool(tool_call.function.name, arguments)
+                    measurement.bytes_received = get_payload_size(response.content)
+                    measurement.error = response.is_error
+            call_span.set_attributes(bytes_received=measurement.bytes_received, is_error=response.is_error)
+
+            if cache_key is not None and not response.is_error:
+                TOOL_RESULT_CACHE.put(cache_key, response)
             return response, "Success"
-    except Exception as e:
-        LOG.error(f"Error calling tool: {e}")
-        return None, f"Error calling tool: {e}"
+        except Exception as e:
+            LOG.error(f"Error calling tool: {e}")
+            call_span.status = "ERROR"
+            call_span.set_attribute("error", f"{e}")
+            return None, f"Error calling tool: {e}"
+
+
+def can_overlap_tool_calls(tool: ToolRecord) -> bool:
+    """
+    Decide from the tool annotations whether calls to the tool may run concurrently with other calls.
+    Read-only tools may always overlap; idempotent tools may overlap unless they are destructive,
+    which per MCP they are unless explicitly marked otherwise (destructiveHint false). Tools
+    without such hints (or unknown tools) are executed on their own.
+    :param tool: ToolRecord of the tool (None if the tool is unknown)
+    :return: True if calls may overlap
+    """
+    if tool is None:
+        return False
+    if tool.is_read_only():
+        return True
+    if tool.is_destructive():
+        return False
+    return tool.is_idempotent()
+
+
+async def call_tools(transport_type: str, url: str, tool_calls: list, tools: list,
+                     max_concurrency: int = TOOL_CALL_CONCURRENCY, use_cache: bool = False) -> list:
+    """
+    Execute the tool calls selected by the LLM, running independent calls concurrently.
+
+    Consecutive calls to tools that may overlap (see can_overlap_tool_calls) run together, at most
+    `max_concurrency` at a time. Any other call waits for the calls before it and runs alone, so
+    destructive calls are serialized and keep their position relative to the other calls.
+    :param transport_type: Transport type of the MCP server
+    :param url: URL of the MCP server
+    :param tool_calls: Tool calls returned by the LLM
+    :param tools: ToolRecords of the tools available on the server
+    :param max_concurrency: Maximum number of calls executed at the same time
+    :param use_cache: If True, use the tool result cache for tools whose annotations allow it
+    :return: List of (response, status) tuples in the same order as tool_calls
+    """
+    with span("call_tools", call_count=len(tool_calls), max_concurrency=max_concurrency):
+        return await _call_tools(transport_type, url, tool_calls, tools, max_concurrency, use_cache)
+
+
+async def _call_tools(transport_type: str, url: str, tool_calls: list, tools: list,
+                      max_concurrency: int, use_cache: bool) -> list:
+    """Execute the tool calls (see call_tools)."""
+    tools_by_name = {tool.name: tool for tool in tools}
+    results = [None] * len(tool_calls)
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def _call(index: int, tool_call):
+        async with semaphore:
+            results[index] = await call_tool(transport_type, url, tool_call,
+                                             tool=tools_by_name.get(tool_call.function.name),
+                                             use_cache=use_cache)
+
+    batch = []
+    for index, tool_call in enumerate(tool_calls):
+        if can_overlap_tool_calls(tools_by_name.get(tool_call.function.name)):
+            batch.append(_call(index, tool_call))
+            continue
+
+        if batch:
+            await asyncio.gather(*batch)
+            batch = []
+        LOG.info(f"Executing tool call `{tool_call.function.name}` on its own")
+        await _call(index, tool_call)
+
+    if batch:
+        await asyncio.gather(*batch)
+
+    return results
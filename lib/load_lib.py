@@ -0,0 +1,224 @@
+import asyncio
+import itertools
+import json
+import logging
+import math
+import os
+import time
+
+from fastmcp.exceptions import ToolError
+from mcp import McpError
+
+from lib.fastmcp_lib import get_session_pool
+from lib.metrics_lib import METRICS, get_payload_size
+
+LOG = logging.getLogger(os.path.splitext(os.path.basename(__file__))[0])
+
+LOAD_TEST_CALL_TIMEOUT = 30.0  # Seconds a load test call may take; calls in flight on a broken session never return
+
+
+def percentile(sorted_values: list, pct: float) -> float:
+    """
+    Get a percentile of already sorted values (nearest-rank method).
+    :param sorted_values: Values sorted in ascending order
+    :param pct: Percentile between 0 and 100
+    :return: Percentile value (0.0 for an empty list)
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize_latencies(latencies: list, errors: int, elapsed: float) -> dict:
+    """
+    Summarize the outcome of a batch of calls.
+    :param latencies: Latencies of all calls in seconds
+    :param errors: Number of failed calls
+    :param elapsed: Wall-clock duration of the batch in seconds
+    :return: Summary row with throughput, error rate and latency percentiles (ms)
+    """
+    calls = len(latencies)
+    sorted_latencies = sorted(latencies)
+    return {
+        "CALLS": calls,
+        "ERRORS": errors,
+        "ERROR RATE": errors / calls if calls else 0.0,
+        "THROUGHPUT (CALLS/S)": calls / elapsed if elapsed > 0 else 0.0,
+        "P50 (MS)": percentile(sorted_latencies, 50) * 1000,
+        "P90 (MS)": percentile(sorted_latencies, 90) * 1000,
+        "P99 (MS)": percentile(sorted_latencies, 99) * 1000,
+        "MAX (MS)": sorted_latencies[-1] * 1000 if sorted_latencies else 0.0,
+        "DURATION (S)": elapsed,
+    }
+
+
+def get_ramp_up_levels(concurrency: int, ramp_up_steps: int) -> list:
+    """
+    Get the concurrency level of each ramp-up step, ending at the target concurrency.
+    :param concurrency: Target concurrency
+    :param ramp_up_steps: Number of steps
+    :return: List of concurrency levels
+    """
+    ramp_up_steps = max(1, min(ramp_up_steps, concurrency))
+    return [max(1, math.ceil(concurrency * (step + 1) / ramp_up_steps)) for step in range(ramp_up_steps)]
+
+
+class _SharedSession:
+    """
+    Pooled MCP session shared by the workers of a load test.
+    When a call fails at the connection level, the broken session is discarded from the pool and
+    replaced once, no matter how many workers saw the failure. If no new session can be opened,
+    `error` is set and the workers stop.
+    """
+
+    def __init__(self, transport_type: str, url: str):
+        self.transport_type = transport_type
+        self.url = url
+        self.client = None
+        self.error = None
+        self._lock = asyncio.Lock()
+
+    async def open(self):
+        self.client = await get_session_pool().acquire(self.transport_type, self.url)
+
+    async def replace(self, failed_client):
+        """
+        Replace the session after `failed_client` failed, unless another worker already did.
+        :param failed_client: Client whose call failed at the connection level
+        """
+        async with self._lock:
+            if self.client is not failed_client or self.error is not None:
+                return
+            LOG.warning(f"Load test session to {self.url} failed; discarding it and reconnecting")
+            pool = get_session_pool()
+            await pool.discard(self.transport_type, self.url)
+            try:
+                self.client = await pool.acquire(self.transport_type, self.url)
+            except Exception as e:
+                LOG.error(f"Could not reconnect to {self.url} during the load test: {e}")
+                self.client = None
+                self.error = e
+
+    def close(self):
+        if self.client is not None:
+            get_session_pool().release(self.transport_type, self.url)
+
+
+async def _run_step(session: _SharedSession, url: str, tool_name: str, arguments_cycle, concurrency: int,
+                    duration: float = None, call_count: int = None) -> tuple:
+    """
+    Run one closed-loop step: `concurrency` workers call the tool back to back until the
+    duration has elapsed, `call_count` calls have been made or the shared session is lost for good.
+    Every call is also recorded in the process-wide metrics registry under the server URL.
+    :return: Tuple of (summary row of the step, latencies of all calls in seconds)
+    """
+    latencies = []
+    errors = 0
+    remaining = [call_count]
+    deadline = time.perf_counter() + duration if duration else None
+
+    def _next_call_allowed() -> bool:
+        if deadline is not None:
+            return time.perf_counter() < deadline
+        if remaining[0] <= 0:
+            return False
+        remaining[0] -= 1
+        return True
+
+    async def _worker():
+        nonlocal errors
+        while session.error is None and _next_call_allowed():
+            client = session.client
+            arguments = next(arguments_cycle)
+            start_time = time.perf_counter()
+            try:
+                with METRICS.measure(url, "tools/call", tool_name) as measurement:
+                    measurement.bytes_sent = len(json.dumps(arguments).encode("utf-8"))
+                    result = await client.call_tool_mcp(tool_name, arguments, timeout=LOAD_TEST_CALL_TIMEOUT)
+                    measurement.bytes_received = get_payload_size(result.content)
+                    measurement.error = result.isError
+                if result.isError:
+                    errors += 1
+            except (McpError, ToolError) as e:
+                LOG.debug(f"Load test call to `{tool_name}` failed: {e}")
+                errors += 1
+            except Exception as e:
+                # Connection-level failure: the session is broken for every worker, so replace it
+                LOG.debug(f"Load test call to `{tool_name}` failed at the connection level: {e}")
+                errors += 1
+                await session.replace(client)
+            latencies.append(time.perf_counter() - start_time)
+
+    start_time = time.perf_counter()
+    await asyncio.gather(*(_worker() for _ in range(concurrency)))
+    return summarize_latencies(latencies, errors, time.perf_counter() - start_time), latencies
+
+
+async def run_load_test(transport_type: str,
+                        url: str,
+                        tool_name: str,
+                        argument_sets: list,
+                        concurrency: int,
+                        duration: float = None,
+                        call_count: int = None,
+                        ramp_up_steps: int = 1) -> dict:
+    """
+    Fire a tool at the MCP server from a pool of closed-loop workers and measure how it holds up.
+
+    The test is split into ramp-up steps with increasing concurrency, ending at `concurrency`.
+    The duration (or call count) is shared evenly between the steps. Workers cycle through the
+    argument sets and share one pooled MCP session (replaced if it breaks): their calls are multiplexed as concurrent
+    requests over that single session, so the results measure the request throughput of one
+    client connection, not that of as many independent clients (sessions) as there are workers.
+
+    :param transport_type: Transport type of the MCP server
+    :param url: URL of the MCP server
+    :param tool_name: Name of the tool to call
+    :param argument_sets: List of argument dictionaries, used round robin
+    :param concurrency: Target number of concurrent workers
+    :param duration: Total duration of the test in seconds (either this or call_count)
+    :param call_count: Total number of calls to make (either this or duration)
+    :param ramp_up_steps: Number of steps used to ramp concurrency up to the target
+    :return: Dictionary with a "SUMMARY" row, a list of per-step "STEPS" rows and an "ERROR" message
+             (None unless the test stopped early because the server could no longer be reached)
+    """
+    if (duration is None) == (call_count is None):
+        raise ValueError("Specify either a duration or a call count for the load test.")
+    if not argument_sets:
+        raise ValueError("At least one argument set is required for the load test.")
+    if concurrency < 1:
+        raise ValueError("Concurrency must be at least 1.")
+
+    levels = get_ramp_up_levels(concurrency, ramp_up_steps)
+    LOG.info(f"Starting load test of `{tool_name}` on {url} with concurrency levels {levels}")
+
+    arguments_cycle = itertools.cycle(argument_sets)
+    steps = []
+    all_latencies = []
+    session = _SharedSession(transport_type, url)
+    await session.open()
+    try:
+        for step, level in enumerate(levels):
+            step_duration = duration / len(levels) if duration is not None else None
+            step_calls = None
+            if call_count is not None:
+                # Spread the calls over the steps, giving the remainder to the first steps
+                step_calls = call_count // len(levels) + (1 if step < call_count % len(levels) else 0)
+            row = {"STEP": step + 1, "CONCURRENCY": level}
+            step_summary, step_latencies = await _run_step(session, url, tool_name, arguments_cycle, level,
+                                                           step_duration, step_calls)
+            row.update(step_summary)
+            all_latencies.extend(step_latencies)
+            LOG.info(f"Load test step {step + 1}: {row}")
+            steps.append(row)
+            if session.error is not None:
+                break
+    finally:
+        session.close()
+
+    summary = summarize_latencies(all_latencies,
+                                  sum(row["ERRORS"] for row in steps),
+                                  sum(row["DURATION (S)"] for row in steps))
+    error = f"Connection to the server lost and could not be reopened: {session.error}" if session.error else None
+    return {"SUMMARY": summary, "STEPS": steps, "ERROR": error}
@@ -1,18 +1,26 @@
 import collections
+import concurrent.futures
+import hashlib
+import json
 import logging
 import os
-import shutil
 import yaml
 from fastmcp import Client
 from typing import Literal
 
 from fastmcp.client import SSETransport, StreamableHttpTransport
 
+from lib.capability_lib import CapabilityChangeHandler
 from lib.common_lib import get_mcp_schema, get_report_config_dict
-from lib.md_lib import create_report_folder, MarkdownCreator
+from lib.md_lib import create_report_folder, get_output_name, MarkdownCreator
+from lib.sink_lib import DocumentSink, DirectorySink
 
 LOG = logging.getLogger(os.path.splitext(os.path.basename(__file__))[0])
 
+DOC_WORKERS = min(32, (os.cpu_count() or 1) + 4)  # Worker threads that render and write documentation pages
+MANIFEST_FILE = ".mxp-manifest.json"  # Content hashes of an incrementally updated documentation folder
+RENDER_VERSION = 2  # Bump when the output of the render functions changes, to rewrite every page once
+
 
 class MCPServerDoc:
     """Class representing an MCP server for documentation purposes."""
@@ -21,13 +29,16 @@ class MCPServerDoc:
                  name:str,
                  transport_type: Literal['SSE', 'Streamable-HTTP'],
                  url: str,
-                 version: str= None):
+                 version: str= None,
+                 client: Client = None):
         """
         Initialize the MCPServer instance.
         :param name: Server name
         :param transport_type: Transport type of the MCP server (e.g., 'SSE', 'Streamable-HTTP')
         :param url: URL of the MCP server
         :param version: Version of the MCP server (optional)
+        :param client: Pre-built FastMCP client to use instead of one created from transport_type and url
+                       (e.g. an in-process client for benchmarks)
         """
         LOG.info(f"Initializing MCPServerDoc: name={name}, transport_type={transport_type}, url={url}, version={version}")
         self.name = name
@@ -42,14 +53,17 @@ class MCPServerDoc:
         self.prompts = []
         self.loaded = False
 
-        if transport_type == 'SSE':
+        if client is not None:
+            LOG.info("Using the provided client")
+            self.client = client
+        elif transport_type == 'SSE':
             LOG.info(f"Using SSETransport for URL: {url}")
             transport = SSETransport(url)
-            self.client = Client(transport=transport)
+            self.client = Client(transport=transport, message_handler=CapabilityChangeHandler(url))
         elif transport_type == 'Streamable-HTTP':
             LOG.info(f"Using StreamableHttpTransport for URL: {url}")
             transport = StreamableHttpTransport(url)
-            self.client = Client(transport=transport)
+            self.client = Client(transport=transport, message_handler=CapabilityChangeHandler(url))
         else:
             LOG.error(f"Unknown transport_type: {transport_type}")
             raise ValueError(f"Unknown transport_type: {transport_type}")
@@ -60,15 +74,16 @@ class MCPServerDoc:
         LOG.debug("Converting MCPServerDoc to string")
         return f"MCPServer(name={self.name}, transport_type={self.transport_type}, url={self.url}, version={self.version})"
 
-    async def load_schema(self):
+    async def load_schema(self, use_cache: bool = True):
         """
         Load the server schema.
-
-        :return: Tuple of (tools, resources, prompts) as lists
+        Categories listed within the capability cache TTL are served from the cache.
+        :param use_cache: Use the capability cache (False always fetches from the server)
+        :return: Tuple of (tools, resources, resource templates, prompts) as lists
         """
         LOG.info("Loading server schema using get_mcp_schema")
 
-        tools, resources, resource_templates, prompts = await get_mcp_schema(self.client)
+        tools, resources, resource_templates, prompts = await get_mcp_schema(self.client, use_cache)
         self.tools = tools
         self.resources = resources
         self.resource_templates = resource_templates
@@ -99,142 +114,343 @@ class MCPServerDoc:
         self.output_directory = directory
         LOG.info(f"Output directory set to: {self.output_directory}")
 
-    def generate_documentation(self) -> str:
+    def generate_documentation(self, sink: DocumentSink = None, max_workers: int = DOC_WORKERS,
+                               executor: concurrent.futures.Executor = None) -> str:
         """
-
-        :return: Path of the generated documentation folder
+        Generate the MkDocs documentation of the loaded schema.
+
+        Pages are rendered and written by a pool of worker threads (the assets are copied by the
+        same pool). Every page has a fixed path derived from its item, so the output does not
+        depend on the order in which the workers finish. Failures of individual pages do not stop
+        the other pages; they are raised together as an ExceptionGroup at the end.
+        :param sink: Destination of the files (default: a new timestamped folder under reports/).
+                     The sink is not closed, so the caller can add files or read it afterward.
+        :param max_workers: Maximum number of pages rendered and written at the same time
+        :param executor: Executor that renders the pages instead of a private thread pool (e.g. a
+                         ProcessPoolExecutor shared by several servers); the pages are then written
+                         by the calling thread and max_workers is not used
+        :return: Location of the generated documentation (the folder path for a DirectorySink)
         """
         if self.loaded:
             LOG.info("Generating documentation for MCP server")
             if self.document_tool_type == "mkdocs":
                 LOG.info("Generating documentation using MkDocs")
-                # Create the output directory if it doesn't exist
-                report_folder = create_report_folder()
-
-                docs_folder = create_report_folder(report_folder, "docs")
-                tools_folder = create_report_folder(docs_folder, "tools")
-                resources_folder = create_report_folder(docs_folder, "resources")
-                resource_templates_folder = create_report_folder(docs_folder, "resource_templates")
-                prompts_folder = create_report_folder(docs_folder, "prompts")
+                if sink is None:
+                    # Create the output directory if it doesn't exist
+                    sink = DirectorySink(create_report_folder())
 
-                report_config_file = f"{report_folder}/mkdocs.yml"
                 report_config_dict = get_report_config_dict(self)
-                with open(report_config_file, "w", encoding="utf-8") as f:
-                    yaml.dump(report_config_dict, f, sort_keys=False)
-
-                # Add index.md in the docs folder
-                index_file = os.path.join(docs_folder, "index.md")
-                mc = MarkdownCreator(index_file)
-                mc.h1(self.name)
-                mc.table_from_list_of_list([
-                    ["Transport Type", "URL", "Version"],
-                    [self.transport_type, self.url, self.version if self.version else "N/A"]
-                ])
-                mc.save_to_file()
-
-                # Copy assets folder to docs folder
-                assets_folder = os.path.join(os.path.dirname(__file__), "assets")
-                if os.path.exists(assets_folder):
-                    destination_folder = os.path.join(docs_folder, "assets")
-                    shutil.copytree(assets_folder, destination_folder)
-
-
-                # Add tools documentation
-                for tool in self.tools:
-                    tool_file = os.path.join(tools_folder, f"{tool['NAME']}.md")
-                    mc = MarkdownCreator(tool_file)
-                    mc.h1(f"🛠️ {tool['NAME']}")
-                    # mc.paragraph(f"**Title:** {tool.get('TITLE', 'N/A')}")
-                    mc.paragraph("**Tool Description:**")
-                    mc.code(tool["DESCRIPTION"],)
-                    # title_description = [
-                    #     ["Title", "Description"],
-                    #     [tool.get("TITLE", "N/A"), tool.get("DESCRIPTION", "N/A")]
-                    # ]
-                    # mc.table_from_list_of_list(title_description)
-                    mc.h2("📥 Input Parameters")
-                    input_params = tool.get("INPUT_PARAMS", [])
-                    # mc.table_from_list_of_dict(input_params)
-                    for input_param in input_params:
-                        mc.h3(f"<kbd>{input_param.get("PARAMETER", "N/A")}</kbd>")
-                        # mc.paragraph(f"**Description:**")
-                        mc.code(input_param.get("DESCRIPTION", "N/A"))
-                        # get input_param by excluding NAME, TITLE, DESCRIPTION
-                        input_param_details = {k: v for k, v in input_param.items() if k not in ["PARAMETER", "TITLE", "DESCRIPTION"]}
-
-                        p1 = {k: v for k, v in input_param_details.items() if k == 'REQUIRED'}
-                        p2 = {k: v for k, v in input_param_details.items() if k == 'TYPE'}
-                        p3 = {k: v for k, v in input_param_details.items() if k not in ['REQUIRED', 'TYPE']}
-
-                        p4 = collections.OrderedDict()
-                        p4.update(p1)
-                        p4.update(p2)
-                        p4.update(p3)
-
-                        p5 = collections.OrderedDict()
-                        for k, v in p4.items():
-                            if k == 'ENUM' and isinstance(v, list):
-                                val = ""
-                                for item in v:
-                                    val = val + f"<kbd>{item}</kbd> "
-                                p5[k] = val.strip()
-                            else:
-                                p5[k] = v
-
-                        mc.table_from_list_of_dict([p5])
-                    mc.h2("📤 Output Schema")
-                    output_params = tool.get("OUTPUT_PARAMS", [])
-                    mc.table_from_list_of_dict(output_params)
-                    mc.h2("🏷️ Annotations")
-                    annotations = tool.get("ANNOTATIONS", {})
-                    mc.table_from_list_of_dict([annotations])
-                    mc.save_to_file()
-
-                # Add resources documentation
-                for resource in self.resources:
-                    resource_file = os.path.join(resources_folder, f"{resource['NAME']}.md")
-                    mc = MarkdownCreator(resource_file)
-                    mc.h1(f"📦 {resource['NAME']}")
-                    mc.paragraph(f"**Resource Description:**")
-                    mc.code(resource.get('DESCRIPTION', 'N/A'))
-
-                    mc.paragraph("**Resource Parameters**")
-                    other_params = {k: v for k, v in resource.items() if k not in ['NAME', 'DESCRIPTION', 'TITLE']}
-                    mc.table_from_list_of_dict([other_params])
-
-                    mc.save_to_file()
-
-                # Add resource templates documentation
-                for template in self.resource_templates:
-                    template_file = os.path.join(resource_templates_folder, f"{template['NAME']}.md")
-                    mc = MarkdownCreator(template_file)
-                    mc.h1(f"🧩 {template['NAME']}")
-                    mc.paragraph(f"**Template Description:**")
-                    mc.code(template.get('DESCRIPTION', 'N/A'))
-
-                    mc.paragraph("**Template Parameters**")
-                    other_template_params = {k: v for k, v in template.items() if k not in ['NAME', 'DESCRIPTION', 'TITLE']}
-                    mc.table_from_list_of_dict([other_template_params])
-
-                    mc.save_to_file()
-
-                # Add prompts documentation
-                for prompt in self.prompts:
-                    prompt_file = os.path.join(prompts_folder, f"{prompt['NAME']}.md")
-                    mc = MarkdownCreator(prompt_file)
-                    mc.h1(f"💬 {prompt['NAME']}")
-                    mc.paragraph(f"**Prompt Description:**")
-                    mc.code(prompt.get('DESCRIPTION', 'N/A'))
-
-                    mc.paragraph("**Prompt Parameters**")
-                    other_prompt_params = {k: v for k, v in prompt.items() if k not in ['NAME', 'DESCRIPTION', 'TITLE']}
-                    mc.table_from_list_of_dict(other_prompt_params["ARGUMENTS"])
-
-                    mc.save_to_file()
-
-                LOG.info(f"Documentation generated successfully in {report_folder}")
-                return report_folder
+                sink.write_text("mkdocs.yml", yaml.dump(report_config_dict, sort_keys=False))
+
+                errors = _write_pages(sink, self.get_page_jobs(), max_workers, copy_assets=True,
+                                      executor=executor)
+                if errors:
+                    raise ExceptionGroup(f"{len(errors)} documentation page(s) could not be generated",
+                                         list(errors.values()))
+
+                LOG.info(f"Documentation generated successfully in {sink.location}")
+                return sink.location
             elif self.document_tool_type == "mdutils":
                 raise NotImplementedError("MDUtils documentation generation is not implemented yet")
         else:
-            raise Exception("Load schema before generating documentation")
\ No newline at end of file
+            raise Exception("Load schema before generating documentation")
+
+    def update_documentation(self, output_directory: str = None, max_workers: int = DOC_WORKERS,
+                             executor: concurrent.futures.Executor = None) -> dict:
+        """
+        Update the MkDocs documentation of the loaded schema in a stable folder, rewriting only what changed.
+
+        The folder keeps a manifest (MANIFEST_FILE) with a hash of the source data of every page.
+        Pages whose hash is unchanged (and whose file still exists) are not rendered again, pages of
+        removed items are deleted, and mkdocs.yml is only rewritten when the navigation changes.
+        Pages that fail are left out of the manifest, so the next update retries them.
+        :param output_directory: MkDocs project root: mkdocs.yml and the manifest are written there and the
+                                 pages under its docs/ folder (default: reports/<server name>, a stable
+                                 folder per server next to the timestamped ones of generate_documentation)
+        :param max_workers: Maximum number of pages rendered and written at the same time
+        :param executor: Executor that renders the pages instead of a private thread pool (e.g. a
+                         ProcessPoolExecutor shared by several servers); the pages are then written
+                         by the calling thread and max_workers is not used
+        :return: Dictionary with the WRITTEN and DELETED page paths, the UNCHANGED page count and
+                 whether mkdocs.yml was updated (CONFIG_UPDATED)
+        """
+        if not self.loaded:
+            raise Exception("Load schema before generating documentation")
+        if self.document_tool_type != "mkdocs":
+            raise NotImplementedError("Incremental documentation is only implemented for MkDocs")
+
+        sink = DirectorySink(output_directory or os.path.join("reports", get_output_name(self.name)))
+        LOG.info(f"Updating documentation in {sink.location}")
+        manifest = _read_manifest(sink)
+        old_pages = manifest["PAGES"] if manifest.get("RENDER_VERSION") == RENDER_VERSION else {}
+
+        config_text = yaml.dump(get_report_config_dict(self), sort_keys=False)
+        config_hash = _get_hash(config_text)
+        config_updated = manifest.get("CONFIG") != config_hash or not sink.exists("mkdocs.yml")
+        if config_updated:
+            sink.write_text("mkdocs.yml", config_text)
+
+        new_pages = {}
+        changed_jobs = []
+        for relative_path, render_page, item in self.get_page_jobs():
+            page_hash = get_page_hash(render_page, item)
+            new_pages[relative_path] = page_hash
+            if old_pages.get(relative_path) != page_hash or not sink.exists(f"docs/{relative_path}"):
+                changed_jobs.append((relative_path, render_page, item))
+
+        deleted = sorted(set(manifest.get("PAGES", {})) - set(new_pages))
+        for relative_path in deleted:
+            sink.delete(f"docs/{relative_path}")
+
+        errors = _write_pages(sink, changed_jobs, max_workers, copy_assets=not sink.exists("docs/assets"),
+                              executor=executor)
+        for relative_path in errors:
+            new_pages.pop(relative_path, None)
+
+        sink.write_text(MANIFEST_FILE, json.dumps({
+            "RENDER_VERSION": RENDER_VERSION,
+            "CONFIG": config_hash,
+            "PAGES": new_pages,
+        }, indent=2, sort_keys=True))
+
+        if errors:
+            raise ExceptionGroup(f"{len(errors)} documentation page(s) could not be generated", list(errors.values()))
+
+        LOG.info(f"Documentation updated in {sink.location}: {len(changed_jobs)} page(s) written, "
+                 f"{len(deleted)} deleted, config {'updated' if config_updated else 'unchanged'}")
+        return {
+            "WRITTEN": [relative_path for relative_path, _, _ in changed_jobs],
+            "DELETED": deleted,
+            "UNCHANGED": len(new_pages) - len(changed_jobs),
+            "CONFIG_UPDATED": config_updated,
+        }
+
+    def get_page_jobs(self) -> list:
+        """
+        List the documentation pages of the loaded schema.
+        :return: List of (path relative to the docs folder, render function, item) in navigation order
+        """
+        jobs = [("index.md", render_index_page, self.get_server_info())]
+        jobs.extend((f"tools/{tool.name}.md", render_tool_page, tool) for tool in self.tools)
+        jobs.extend((f"resources/{resource['NAME']}.md", render_resource_page, resource)
+                    for resource in self.resources)
+        jobs.extend((f"resource_templates/{template['NAME']}.md", render_resource_template_page, template)
+                    for template in self.resource_templates)
+        jobs.extend((f"prompts/{prompt['NAME']}.md", render_prompt_page, prompt) for prompt in self.prompts)
+        return jobs
+
+    def get_server_info(self) -> dict:
+        """
+        Get the server details shown on the index page.
+        :return: Dictionary with the name, transport type, URL and version of the server
+        """
+        return {"NAME": self.name, "TRANSPORT_TYPE": self.transport_type, "URL": self.url, "VERSION": self.version}
+
+
+def _write_page(sink: DocumentSink, relative_path: str, render_page, item):
+    """Render one documentation page and write it to the sink."""
+    sink.write_text(relative_path, render_page(item))
+
+
+def _write_pages(sink: DocumentSink, jobs: list, max_workers: int, copy_assets: bool,
+                 executor: concurrent.futures.Executor = None) -> dict:
+    """
+    Render and write documentation pages with a pool of worker threads, or render them with the
+    given executor and write them from the calling thread as they complete.
+    :param sink: Destination of the files
+    :param jobs: Pages to write, as returned by MCPServerDoc.get_page_jobs
+    :param max_workers: Maximum number of pages rendered and written at the same time
+    :param copy_assets: Also copy the assets folder to docs/assets
+    :param executor: Executor that renders the pages (render functions and items must be picklable
+                     for a ProcessPoolExecutor)
+    :return: Dictionary of page path (or "assets") to the exception it failed with
+    """
+    errors = {}
+    # Copy assets folder to docs folder
+    assets_folder = os.path.join(os.path.dirname(__file__), "assets")
+    copy_assets = copy_assets and os.path.exists(assets_folder)
+
+    if executor is not None:
+        if copy_assets:
+            try:
+                sink.copy_tree(assets_folder, "docs/assets")
+            except Exception as error:
+                LOG.error(f"Error generating assets: {error}")
+                error.add_note("While generating assets")
+                errors["assets"] = error
+        futures = {executor.submit(render_page, item): relative_path for relative_path, render_page, item in jobs}
+        for future in concurrent.futures.as_completed(futures):
+            relative_path = futures[future]
+            try:
+                sink.write_text(f"docs/{relative_path}", future.result())
+            except Exception as error:
+                LOG.error(f"Error generating {relative_path}: {error}")
+                error.add_note(f"While generating {relative_path}")
+                errors[relative_path] = error
+        return errors
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, max_workers),
+                                               thread_name_prefix="mcpdoc") as executor:
+        futures = {}
+        if copy_assets:
+            futures[executor.submit(sink.copy_tree, assets_folder, "docs/assets")] = "assets"
+
+        for relative_path, render_page, item in jobs:
+            futures[executor.submit(_write_page, sink, f"docs/{relative_path}", render_page, item)] = relative_path
+
+        for future in concurrent.futures.as_completed(futures):
+            error = future.exception()
+            if error is not None:
+                LOG.error(f"Error generating {futures[future]}: {error}")
+                error.add_note(f"While generating {futures[future]}")
+                errors[futures[future]] = error
+    return errors
+
+
+def _get_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def get_page_hash(render_page, item) -> str:
+    """
+    Hash the source data of a documentation page.
+    :param render_page: Render function of the page
+    :param item: Item rendered on the page (a ToolRecord or a schema dictionary)
+    :return: Hex digest that changes whenever the rendered page could change
+    """
+    data = item.to_dict() if hasattr(item, "to_dict") else item
+    return _get_hash(json.dumps([RENDER_VERSION, render_page.__name__, data], sort_keys=True, default=str))
+
+
+def _read_manifest(sink: DirectorySink) -> dict:
+    """Read the manifest of a documentation folder (empty if missing or unreadable)."""
+    text = sink.read_text(MANIFEST_FILE)
+    if text is None:
+        return {}
+    try:
+        manifest = json.loads(text)
+    except ValueError as e:
+        LOG.warning(f"Ignoring unreadable {MANIFEST_FILE}: {e}")
+        return {}
+    return manifest if isinstance(manifest.get("PAGES"), dict) else {}
+
+
+def render_index_page(server_info: dict) -> str:
+    """
+    Render the index page of the documentation.
+    :param server_info: Server details (see MCPServerDoc.get_server_info)
+    :return: Markdown text
+    """
+    mc = MarkdownCreator("index.md")
+    mc.h1(server_info["NAME"])
+    mc.table_from_list_of_list([
+        ["Transport Type", "URL", "Version"],
+        [server_info["TRANSPORT_TYPE"], server_info["URL"], server_info["VERSION"] if server_info["VERSION"] else "N/A"]
+    ])
+    return mc.md_doc()
+
+
+def render_tool_page(tool) -> str:
+    """
+    Render the documentation page of a tool.
+    :param tool: ToolRecord of the tool
+    :return: Markdown text
+    """
+    mc = MarkdownCreator(f"{tool.name}.md")
+    mc.h1(f"🛠️ {tool.name}")
+    # mc.paragraph(f"**Title:** {tool.get('TITLE', 'N/A')}")
+    mc.paragraph("**Tool Description:**")
+    mc.code(tool.description,)
+    # title_description = [
+    #     ["Title", "Description"],
+    #     [tool.get("TITLE", "N/A"), tool.get("DESCRIPTION", "N/A")]
+    # ]
+    # mc.table_from_list_of_list(title_description)
+    mc.h2("📥 Input Parameters")
+    input_params = tool.input_params
+    # mc.table_from_list_of_dict(input_params)
+    for input_param in input_params:
+        mc.h3(f"<kbd>{input_param.get('PARAMETER', 'N/A')}</kbd>")
+        # mc.paragraph(f"**Description:**")
+        mc.code(input_param.get("DESCRIPTION", "N/A"))
+        # get input_param by excluding NAME, TITLE, DESCRIPTION
+        input_param_details = {k: v for k, v in input_param.items() if k not in ["PARAMETER", "TITLE", "DESCRIPTION"]}
+
+        p1 = {k: v for k, v in input_param_details.items() if k == 'REQUIRED'}
+        p2 = {k: v for k, v in input_param_details.items() if k == 'TYPE'}
+        p3 = {k: v for k, v in input_param_details.items() if k not in ['REQUIRED', 'TYPE']}
+
+        p4 = collections.OrderedDict()
+        p4.update(p1)
+        p4.update(p2)
+        p4.update(p3)
+
+        p5 = collections.OrderedDict()
+        for k, v in p4.items():
+            if k == 'ENUM' and isinstance(v, list):
+                val = ""
+                for item in v:
+                    val = val + f"<kbd>{item}</kbd> "
+                p5[k] = val.strip()
+            else:
+                p5[k] = v
+
+        mc.table_from_list_of_dict([p5])
+    mc.h2("📤 Output Schema")
+    output_params = tool.output_params
+    mc.table_from_list_of_dict(output_params)
+    mc.h2("🏷️ Annotations")
+    annotations = tool.annotation_row
+    mc.table_from_list_of_dict([annotations])
+    return mc.md_doc()
+
+
+def render_resource_page(resource: dict) -> str:
+    """
+    Render the documentation page of a resource.
+    :param resource: Resource schema dictionary
+    :return: Markdown text
+    """
+    mc = MarkdownCreator(f"{resource['NAME']}.md")
+    mc.h1(f"📦 {resource['NAME']}")
+    mc.paragraph(f"**Resource Description:**")
+    mc.code(resource.get('DESCRIPTION', 'N/A'))
+
+    mc.paragraph("**Resource Parameters**")
+    other_params = {k: v for k, v in resource.items() if k not in ['NAME', 'DESCRIPTION', 'TITLE']}
+    mc.table_from_list_of_dict([other_params])
+    return mc.md_doc()
+
+
+def render_resource_template_page(template: dict) -> str:
+    """
+    Render the documentation page of a resource template.
+    :param template: Resource template schema dictionary
+    :return: Markdown text
+    """
+    mc = MarkdownCreator(f"{template['NAME']}.md")
+    mc.h1(f"🧩 {template['NAME']}")
+    mc.paragraph(f"**Template Description:**")
+    mc.code(template.get('DESCRIPTION', 'N/A'))
+
+    mc.paragraph("**Template Parameters**")
+    other_template_params = {k: v for k, v in template.items() if k not in ['NAME', 'DESCRIPTION', 'TITLE']}
+    mc.table_from_list_of_dict([other_template_params])
+    return mc.md_doc()
+
+
+def render_prompt_page(prompt: dict) -> str:
+    """
+    Render the documentation page of a prompt.
+    :param prompt: Prompt schema dictionary
+    :return: Markdown text
+    """
+    mc = MarkdownCreator(f"{prompt['NAME']}.md")
+    mc.h1(f"💬 {prompt['NAME']}")
+    mc.paragraph(f"**Prompt Description:**")
+    mc.code(prompt.get('DESCRIPTION', 'N/A'))
+
+    mc.paragraph("**Prompt Parameters**")
+    other_prompt_params = {k: v for k, v in prompt.items() if k not in ['NAME', 'DESCRIPTION', 'TITLE']}
+    mc.table_from_list_of_dict(other_prompt_params["ARGUMENTS"])
+    return mc.md_doc()
@@ -6,9 +6,11 @@ Provides methods to add headers, lists, tables, and save the document.
 """
 
 import logging
-from typing import List
+from typing import Iterable, List
 import os
 import datetime
+import itertools
+import re
 
 LOG = logging.getLogger(os.path.splitext(os.path.basename(__file__))[0])
 
@@ -28,6 +30,41 @@ class MarkdownCreator:
         self.filename = filename
         self._content = []
 
+    def _add(self, text: str) -> str:
+        """
+        Add a block of markdown to the document.
+
+        Parameters:
+            text (str): The markdown block.
+
+        Returns:
+            str: The markdown block.
+        """
+        self._content.append(text)
+        return text
+
+    def _add_table(self, headers: List[str], rows: Iterable[Iterable]) -> str:
+        """
+        Add a markdown table. Rows are rendered one at a time and joined once, so the time
+        and memory grow linearly with the table.
+
+        Parameters:
+            headers (List[str]): Column headers.
+            rows (Iterable[Iterable]): Cells of each row, in header order.
+
+        Returns:
+            str: The markdown table string.
+        """
+        lines = [
+            "| " + " | ".join(headers) + " |\n",
+            "| " + " | ".join(["---"] * len(headers)) + " |\n",
+        ]
+        lines.extend("| " + " | ".join(str(cell) for cell in row) + " |\n" for row in rows)
+        lines.append("\n")  # Ensure a newline after the table
+        table_md = "".join(lines)
+        self._content.append(table_md)
+        return table_md
+
 
     def _return_header(self, header_text: str, level: int) -> str:
         """
@@ -42,8 +79,7 @@ class MarkdownCreator:
         """
         LOG.info(f"Adding h{level} header")
         header = f"{'#' * level} {header_text}\n\n"
-        self._content.append(header)
-        return header
+        return self._add(header)
 
     def h1(self, text: str) -> str:
         """
@@ -133,8 +169,7 @@ class MarkdownCreator:
             LOG.warning("Empty list provided to add_list")
         list_md = "\n".join([f"- {item}" for item in items]) + "\n"
         list_md = list_md + "\n"  # Ensure a newline after the list
-        self._content.append(list_md)
-        return list_md
+        return self._add(list_md)
 
 
     def numbered_list(self, items: List[str]) -> str:
@@ -152,8 +187,7 @@ class MarkdownCreator:
             LOG.warning("Empty list provided to add_numbered_list")
         list_md = "\n".join([f"{i+1}. {item}" for i, item in enumerate(items)]) + "\n"
         list_md = list_md + "\n"
-        self._content.append(list_md)
-        return list_md
+        return self._add(list_md)
 
 
     def table_from_list_of_list(self, table: List[List[str]]) -> str:
@@ -170,20 +204,12 @@ class MarkdownCreator:
         if isinstance(table, list) and table and isinstance(table[0], list):
             LOG.info("Table input is a list of lists")
             headers = table[0]
-            rows = table[1:]
+            rows = itertools.islice(table, 1, None)
         else:
             LOG.warning("Invalid table input")
             raise ValueError("Table must be a list of lists or a pandas DataFrame")
 
-        header_md = "| " + " | ".join(headers) + " |\n"
-        separator_md = "| " + " | ".join(["---"] * len(headers)) + " |\n"
-        rows_md = ""
-        for row in rows:
-            rows_md += "| " + " | ".join(str(cell) for cell in row) + " |\n"
-        table_md = header_md + separator_md + rows_md
-        table_md += "\n"
-        self._content.append(table_md)
-        return table_md
+        return self._add_table(headers, rows)
 
     def table_from_list_of_dict(self, table: List[dict]) -> str:
         """
@@ -199,25 +225,11 @@ class MarkdownCreator:
         if not table:
             LOG.warning("Empty table provided to add_table_from_list_of_dict")
             return ""
-        headers = []
-        for item in table:
-            for key in item.keys():
-                headers.append(key)
-            # headers.append(item.keys())
-            LOG.debug(f"Current headers: {headers}")
-
-        md_table_header = "| " + " | ".join(headers) + " |\n"
-        # Create a separator row
-        separator_md = "| " + " | ".join(["---"] * len(headers)) + " |\n"
-        rows_md = ""
-
-        for item in table:
-            row = "| " + " | ".join(str(item.get(header, "")) for header in headers) + " |\n"
-            rows_md += row
-
-        table_md = md_table_header + separator_md + rows_md
-        table_md += "\n"  # Ensure a newline after the table
-        self._content.append(table_md)
+        # Union of the keys of all rows, in order of first appearance
+        headers = list(dict.fromkeys(key for item in table for key in item))
+        LOG.debug(f"Table headers: {headers}")
+
+        table_md = self._add_table(headers, ([item.get(header, "") for header in headers] for item in table))
         LOG.info("Table added successfully")
         return table_md
 
@@ -234,8 +246,7 @@ class MarkdownCreator:
         LOG.info("Adding paragraph")
         paragraph = f"{text}\n\n"
 
-        self._content.append(paragraph)
-        return paragraph
+        return self._add(paragraph)
 
     def code(self, code: str, language: str = "text") -> str:
         """
@@ -250,8 +261,7 @@ class MarkdownCreator:
         """
         LOG.info("Adding code block")
         code_block = f"```{language}\n{code}\n```\n\n"
-        self._content.append(code_block)
-        return code_block
+        return self._add(code_block)
 
     def md_doc(self) -> str:
         """
@@ -276,6 +286,15 @@ class MarkdownCreator:
             f.write(self.md_doc())
 
 
+def get_output_name(server_name: str) -> str:
+    """
+    Get a file system safe folder (or archive) name for a server.
+    :param server_name: Name of the server
+    :return: Name with every run of characters other than letters, digits, ".", "_" and "-" replaced by "_"
+    """
+    return re.sub(r"[^A-Za-z0-9._-]+", "_", server_name).strip("_") or "server"
+
+
 def create_report_folder(base_dir: str = "reports", folder_name=None) -> str:
     """
     Create a report folder with the name as current timestamp in the format "YYYY-MM-DD_HH-MM-SS".
@@ -0,0 +1,255 @@
+import contextlib
+import logging
+import math
+import os
+import threading
+import time
+
+LOG = logging.getLogger(os.path.splitext(os.path.basename(__file__))[0])
+
+HISTOGRAM_MIN_VALUE = 1e-5  # Smallest distinguishable latency (10 µs); smaller values share the first bucket
+HISTOGRAM_BUCKETS_PER_DOUBLING = 8  # Buckets per power of two, i.e. about 9% relative error
+
+
+class LatencyHistogram:
+    """
+    Log-bucketed latency histogram.
+
+    Bucket boundaries grow geometrically, so the relative error is the same for fast and slow
+    operations and the memory use depends only on the range of observed values. Histograms
+    with the same bucket layout can be merged by adding their bucket counts.
+    """
+
+    __slots__ = ("counts", "count", "total", "min", "max")
+
+    def __init__(self):
+        self.counts = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    @staticmethod
+    def bucket_index(value: float) -> int:
+        """Get the index of the bucket that holds the value (in seconds)."""
+        if value <= HISTOGRAM_MIN_VALUE:
+            return 0
+        return int(math.log2(value / HISTOGRAM_MIN_VALUE) * HISTOGRAM_BUCKETS_PER_DOUBLING) + 1
+
+    @staticmethod
+    def bucket_upper_bound(index: int) -> float:
+        """Get the upper bound (in seconds) of the bucket with the given index."""
+        return HISTOGRAM_MIN_VALUE * 2 ** (index / HISTOGRAM_BUCKETS_PER_DOUBLING)
+
+    def record(self, value: float):
+        """
+        Record one observation.
+        :param value: Latency in seconds
+        """
+        index = self.bucket_index(value)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def merge(self, other: "LatencyHistogram") -> "LatencyHistogram":
+        """
+        Add the observations of another histogram to this one.
+        :param other: Histogram to merge
+        :return: This histogram
+        """
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    def percentile(self, pct: float) -> float:
+        """
+        Get an approximate percentile (upper bound of the bucket holding it, capped at the maximum).
+        :param pct: Percentile between 0 and 100
+        :return: Latency in seconds (0.0 if the histogram is empty)
+        """
+        if self.count == 0:
+            return 0.0
+        rank = max(1, math.ceil(pct / 100 * self.count))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                return min(self.bucket_upper_bound(index), self.max)
+        return self.max
+
+    def mean(self) -> float:
+        """Get the mean latency in seconds."""
+        return self.total / self.count if self.count else 0.0
+
+
+class OperationMetrics:
+    """Latency histogram plus error and byte counters for one (server, method, tool) key."""
+
+    __slots__ = ("histogram", "errors", "bytes_sent", "bytes_received")
+
+    def __init__(self):
+        self.histogram = LatencyHistogram()
+        self.errors = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+
+    def merge(self, other: "OperationMetrics") -> "OperationMetrics":
+        """Add the counters of another OperationMetrics to this one."""
+        self.histogram.merge(other.histogram)
+        self.errors += other.errors
+        self.bytes_sent += other.bytes_sent
+        self.bytes_received += other.bytes_received
+        return self
+
+
+class Measurement:
+    """Handle yielded by MetricsRegistry.measure, used to attach byte counts to the measured request."""
+
+    __slots__ = ("bytes_sent", "bytes_received", "error")
+
+    def __init__(self):
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.error = False
+
+
+class MetricsRegistry:
+    """
+    Thread-safe registry of MCP request metrics keyed by (server, method, tool name).
+    """
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def record(self, server: str, method: str, seconds: float, tool: str = None, error: bool = False,
+               bytes_sent: int = 0, bytes_received: int = 0):
+        """
+        Record one MCP request.
+        :param server: Server URL
+        :param method: MCP method (e.g. "initialize", "tools/list", "tools/call")
+        :param seconds: Latency of the request
+        :param tool: Tool name for tool calls
+        :param error: Whether the request failed
+        :param bytes_sent: Payload bytes sent
+        :param bytes_received: Payload bytes received
+        """
+        key = (server, method, tool)
+        with self._lock:
+            metrics = self._metrics.get(key)
+            if metrics is None:
+                metrics = self._metrics[key] = OperationMetrics()
+            metrics.histogram.record(seconds)
+            metrics.errors += 1 if error else 0
+            metrics.bytes_sent += bytes_sent
+            metrics.bytes_received += bytes_received
+
+    @contextlib.contextmanager
+    def measure(self, server: str, method: str, tool: str = None):
+        """
+        Context manager that times the enclosed request and records it, counting it as an error
+        if the block raises an exception or sets `measurement.error`. Cancelled requests are not
+        recorded. Works in both sync and async code.
+        :param server: Server URL
+        :param method: MCP method
+        :param tool: Tool name for tool calls
+        :return: Measurement handle
+        """
+        measurement = Measurement()
+        start_time = time.perf_counter()
+        completed = False  # Set when the block finished or failed with an Exception (not on cancellation)
+        try:
+            yield measurement
+            completed = True
+        except Exception:
+            measurement.error = True
+            completed = True
+            raise
+        finally:
+            if completed:
+                self.record(server, method, time.perf_counter() - start_time, tool=tool, error=measurement.error,
+                            bytes_sent=measurement.bytes_sent, bytes_received=measurement.bytes_received)
+
+    def get(self, server: str = None, method: str = None, tool: str = None) -> OperationMetrics:
+        """
+        Get the merged metrics of all keys matching the given filters (None matches anything).
+        :return: Merged OperationMetrics
+        """
+        merged = OperationMetrics()
+        with self._lock:
+            for (key_server, key_method, key_tool), metrics in self._metrics.items():
+                if server is not None and key_server != server:
+                    continue
+                if method is not None and key_method != method:
+                    continue
+                if tool is not None and key_tool != tool:
+                    continue
+                merged.merge(metrics)
+        return merged
+
+    def summary_rows(self, group_by: tuple = ("SERVER", "METHOD", "TOOL")) -> list:
+        """
+        Get one summary row per group, merging the histograms of the keys in each group.
+        :param group_by: Any subset of ("SERVER", "METHOD", "TOOL")
+        :return: List of rows with request counts, errors, bytes and latency percentiles (ms)
+        """
+        groups = {}
+        with self._lock:
+            for (server, method, tool), metrics in self._metrics.items():
+                key_fields = {"SERVER": server, "METHOD": method, "TOOL": tool}
+                group_key = tuple(key_fields[field] for field in group_by)
+                groups.setdefault(group_key, OperationMetrics()).merge(metrics)
+
+        rows = []
+        for group_key, metrics in sorted(groups.items(), key=lambda item: tuple(str(k) for k in item[0])):
+            histogram = metrics.histogram
+            row = dict(zip(group_by, group_key))
+            row.update({
+                "REQUESTS": histogram.count,
+                "ERRORS": metrics.errors,
+                "MEAN (MS)": histogram.mean() * 1000,
+                "P50 (MS)": histogram.percentile(50) * 1000,
+                "P90 (MS)": histogram.percentile(90) * 1000,
+                "P99 (MS)": histogram.percentile(99) * 1000,
+                "MAX (MS)": histogram.max * 1000,
+                "BYTES SENT": metrics.bytes_sent,
+                "BYTES RECEIVED": metrics.bytes_received,
+            })
+            rows.append(row)
+        return rows
+
+    def reset(self):
+        """Drop all recorded metrics."""
+        with self._lock:
+            self._metrics.clear()
+
+
+METRICS = MetricsRegistry()
+
+
+def get_metrics_registry() -> MetricsRegistry:
+    """
+    Get the process-wide MCP metrics registry.
+    :return: Metrics registry
+    """
+    return METRICS
+
+
+def get_payload_size(content) -> int:
+    """
+    Estimate the payload size in bytes of MCP content blocks (text and binary data).
+    :param content: List of content blocks
+    :return: Size in bytes
+    """
+    size = 0
+    for block in content or []:
+        text = getattr(block, "text", None) or getattr(block, "data", None) or getattr(block, "blob", None)
+        if isinstance(text, str):
+            size += len(text.encode("utf-8"))
+    return size
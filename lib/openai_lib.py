@@ -1,24 +1,260 @@
+import asyncio
+import collections
+import hashlib
 import json
 import logging
 import os
+import threading
 
-from openai import OpenAI
+import httpx
+from openai import OpenAI, AsyncOpenAI, DefaultHttpxClient, DefaultAsyncHttpxClient
+from openai.types.chat import ChatCompletionMessage
+
+from lib.trace_lib import span
 
 LOG = logging.getLogger(__name__)
 
 OPEN_AI_API_KEY = os.getenv("OPENAI_API_KEY")
 
+# HTTP connection settings shared by the OpenAI clients. Connections are kept alive between
+# playground turns so that each LLM call does not pay for a new TCP/TLS handshake.
+OPEN_AI_TIMEOUT = httpx.Timeout(60.0, connect=10.0)
+OPEN_AI_MAX_RETRIES = 3
+OPEN_AI_CONNECTION_LIMITS = httpx.Limits(max_connections=20,
+                                         max_keepalive_connections=10,
+                                         keepalive_expiry=120.0)
+
+_OPEN_AI_CLIENT = None
+_ASYNC_OPEN_AI_CLIENT = None
+_CLIENT_LOCK = threading.Lock()
+
+LLM_CACHE_DIR = os.getenv("MXP_LLM_CACHE_DIR", os.path.join(".cache", "llm"))
+LLM_CACHE_MAX_BYTES = 50 * 1024 * 1024  # Size cap of the on-disk LLM response cache
+
+
+class LLMResponseCache:
+    """
+    On-disk cache of LLM tool-selection responses with a size cap and LRU eviction.
+
+    Each response is stored as a JSON file named after the hash of the request parameters.
+    The file modification time records the last use, so the least recently used responses
+    are evicted first once the total size exceeds the cap (also across app restarts).
+    """
+
+    def __init__(self, directory: str = LLM_CACHE_DIR, max_bytes: int = LLM_CACHE_MAX_BYTES):
+        """
+        Initialize the cache.
+        :param directory: Directory holding the cached responses
+        :param max_bytes: Maximum total size of the cached responses
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._index = None  # key -> size in bytes, least recently used first
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(**params) -> str:
+        """
+        Build a stable key for a request from its parameters.
+        :param params: Request parameters (model, messages, tools, temperature, ...)
+        :return: Hex digest identifying the request
+        """
+        canonical = json.dumps(params, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _load_index(self):
+        """Build the LRU index from the files on disk. Caller holds the lock."""
+        if self._index is not None:
+            return
+        self._index = collections.OrderedDict()
+        if not os.path.isdir(self.directory):
+            return
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and entry.name.endswith(".json"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, entry.name[:-len(".json")], stat.st_size))
+        for _, key, size in sorted(entries):
+            self._index[key] = size
+
+    def get(self, key: str):
+        """
+        Get a cached response.
+        :param key: Request key (see make_key)
+        :return: Cached response as a dictionary, or None on a miss
+        """
+        with self._lock:
+            self._load_index()
+            if key not in self._index:
+                self.misses += 1
+                return None
+            try:
+                with open(self._path(key), "r", encoding="utf-8") as f:
+                    value = json.load(f)
+                os.utime(self._path(key))
+            except (OSError, json.JSONDecodeError) as e:
+                LOG.warning(f"Dropping unreadable LLM cache entry {key}: {e}")
+                self._index.pop(key, None)
+                self.misses += 1
+                return None
+            self._index.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: str, value: dict):
+        """
+        Store a response, evicting the least recently used responses if the size cap is exceeded.
+        :param key: Request key (see make_key)
+        :param value: Response as a JSON-serializable dictionary
+        """
+        data = json.dumps(value, ensure_ascii=False).encode("utf-8")
+        with self._lock:
+            self._load_index()
+            os.makedirs(self.directory, exist_ok=True)
+            tmp_path = f"{self._path(key)}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, self._path(key))
+            self._index[key] = len(data)
+            self._index.move_to_end(key)
+
+            total_bytes = sum(self._index.values())
+            while total_bytes > self.max_bytes and len(self._index) > 1:
+                old_key, old_size = self._index.popitem(last=False)
+                try:
+                    os.remove(self._path(old_key))
+                except OSError:
+                    pass
+                total_bytes -= old_size
+                LOG.info(f"Evicted LLM cache entry {old_key}")
+
+    async def get_async(self, key: str):
+        """
+        Get a cached response without blocking the event loop (the file is read in a worker thread).
+        :param key: Request key (see make_key)
+        :return: Cached response as a dictionary, or None on a miss
+        """
+        return await asyncio.to_thread(self.get, key)
+
+    async def put_async(self, key: str, value: dict):
+        """
+        Store a response without blocking the event loop (the file is written in a worker thread).
+        :param key: Request key (see make_key)
+        :param value: Response as a JSON-serializable dictionary
+        """
+        await asyncio.to_thread(self.put, key, value)
+
+    def stats(self) -> dict:
+        """
+        Get cache statistics.
+        :return: Dictionary with hit/miss counts, number of entries and total size
+        """
+        with self._lock:
+            self._load_index()
+            return {"HITS": self.hits,
+                    "MISSES": self.misses,
+                    "ENTRIES": len(self._index),
+                    "BYTES": sum(self._index.values())}
+
+    def clear(self):
+        """Remove every cached response and reset the statistics."""
+        with self._lock:
+            self._load_index()
+            for key in list(self._index):
+                try:
+                    os.remove(self._path(key))
+                except OSError:
+                    pass
+            self._index.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+LLM_RESPONSE_CACHE = LLMResponseCache()
+
+
+def get_llm_response_cache() -> LLMResponseCache:
+    """
+    Get the process-wide LLM response cache.
+    :return: LLM response cache
+    """
+    return LLM_RESPONSE_CACHE
+
+
+def _get_cache_key(use_cache: bool, **params):
+    """
+    Get the cache key of a tool-selection request, or None if the request must not be cached.
+    :param use_cache: True to cache, False to bypass, None to cache only deterministic requests (temperature 0)
+    :param params: Request parameters
+    :return: Cache key or None
+    """
+    if use_cache is None:
+        use_cache = params.get("temperature") == 0
+    if not use_cache:
+        return None
+    return LLMResponseCache.make_key(**params)
+
+
+def _get_payload_size(messages: list, tools: list) -> int:
+    """Size in bytes of the JSON-encoded messages and tools sent to the LLM."""
+    return len(json.dumps({"messages": messages, "tools": tools}, default=str).encode("utf-8"))
+
+
+def _set_usage_attributes(llm_span, usage):
+    """Record the token counts of an LLM response on a trace span."""
+    if usage is not None:
+        llm_span.set_attributes(prompt_tokens=usage.prompt_tokens,
+                                completion_tokens=usage.completion_tokens,
+                                total_tokens=usage.total_tokens)
+
+
 def get_openai_client():
     """
     Get OpenAI client for making requests.
+    The client is created on first use and shared afterwards.
     :return: OpenAI client
     """
-    LOG.info("Initializing OpenAI client...")
+    global _OPEN_AI_CLIENT
     if OPEN_AI_API_KEY is None:
         raise ValueError("OPENAI_API_KEY is not set in the environment variables.")
 
-    # Initialize the OpenAI client with the API key
-    return OpenAI(api_key=OPEN_AI_API_KEY, )
+    with _CLIENT_LOCK:
+        if _OPEN_AI_CLIENT is None:
+            LOG.info("Initializing OpenAI client...")
+            # Initialize the OpenAI client with the API key
+            _OPEN_AI_CLIENT = OpenAI(api_key=OPEN_AI_API_KEY,
+                                     timeout=OPEN_AI_TIMEOUT,
+                                     max_retries=OPEN_AI_MAX_RETRIES,
+                                     http_client=DefaultHttpxClient(limits=OPEN_AI_CONNECTION_LIMITS))
+        return _OPEN_AI_CLIENT
+
+
+def get_async_openai_client():
+    """
+    Get the async OpenAI client for making requests.
+    The client is created on first use and shared afterwards. Its connection pool is bound to
+    the event loop it is first used on, so it must only be used on the background event loop
+    (see lib.async_lib).
+    :return: Async OpenAI client
+    """
+    global _ASYNC_OPEN_AI_CLIENT
+    if OPEN_AI_API_KEY is None:
+        raise ValueError("OPENAI_API_KEY is not set in the environment variables.")
+
+    with _CLIENT_LOCK:
+        if _ASYNC_OPEN_AI_CLIENT is None:
+            LOG.info("Initializing async OpenAI client...")
+            _ASYNC_OPEN_AI_CLIENT = AsyncOpenAI(api_key=OPEN_AI_API_KEY,
+                                                timeout=OPEN_AI_TIMEOUT,
+                                                max_retries=OPEN_AI_MAX_RETRIES,
+                                                http_client=DefaultAsyncHttpxClient(limits=OPEN_AI_CONNECTION_LIMITS))
+        return _ASYNC_OPEN_AI_CLIENT
+
 
 def get_openai_response(prompt: str) -> str:
     """
@@ -45,13 +281,37 @@ def get_openai_response(prompt: str) -> str:
     return ret_val
 
 
+async def get_openai_response_async(prompt: str) -> str:
+    """
+    Get OpenAI response for a given prompt, using the shared async client.
+    :param prompt:
+    :return: OpenAI response
+    """
+    LOG.info(f"Getting OpenAI response for prompt: {prompt}")
+
+    client = get_async_openai_client()
+    response = await client.chat.completions.create(
+        model="gpt-4.1-mini",
+        messages=[
+            {"role": "user", "content": prompt}
+        ],
+        temperature=0.7,
+        max_tokens=100,
+    )
+
+    ret_val = response.choices[0].message.content.strip()
+    LOG.info(f"OpenAI response: {ret_val}")
+    return ret_val
+
+
 def get_llm_tool_selection_response(model: str,
                                     max_tokens: int,
                                     temperature: float,
                                     top_p: float,
                                     messages: list,
                                     tools: dict,
-                                    tool_choice: str = "auto"):
+                                    tool_choice: str = "auto",
+                                    use_cache: bool = None):
     """
     Get LLM response for a given question.
     :param model:
@@ -61,10 +321,19 @@ def get_llm_tool_selection_response(model: str,
     :param max_tokens:
     :param temperature:
     :param top_p:
+    :param use_cache: True/False to force/bypass the response cache, None to cache only when temperature is 0
     :return: LLM response
     """
     LOG.info(f"Getting LLM response for messages: {messages}")
 
+    cache_key = _get_cache_key(use_cache, model=model, messages=messages, tools=tools, temperature=temperature,
+                               top_p=top_p, max_tokens=max_tokens, tool_choice=tool_choice)
+    if cache_key:
+        cached_message = LLM_RESPONSE_CACHE.get(cache_key)
+        if cached_message is not None:
+            LOG.info(f"Using cached LLM response {cache_key}")
+            return ChatCompletionMessage.model_validate(cached_message)
+
     if OPEN_AI_API_KEY is None:
         raise ValueError("OPENAI_API_KEY is not set in the environment variables.")
 
@@ -79,9 +348,109 @@ def get_llm_tool_selection_response(model: str,
         )
 
     message = response.choices[0].message
+    if cache_key:
+        LLM_RESPONSE_CACHE.put(cache_key, message.model_dump(mode="json"))
 
     return message
 
+
+async def get_llm_tool_selection_response_async(model: str,
+                                                max_tokens: int,
+                                                temperature: float,
+                                                top_p: float,
+                                                messages: list,
+                                                tools: dict,
+                                                tool_choice: str = "auto",
+                                                use_cache: bool = None):
+    """
+    Get LLM response for a given question, using the shared async client.
+    :param model:
+    :param messages:
+    :param tool_choice:
+    :param tools:
+    :param max_tokens:
+    :param temperature:
+    :param top_p:
+    :param use_cache: True/False to force/bypass the response cache, None to cache only when temperature is 0
+    :return: LLM response
+    """
+    LOG.info(f"Getting LLM response for messages: {messages}")
+
+    with span("llm_tool_selection", model=model, tool_count=len(tools or []),
+              request_bytes=_get_payload_size(messages, tools)) as llm_span:
+        cache_key = _get_cache_key(use_cache, model=model, messages=messages, tools=tools, temperature=temperature,
+                                   top_p=top_p, max_tokens=max_tokens, tool_choice=tool_choice)
+        if cache_key:
+            cached_message = await LLM_RESPONSE_CACHE.get_async(cache_key)
+            llm_span.set_attribute("cache_hit", cached_message is not None)
+            if cached_message is not None:
+                LOG.info(f"Using cached LLM response {cache_key}")
+                return ChatCompletionMessage.model_validate(cached_message)
+
+        client = get_async_openai_client()
+        response = await client.chat.completions.create(model=model,
+                messages=messages,
+                tools=tools,
+                tool_choice=tool_choice,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                top_p=top_p,
+            )
+        _set_usage_attributes(llm_span, response.usage)
+
+        message = response.choices[0].message
+        if cache_key:
+            await LLM_RESPONSE_CACHE.put_async(cache_key, message.model_dump(mode="json"))
+
+        return message
+
+
+async def stream_llm_tool_selection_response_async(model: str,
+                                                   max_tokens: int,
+                                                   temperature: float,
+                                                   top_p: float,
+                                                   messages: list,
+                                                   tools: dict,
+                                                   tool_choice: str = "auto"):
+    """
+    Stream the LLM response for a given question, using the shared async client.
+    Only the content of the response is streamed; tool call deltas are ignored, so this is meant
+    for the final answer (tool_choice="none").
+    :param model:
+    :param messages:
+    :param tool_choice:
+    :param tools:
+    :param max_tokens:
+    :param temperature:
+    :param top_p:
+    :return: Async generator of content deltas (str)
+    """
+    LOG.info(f"Streaming LLM response for messages: {messages}")
+
+    with span("llm_stream", model=model, request_bytes=_get_payload_size(messages, tools)) as llm_span:
+        client = get_async_openai_client()
+        stream = await client.chat.completions.create(model=model,
+                messages=messages,
+                tools=tools,
+                tool_choice=tool_choice,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                top_p=top_p,
+                stream=True,
+                stream_options={"include_usage": True},
+            )
+
+        try:
+            async for chunk in stream:
+                if chunk.usage is not None:
+                    _set_usage_attributes(llm_span, chunk.usage)
+                if chunk.choices and chunk.choices[0].delta.content:
+                    if "ttft_ms" not in llm_span.attributes:
+                        llm_span.set_attribute("ttft_ms", round(llm_span.duration * 1000, 1))
+                    yield chunk.choices[0].delta.content
+        finally:
+            await stream.close()
+
 # def get_tool_intent_check(tool_name: str, tool_description: str) -> str:
 #     """
 #     Check if the tool name and description are aligned with the intent.
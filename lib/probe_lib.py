@@ -0,0 +1,154 @@
+import asyncio
+import contextlib
+import logging
+import os
+import socket
+import ssl
+import statistics
+import time
+import urllib.parse
+
+from lib.common_lib import create_client
+from lib.metrics_lib import METRICS
+
+LOG = logging.getLogger(os.path.splitext(os.path.basename(__file__))[0])
+
+PROBE_SAMPLES = 3  # Default number of samples taken by probe_server
+PROBE_TIMEOUT = 10.0  # Seconds one sample (all phases) may take before it is abandoned
+
+DNS = "DNS"
+TCP_CONNECT = "TCP CONNECT"
+TLS_HANDSHAKE = "TLS HANDSHAKE"
+FIRST_BYTE = "FIRST BYTE"
+MCP_INITIALIZE = "MCP INITIALIZE"
+MCP_PING = "MCP PING"
+PHASES = [DNS, TCP_CONNECT, TLS_HANDSHAKE, FIRST_BYTE, MCP_INITIALIZE, MCP_PING]
+
+
+async def _probe_http(url: str, sample: dict):
+    """
+    Time the network phases of a request to the server URL over a raw connection: name
+    resolution, TCP connect, TLS handshake (https only) and the first byte of the response.
+    :param url: URL of the MCP server
+    :param sample: Dictionary the phase timings (in seconds) are written to
+    """
+    parsed = urllib.parse.urlsplit(url)
+    secure = parsed.scheme == "https"
+    host = parsed.hostname
+    port = parsed.port or (443 if secure else 80)
+    path = (parsed.path or "/") + (f"?{parsed.query}" if parsed.query else "")
+    loop = asyncio.get_running_loop()
+
+    start_time = time.perf_counter()
+    address_infos = await loop.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    sample[DNS] = time.perf_counter() - start_time
+    address = address_infos[0][4]
+
+    start_time = time.perf_counter()
+    reader, writer = await asyncio.open_connection(address[0], address[1])
+    sample[TCP_CONNECT] = time.perf_counter() - start_time
+
+    try:
+        if secure:
+            start_time = time.perf_counter()
+            await writer.start_tls(ssl.create_default_context(), server_hostname=host)
+            sample[TLS_HANDSHAKE] = time.perf_counter() - start_time
+
+        request = (f"GET {path} HTTP/1.1\r\n"
+                   f"Host: {parsed.netloc}\r\n"
+                   f"Accept: text/event-stream\r\n"
+                   f"Connection: close\r\n\r\n")
+        start_time = time.perf_counter()
+        writer.write(request.encode("ascii"))
+        await writer.drain()
+        if not await reader.read(1):
+            raise ConnectionError("Connection closed by the server before the first byte")
+        sample[FIRST_BYTE] = time.perf_counter() - start_time
+    finally:
+        writer.close()
+        with contextlib.suppress(Exception):
+            await writer.wait_closed()
+
+
+async def _probe_mcp(transport_type: str, url: str, sample: dict):
+    """
+    Time the MCP `initialize` handshake and one `ping` round trip on a fresh (unpooled) client.
+    :param transport_type: Transport type of the MCP server
+    :param url: URL of the MCP server
+    :param sample: Dictionary the phase timings (in seconds) are written to
+    """
+    client = create_client(transport_type, url)
+    try:
+        start_time = time.perf_counter()
+        with METRICS.measure(url, "initialize"):
+            await client.__aenter__()
+        sample[MCP_INITIALIZE] = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        with METRICS.measure(url, "ping"):
+            await client.ping()
+        sample[MCP_PING] = time.perf_counter() - start_time
+    finally:
+        with contextlib.suppress(Exception):
+            await client.close()
+
+
+async def probe_once(transport_type: str, url: str, timeout: float = PROBE_TIMEOUT, sample: dict = None) -> dict:
+    """
+    Take one sample of the connection phases of an MCP server.
+    :param transport_type: Transport type of the MCP server
+    :param url: URL of the MCP server
+    :param timeout: Seconds the sample may take
+    :param sample: Dictionary to write the timings to (keeps the phases completed before a failure)
+    :return: Dictionary of phase name to seconds (phases that were not reached are missing)
+    """
+    sample = {} if sample is None else sample
+    async with asyncio.timeout(timeout):
+        await _probe_http(url, sample)
+        await _probe_mcp(transport_type, url, sample)
+    return sample
+
+
+def summarize_samples(samples: list) -> list:
+    """
+    Summarize the phase timings of several samples.
+    :param samples: List of samples as returned by probe_once
+    :return: One row per phase with the sample count and min/median/max in ms (None if never measured)
+    """
+    rows = []
+    for phase in PHASES:
+        values = [sample[phase] * 1000 for sample in samples if phase in sample]
+        rows.append({
+            "PHASE": phase,
+            "SAMPLES": len(values),
+            "MIN (MS)": min(values) if values else None,
+            "MEDIAN (MS)": statistics.median(values) if values else None,
+            "MAX (MS)": max(values) if values else None,
+        })
+    return rows
+
+
+async def probe_server(transport_type: str, url: str, samples: int = PROBE_SAMPLES,
+                       timeout: float = PROBE_TIMEOUT) -> (list, list):
+    """
+    Measure the connection phases of an MCP server (DNS, TCP connect, TLS, first byte, MCP
+    initialize and ping) over several sequential samples.
+    :param transport_type: Transport type of the MCP server
+    :param url: URL of the MCP server
+    :param samples: Number of samples
+    :param timeout: Seconds each sample may take
+    :return: Tuple of (summary rows, list of error messages of failed samples)
+    """
+    results = []
+    errors = []
+    for index in range(samples):
+        sample = {}
+        try:
+            await probe_once(transport_type, url, timeout, sample)
+        except TimeoutError:
+            errors.append(f"Sample {index + 1}: no response within {timeout:g} seconds")
+        except Exception as e:
+            errors.append(f"Sample {index + 1}: {type(e).__name__}: {e}")
+        results.append(sample)
+        LOG.info(f"Probe sample {index + 1} of {url}: {sample}")
+    return summarize_samples(results), errors
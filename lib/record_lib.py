@@ -0,0 +1,136 @@
+import logging
+import os
+
+LOG = logging.getLogger(os.path.splitext(os.path.basename(__file__))[0])
+
+ANNOTATION_HINTS = (
+    ("READ ONLY HINT", "readOnlyHint"),
+    ("DESTRUCTIVE HINT", "destructiveHint"),
+    ("IDEMPOTENT HINT", "idempotentHint"),
+    ("OPEN WORLD HINT", "openWorldHint"),
+)
+
+
+def _get_param_rows(schema: dict, with_required: bool) -> list:
+    """
+    Flatten the properties of a JSON schema into one row per parameter.
+    :param schema: JSON schema with a "properties" section
+    :param with_required: If True, add REQUIRED/DESCRIPTION columns as done for input schemas
+    :return: List of parameter rows
+    """
+    rows = []
+    required_params = schema.get("required", []) if with_required else []
+    for key, value in schema.get("properties", {}).items():
+        row = {"PARAMETER": key, "TITLE": value.get("title", "")}
+        if with_required:
+            row["REQUIRED"] = key in required_params
+
+        for k, v in value.items():
+            if k != "title":
+                row[k.upper()] = v
+
+        if with_required and "DESCRIPTION" not in row:
+            row["DESCRIPTION"] = None
+
+        rows.append(row)
+    return rows
+
+
+def _get_annotation_row(annotations: dict) -> dict:
+    """
+    Build the annotation row shown in the documentation (✅ for hints set to True).
+    :param annotations: Tool annotations as a dictionary (may be empty)
+    :return: Annotation row
+    """
+    if not annotations:
+        return {"TITLE": "", **{label: "" for label, _ in ANNOTATION_HINTS}}
+
+    row = {"TITLE": annotations.get("title", "")}
+    for label, key in ANNOTATION_HINTS:
+        value = annotations.get(key)
+        row[label] = "✅" if value is True else value
+    return row
+
+
+class ToolRecord:
+    """
+    Normalized, compact view of an MCP tool.
+
+    It is built once per tool, straight from the tool object returned by the server, and
+    holds the input parameters, output parameters and annotations already extracted so that
+    the inspect page, the playground and the documentation generator do not re-parse them.
+    """
+
+    __slots__ = ("name", "title", "description", "input_schema", "output_schema", "annotations",
+                 "input_params", "output_params", "annotation_row")
+
+    def __init__(self,
+                 name: str,
+                 title: str = None,
+                 description: str = None,
+                 input_schema: dict = None,
+                 output_schema: dict = None,
+                 annotations: dict = None):
+        """
+        Initialize the ToolRecord.
+        :param name: Tool name
+        :param title: Tool title
+        :param description: Tool description
+        :param input_schema: JSON schema of the tool input
+        :param output_schema: JSON schema of the tool output (optional)
+        :param annotations: Tool annotations as a dictionary (optional)
+        """
+        self.name = name
+        self.title = title
+        self.description = description
+        self.input_schema = input_schema or {}
+        self.output_schema = output_schema or {}
+        self.annotations = annotations or {}
+        self.input_params = _get_param_rows(self.input_schema, with_required=True)
+        self.output_params = _get_param_rows(self.output_schema, with_required=False)
+        self.annotation_row = _get_annotation_row(self.annotations)
+
+    @classmethod
+    def from_tool(cls, tool) -> "ToolRecord":
+        """
+        Build a ToolRecord from a tool object (mcp.types.Tool) returned by the MCP server.
+        :param tool: Tool object
+        :return: ToolRecord
+        """
+        return cls(name=tool.name,
+                   title=tool.title,
+                   description=tool.description,
+                   input_schema=tool.inputSchema,
+                   output_schema=tool.outputSchema,
+                   annotations=tool.annotations.model_dump() if tool.annotations else None)
+
+    def is_read_only(self) -> bool:
+        """Whether the tool declares that it does not modify its environment."""
+        return self.annotations.get("readOnlyHint") is True
+
+    def is_idempotent(self) -> bool:
+        """Whether the tool declares that repeated calls with the same arguments have no additional effect."""
+        return self.annotations.get("idempotentHint") is True
+
+    def is_destructive(self) -> bool:
+        """Whether the tool may perform destructive updates (MCP default when not read-only)."""
+        if self.is_read_only():
+            return False
+        return self.annotations.get("destructiveHint") is not False
+
+    def to_dict(self) -> dict:
+        """
+        Get the source data of the record as a plain dictionary.
+        :return: Dictionary with the tool name, title, description, schemas and annotations
+        """
+        return {
+            "name": self.name,
+            "title": self.title,
+            "description": self.description,
+            "inputSchema": self.input_schema,
+            "outputSchema": self.output_schema,
+            "annotations": self.annotations,
+        }
+
+    def __repr__(self):
+        return f"ToolRecord(name={self.name!r})"
@@ -1,63 +1,271 @@
+import contextlib
 import json
+import logging
 import os
+import sqlite3
+import tempfile
+import threading
+import time
 
+LOG = logging.getLogger(os.path.splitext(os.path.basename(__file__))[0])
 
-def get_servers():
-    """ Get the list of saved MCP servers"""
-    # load json from servers/servers.json
+SERVERS_FILE = os.path.join("servers", "servers.json")  # JSON registry, imported on first use and mirrored after every change
+SERVERS_DB = os.environ.get("MXP_SERVERS_DB", os.path.join("servers", "servers.db"))  # SQLite registry
+SERVERS_DB_TIMEOUT = 10.0  # Seconds a connection waits for another writer to release the database
+TRANSPORT_TYPES = ("SSE", "Streamable-HTTP")
 
-    servers_file = os.path.join("servers", "servers.json")
-    if not os.path.exists(servers_file):
-        return []
-    with open(servers_file, "r") as f:
-        servers = json.load(f)
-    return servers["servers"]
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS servers (
+    name TEXT PRIMARY KEY,
+    transport_type TEXT NOT NULL,
+    url TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_servers_transport_type ON servers (transport_type);
+CREATE TABLE IF NOT EXISTS registry_meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO registry_meta (key, value) VALUES ('version', 0);
+"""
 
 
-def save_server_in_file(server_name: str, transport_type: str, url: str):
-    """Saves or updates a server in servers/servers.json."""
-    servers_file = os.path.join("servers", "servers.json")
-    # Ensure valid transport type
-    if transport_type not in ["SSE", "Streamable-HTTP"]:
-        raise ValueError("Transport type must be either 'SSE' or 'Streamable-HTTP'.")
+def _to_row(transport_type: str, url: str) -> dict:
+    return {"TRANSPORT_TYPE": transport_type, "URL": url}
 
-    # Initialize file if it doesn't exist
-    if not os.path.exists(servers_file):
-        data = {"servers": {}}
-    else:
-        with open(servers_file, "r") as f:
-            try:
-                data = json.load(f)
-            except json.JSONDecodeError:
-                data = {"servers": {}}
 
-    servers = data.get("servers", {})
-    # Update or add the server
-    servers[server_name] = {
-        "TRANSPORT_TYPE": transport_type,
-        "URL": url
-    }
-    data["servers"] = servers
+class ServerRegistry:
+    """
+    Registry of saved MCP servers in a SQLite database.
 
-    with open(servers_file, "w") as f:
-        json.dump(data, f, indent=4)
+    Every write runs in a transaction that also increments a version counter stored in the
+    database. Reads of the whole registry are cached in the process and served again as long
+    as the counter is unchanged, so a rerun costs a single indexed query even when the
+    registry holds hundreds of servers, and writes from other processes are still seen.
+    """
 
+    def __init__(self, db_path: str = SERVERS_DB, json_path: str = SERVERS_FILE):
+        """
+        Initialize the registry, creating the database if needed.
+        A new database is filled from the JSON registry when that file exists, and the JSON registry
+        is rewritten after every save or delete so it keeps mirroring the database.
+        :param db_path: Path of the SQLite database
+        :param json_path: Path of the JSON registry (None to neither import nor mirror one)
+        """
+        self.db_path = db_path
+        self.json_path = json_path
+        self._lock = threading.Lock()
+        self._cache_version = None
+        self._cache = {}
 
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        if not os.path.exists(db_path):
+            self._create_database(json_path)
+        with contextlib.closing(self._connect()) as connection:
+            # WAL lets readers in other app workers run while one of them writes
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(_SCHEMA)
 
+    def _create_database(self, json_path: str):
+        """
+        Create the database under a temporary name, fill it from the JSON registry and move it into
+        place, so a failed migration never leaves an empty database behind to shadow the JSON registry.
+        :param json_path: Path of the JSON registry imported into the new database
+        """
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(self.db_path) or ".", prefix=".servers-", suffix=".db")
+        os.close(fd)
+        final_path = self.db_path
+        self.db_path = temp_path
+        try:
+            with contextlib.closing(self._connect()) as connection:
+                connection.executescript(_SCHEMA)
+            if json_path and os.path.exists(json_path):
+                count = self.import_json(json_path)
+                LOG.info(f"Imported {count} server(s) from {json_path} into {final_path}")
+            os.replace(temp_path, final_path)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.remove(temp_path)
+            raise
+        finally:
+            self.db_path = final_path
 
-def delete_server(server_name: str):
-    """Deletes the server with the given name from the servers/servers.json file."""
-    servers_file = os.path.join("servers", "servers.json")
-    if not os.path.exists(servers_file):
-        return
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=SERVERS_DB_TIMEOUT)
+
+    @contextlib.contextmanager
+    def _transaction(self):
+        """Open a write transaction that bumps the version counter when it commits."""
+        with contextlib.closing(self._connect()) as connection:
+            with connection:
+                connection.execute("BEGIN IMMEDIATE")
+                yield connection
+                connection.execute("UPDATE registry_meta SET value = value + 1 WHERE key = 'version'")
+
+    @staticmethod
+    def _read_version(connection: sqlite3.Connection) -> int:
+        return connection.execute("SELECT value FROM registry_meta WHERE key = 'version'").fetchone()[0]
+
+    def get_version(self) -> int:
+        """
+        Get the version counter of the registry.
+        :return: Number of write transactions committed to the database so far
+        """
+        with contextlib.closing(self._connect()) as connection:
+            return self._read_version(connection)
+
+    def get_servers(self) -> dict:
+        """
+        Get all saved servers.
+        :return: Dictionary of server name to {"TRANSPORT_TYPE", "URL"}, ordered by name
+        """
+        with contextlib.closing(self._connect()) as connection:
+            version = self._read_version(connection)
+            with self._lock:
+                if version != self._cache_version:
+                    rows = connection.execute("SELECT name, transport_type, url FROM servers ORDER BY name")
+                    self._cache = {name: _to_row(transport_type, url) for name, transport_type, url in rows}
+                    self._cache_version = version
+                    LOG.info(f"Loaded {len(self._cache)} server(s) from the registry (version {version})")
+                cache = self._cache
+        # Copies, so callers cannot change the cached rows
+        return {name: dict(row) for name, row in cache.items()}
+
+    def get_server(self, name: str) -> dict | None:
+        """
+        Get one saved server.
+        :param name: Name of the server
+        :return: {"TRANSPORT_TYPE", "URL"}, or None if there is no such server
+        """
+        with contextlib.closing(self._connect()) as connection:
+            row = connection.execute("SELECT transport_type, url FROM servers WHERE name = ?", (name,)).fetchone()
+        return _to_row(*row) if row else None
+
+    def save_server(self, name: str, transport_type: str, url: str):
+        """
+        Add a server or update the one with the same name.
+        :param name: Name of the server
+        :param transport_type: One of TRANSPORT_TYPES
+        :param url: URL of the server
+        """
+        if transport_type not in TRANSPORT_TYPES:
+            raise ValueError("Transport type must be either 'SSE' or 'Streamable-HTTP'.")
+        with self._transaction() as connection:
+            connection.execute("INSERT INTO servers (name, transport_type, url, updated_at) VALUES (?, ?, ?, ?) "
+                               "ON CONFLICT (name) DO UPDATE SET transport_type = excluded.transport_type, "
+                               "url = excluded.url, updated_at = excluded.updated_at",
+                               (name, transport_type, url, time.time()))
+        LOG.info(f"Saved server [{name}]")
+        self._mirror_json()
+
+    def delete_server(self, name: str) -> bool:
+        """
+        Delete a server.
+        :param name: Name of the server
+        :return: True if the server existed
+        """
+        with self._transaction() as connection:
+            deleted = connection.execute("DELETE FROM servers WHERE name = ?", (name,)).rowcount > 0
+        LOG.info(f"Deleted server [{name}]" if deleted else f"No server [{name}] to delete")
+        if deleted:
+            self._mirror_json()
+        return deleted
+
+    def _mirror_json(self):
+        """Rewrite the JSON registry from the database; the database stays the source of truth if that fails."""
+        if not self.json_path:
+            return
+        try:
+            self.export_json(self.json_path)
+        except OSError as e:
+            LOG.warning(f"Could not update {self.json_path} from the registry: {e}")
+
+    def import_json(self, json_path: str = SERVERS_FILE, replace: bool = False) -> int:
+        """
+        Import servers from a file in the JSON registry format ({"servers": {name: {"TRANSPORT_TYPE", "URL"}}}).
+        All valid servers are imported in one transaction; entries without a known transport type
+        or a URL are skipped with a warning.
+        :param json_path: Path of the JSON file
+        :param replace: Delete the servers that are not in the file
+        :return: Number of servers imported
+        """
+        with open(json_path, "r", encoding="utf-8") as f:
+            servers = {}
+            for name, server in json.load(f).get("servers", {}).items():
+                if not isinstance(server, dict) or server.get("TRANSPORT_TYPE") not in TRANSPORT_TYPES \
+                        or not server.get("URL"):
+                    LOG.warning(f"Skipping invalid server [{name}] in {json_path}: {server}")
+                    continue
+                servers[name] = server
+
+        now = time.time()
+        with self._transaction() as connection:
+            if replace:
+                connection.execute("DELETE FROM servers")
+            connection.executemany("INSERT INTO servers (name, transport_type, url, updated_at) VALUES (?, ?, ?, ?) "
+                                   "ON CONFLICT (name) DO UPDATE SET transport_type = excluded.transport_type, "
+                                   "url = excluded.url, updated_at = excluded.updated_at",
+                                   [(name, server["TRANSPORT_TYPE"], server["URL"], now)
+                                    for name, server in servers.items()])
+        return len(servers)
 
-    with open(servers_file, "r") as f:
-        data = json.load(f)
+    def export_json(self, json_path: str = SERVERS_FILE) -> int:
+        """
+        Export all servers to a file in the JSON registry format.
+        The file is written to a temporary file first and then renamed, so readers never see a partial file.
+        :param json_path: Path of the JSON file
+        :return: Number of servers exported
+        """
+        servers = self.get_servers()
+        directory = os.path.dirname(json_path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".servers-", suffix=".json")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"servers": servers}, f, indent=4)
+            os.replace(temp_path, json_path)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.remove(temp_path)
+            raise
+        return len(servers)
+
+
+_REGISTRY = None
+_REGISTRY_LOCK = threading.Lock()
+
+
+def get_server_registry() -> ServerRegistry:
+    """
+    Get the process-wide server registry (created on first use, relative to the working directory).
+    :return: Server registry
+    """
+    global _REGISTRY
+    with _REGISTRY_LOCK:
+        if _REGISTRY is None:
+            _REGISTRY = ServerRegistry()
+        return _REGISTRY
+
+
+def get_servers():
+    """ Get the list of saved MCP servers"""
+    return get_server_registry().get_servers()
+
+
+def save_server_in_file(server_name: str, transport_type: str, url: str):
+    """Saves or updates a server in the server registry."""
+    get_server_registry().save_server(server_name, transport_type, url)
+
+
+def delete_server(server_name: str):
+    """Deletes the server with the given name from the server registry."""
+    get_server_registry().delete_server(server_name)
 
-    servers = data.get("servers", {})
-    if server_name in servers:
-        del servers[server_name]
-        data["servers"] = servers
-        with open(servers_file, "w") as f:
-            json.dump(data, f, indent=4)
 
+def import_servers_from_file(json_path: str = SERVERS_FILE) -> int:
+    """
+    Replace the saved servers with the ones in the JSON registry (e.g. after editing servers.json by hand).
+    :param json_path: Path of the JSON file
+    :return: Number of servers imported
+    """
+    return get_server_registry().import_json(json_path, replace=True)
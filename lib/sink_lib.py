@@ -0,0 +1,176 @@
+import io
+import logging
+import os
+import shutil
+import threading
+import time
+import zipfile
+
+LOG = logging.getLogger(os.path.splitext(os.path.basename(__file__))[0])
+
+ZIP_COMPRESSION = zipfile.ZIP_DEFLATED  # Compression method of the ZIP sinks
+ZIP_COMPRESS_LEVEL = 6  # zlib level: a good size/speed trade-off for Markdown
+
+
+class DocumentSink:
+    """
+    Destination of generated documentation files.
+
+    Paths are relative to the root of the documentation (the folder holding mkdocs.yml) and
+    use forward slashes. Sinks are safe to use from several threads at once.
+    """
+
+    location = None  # Human-readable description of where the files go
+
+    def write_text(self, relative_path: str, text: str):
+        """
+        Write a text file.
+        :param relative_path: Path of the file relative to the documentation root
+        :param text: Contents of the file
+        """
+        self.write_bytes(relative_path, text.encode("utf-8"))
+
+    def write_bytes(self, relative_path: str, data: bytes):
+        """
+        Write a binary file.
+        :param relative_path: Path of the file relative to the documentation root
+        :param data: Contents of the file
+        """
+        raise NotImplementedError
+
+    def copy_tree(self, source_dir: str, relative_dir: str):
+        """
+        Copy a local folder (e.g. the assets) into the documentation.
+        :param source_dir: Local folder to copy
+        :param relative_dir: Destination folder relative to the documentation root
+        """
+        for dir_path, dir_names, file_names in os.walk(source_dir):
+            dir_names.sort()
+            relative_root = os.path.relpath(dir_path, source_dir)
+            for file_name in sorted(file_names):
+                relative_path = file_name if relative_root == "." else os.path.join(relative_root, file_name)
+                with open(os.path.join(dir_path, file_name), "rb") as f:
+                    self.write_bytes(f"{relative_dir}/{relative_path.replace(os.sep, '/')}", f.read())
+
+    def close(self):
+        """Finish writing. Must be called once all files are written."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class DirectorySink(DocumentSink):
+    """Writes the documentation files to a folder on disk."""
+
+    def __init__(self, root: str):
+        """
+        :param root: Folder that becomes the documentation root (created if missing)
+        """
+        self.root = root
+        self.location = root
+        os.makedirs(root, exist_ok=True)
+
+    def _path(self, relative_path: str) -> str:
+        return os.path.join(self.root, *relative_path.split("/"))
+
+    def write_text(self, relative_path: str, text: str):
+        path = self._path(relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+
+    def write_bytes(self, relative_path: str, data: bytes):
+        path = self._path(relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(data)
+
+    def copy_tree(self, source_dir: str, relative_dir: str):
+        shutil.copytree(source_dir, self._path(relative_dir), dirs_exist_ok=True)
+
+    def exists(self, relative_path: str) -> bool:
+        """
+        Check whether a file or folder exists in the documentation.
+        :param relative_path: Path relative to the documentation root
+        :return: True if it exists
+        """
+        return os.path.exists(self._path(relative_path))
+
+    def read_text(self, relative_path: str) -> str | None:
+        """
+        Read a text file of the documentation.
+        :param relative_path: Path of the file relative to the documentation root
+        :return: Contents of the file, or None if it does not exist
+        """
+        try:
+            with open(self._path(relative_path), "r", encoding="utf-8") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def delete(self, relative_path: str):
+        """
+        Delete a file of the documentation (nothing happens if it does not exist).
+        :param relative_path: Path of the file relative to the documentation root
+        """
+        path = self._path(relative_path)
+        if os.path.exists(path):
+            os.remove(path)
+            LOG.info(f"Deleted {path}")
+
+
+class StreamingZipSink(DocumentSink):
+    """
+    Writes the documentation files as a ZIP archive to a writable binary stream.
+
+    Each file is compressed and written to the stream as soon as it is produced, so the stream
+    does not need to be seekable (e.g. a pipe, socket or HTTP response body) and no file is held
+    in memory longer than it takes to compress it.
+    """
+
+    def __init__(self, stream, prefix: str = ""):
+        """
+        :param stream: Writable binary stream
+        :param prefix: Folder inside the archive that holds the documentation root ("" for the top level)
+        """
+        self.location = getattr(stream, "name", "<stream>")
+        self.prefix = f"{prefix.strip('/')}/" if prefix else ""
+        self._zip_file = zipfile.ZipFile(stream, mode="w", compression=ZIP_COMPRESSION,
+                                         compresslevel=ZIP_COMPRESS_LEVEL)
+        self._lock = threading.Lock()
+        self._date_time = time.localtime()[:6]
+
+    def write_bytes(self, relative_path: str, data: bytes):
+        zip_info = zipfile.ZipInfo(f"{self.prefix}{relative_path}", date_time=self._date_time)
+        zip_info.compress_type = ZIP_COMPRESSION
+        zip_info.external_attr = 0o644 << 16
+        # ZipFile does not support concurrent writers; entries are written one at a time
+        with self._lock:
+            self._zip_file.writestr(zip_info, data, compresslevel=ZIP_COMPRESS_LEVEL)
+
+    def close(self):
+        with self._lock:
+            self._zip_file.close()
+
+
+class ZipSink(StreamingZipSink):
+    """Builds the documentation as a ZIP archive in memory (e.g. for a download button)."""
+
+    def __init__(self, prefix: str = ""):
+        """
+        :param prefix: Folder inside the archive that holds the documentation root ("" for the top level)
+        """
+        self._buffer = io.BytesIO()
+        super().__init__(self._buffer, prefix)
+        self.location = "<in-memory zip>"
+
+    def getvalue(self) -> bytes:
+        """
+        Get the archive. Closes the sink if it is still open.
+        :return: ZIP archive bytes
+        """
+        self.close()
+        return self._buffer.getvalue()
@@ -1,15 +1,22 @@
 import base64
+import contextlib
 import json
 import logging
 import os
+import time
 from pathlib import Path
 
+import pandas as pd
 import streamlit as st
 
 from lib.common_icons import WARNING_ICON, ERROR_ICON, INFO_ICON, SUCCESS_ICON
+from lib.metrics_lib import MetricsRegistry
 
 LOG = logging.getLogger(__name__)
 
+PROFILE_RERUNS = os.environ.get("MXP_PROFILE_RERUNS", "") not in ("", "0")  # Show the rerun profile in the sidebar
+RERUN_METRICS = MetricsRegistry()  # Time spent in each per-rerun step, across all sessions of this process
+
 
 def set_current_page(page_name: str):
     """ Detects when page switch happens and runs the page switch code"""
@@ -38,14 +45,18 @@ def configure_sidebar():
 
 
 
-def add_app_logo(image_file: str):
-    """Adds logo from the image file to the app """
-    LOG.info('inside add_app_logo')
-    image_path = os.path.abspath(image_file)
-
+@st.cache_data(show_spinner=False)
+def get_logo_style(image_path: str) -> str:
+    """
+    Build the sidebar style that shows the logo, with the image inlined as base64.
+    Cached per image path, so the file is read and encoded once per process; call clear_ui_caches
+    after replacing the image.
+    :param image_path: Path of the PNG image
+    :return: HTML style element
+    """
+    LOG.info(f'Encoding app logo: {image_path}')
     logo = f"url(data:image/png;base64,{base64.b64encode(Path(image_path).read_bytes()).decode()})"
-    st.markdown(
-        f"""
+    return f"""
             <style>
                 [data-testid="stSidebarContent"] {{
                     background-image: {logo};
@@ -54,9 +65,85 @@ def add_app_logo(image_file: str):
                     background-position: 20px 20px;
                 }}
             </style>
-            """,
-        unsafe_allow_html=True,
-    )
+            """
+
+
+def add_app_logo(image_file: str):
+    """Adds logo from the image file to the app """
+    LOG.info('inside add_app_logo')
+    st.markdown(get_logo_style(image_file), unsafe_allow_html=True)
+
+
+@st.cache_data(show_spinner=False)
+def get_servers_dataframe(servers: dict) -> pd.DataFrame:
+    """
+    Get the saved servers as a DataFrame (one row per server name, TRANSPORT_TYPE and URL columns).
+    Cached per content of the servers; clear_ui_caches drops it when the saved servers change.
+    :param servers: Saved servers as returned by get_servers
+    :return: DataFrame of the saved servers
+    """
+    LOG.info(f'Building servers DataFrame for {len(servers)} server(s)')
+    return pd.DataFrame(servers).transpose()
+
+
+def clear_ui_caches():
+    """
+    Drop the cached UI data (servers DataFrame and logo style), so the next rerun rebuilds it.
+    Called after the saved servers change; also call it after replacing the logo image.
+    """
+    get_servers_dataframe.clear()
+    get_logo_style.clear()
+    LOG.info('Cleared cached UI data')
+
+
+def start_rerun_profile():
+    """Start the profile of the current rerun. Call once at the top of the app script."""
+    st.session_state.rerun_profile = {}
+    st.session_state.rerun_start_time = time.perf_counter()
+
+
+@contextlib.contextmanager
+def profile_step(step: str):
+    """
+    Time a step of the current rerun and record it in the rerun profile and in RERUN_METRICS.
+    Steps interrupted by st.stop or st.rerun are recorded as well.
+    :param step: Name of the step
+    """
+    start_time = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - start_time
+        RERUN_METRICS.record("app", step, seconds)
+        if "rerun_profile" in st.session_state:
+            st.session_state.rerun_profile[step] = seconds * 1000
+
+
+def show_rerun_profile():
+    """
+    Log the time spent in each step of the current rerun and, when PROFILE_RERUNS is set, show
+    it in the sidebar together with the percentiles over all reruns.
+    """
+    profile = st.session_state.get("rerun_profile", {})
+    total_ms = (time.perf_counter() - st.session_state.get("rerun_start_time", time.perf_counter())) * 1000
+    RERUN_METRICS.record("app", "total", total_ms / 1000)
+    LOG.info(f"Rerun took {total_ms:.1f} ms: " + ", ".join(f"{step}={ms:.1f} ms" for step, ms in profile.items()))
+    if not PROFILE_RERUNS:
+        return
+
+    rows = {row["METHOD"]: row for row in RERUN_METRICS.summary_rows(("METHOD",))}
+    with st.sidebar.expander("Rerun Profile", expanded=False):
+        st.dataframe(pd.DataFrame([{"STEP": step,
+                                    "LAST (MS)": profile.get(step, total_ms if step == "total" else None),
+                                    "P50 (MS)": row["P50 (MS)"],
+                                    "P90 (MS)": row["P90 (MS)"],
+                                    "RERUNS": row["REQUESTS"]} for step, row in rows.items()]),
+                     hide_index=True,
+                     column_config={
+                         "LAST (MS)": st.column_config.NumberColumn(format="%.1f"),
+                         "P50 (MS)": st.column_config.NumberColumn(format="%.1f"),
+                         "P90 (MS)": st.column_config.NumberColumn(format="%.1f"),
+                     })
 
 
 def configure_page():
@@ -1,88 +1,57 @@
-import json
 import logging
 import pandas as pd
 
+from lib.analysis_lib import check_annotations, check_input_schema
+from lib.record_lib import ToolRecord
+
 LOG = logging.getLogger(__name__)
 
-def get_input_schema(tool: dict) -> (pd.DataFrame, str):
+NO_INPUT_PARAMS_MESSAGE = "No parameters found in the input schema."
+NO_OUTPUT_SCHEMA_MESSAGE = "No output schema found in the tool model."
+NO_OUTPUT_PARAMS_MESSAGE = "No parameters found in the output schema."
+NO_ANNOTATIONS_MESSAGE = "No annotations found in the tool model."
+
+def get_input_schema(tool: ToolRecord) -> (pd.DataFrame, str):
     """
         Get the input schema of a tool as a list of rows.
-        :param tool: Tool dictionary containing the input schema
+        :param tool: ToolRecord of the tool
         :return: Input schema as a dictionary
     """
-    result = "OK"
-    LOG.info(f"Getting input schema for tool: {tool.get("NAME", "Unknown Tool")}")
-    params_list = []
-    model = tool.get("MODEL_JSON", "{}")
-    # Convert JSON string to json object
-    model_json = json.loads(model)
-
-    input_schema = model_json.get("inputSchema", {})
-    required_params = input_schema.get("required", [])
-    for key, value in input_schema.get("properties", {}).items():
-        row = {"PARAMETER": key, "TITLE": value.get("title", "")}
-        if key in required_params:
-            row["REQUIRED"] = True
-        else:
-            row["REQUIRED"] = False
-
-        for k, v in value.items():
-            if k != "title":
-                row[k.upper()] = v
-
-        if "DESCRIPTION" not in row:
-            row["DESCRIPTION"] = None
-            result = "MISSING/INCOMPLETE"
-
-        params_list.append(row)
+    LOG.info(f"Getting input schema for tool: {tool.name}")
+    params_list = tool.input_params
 
     # Check if params_list is empty
     if not params_list:
-        LOG.warning("No parameters found in the input schema.")
-        raise ValueError("No parameters found in the input schema.")
-    else:
-        df = pd.DataFrame(params_list)
-        df1 = (df.style
-               .map(style_parameter_column, subset=["PARAMETER"])
-               .map(style_highlight_red_if_none, subset=["DESCRIPTION"]))
+        LOG.warning(NO_INPUT_PARAMS_MESSAGE)
+        raise ValueError(NO_INPUT_PARAMS_MESSAGE)
+
+    result = check_input_schema(tool)
+
+    df = pd.DataFrame(params_list)
+    df1 = (df.style
+           .map(style_parameter_column, subset=["PARAMETER"])
+           .map(style_highlight_red_if_none, subset=["DESCRIPTION"]))
 
     return df1, result
 
 
-def get_output_schema(tool: dict) -> pd.DataFrame:
+def get_output_schema(tool: ToolRecord) -> pd.DataFrame:
     """
         Get the output schema of a tool as a list of rows.
-        :param tool: Tool dictionary containing the output schema
+        :param tool: ToolRecord of the tool
         :return: Output schema as a dictionary
     """
-    LOG.info(f"Getting output schema for tool: {tool.get("NAME", "Unknown Tool")}")
-    params_list = []
-    model = tool.get("MODEL_JSON", "{}")
-    # Convert JSON string to json object
-    model_json = json.loads(model)
+    LOG.info(f"Getting output schema for tool: {tool.name}")
+    if not tool.output_schema:
+        LOG.warning(NO_OUTPUT_SCHEMA_MESSAGE)
+        raise ValueError(NO_OUTPUT_SCHEMA_MESSAGE)
 
-    output_schema = model_json.get("outputSchema", {})
-    # required_params = input_schema.get("required", [])
-    if not output_schema:
-        LOG.warning("No output schema found in the tool model.")
-        raise ValueError("No output schema found in the tool model.")
-
-    for key, value in output_schema.get("properties", {}).items():
-        row = {"PARAMETER": key, "TITLE": value.get("title", "")}
-
-        for k, v in value.items():
-            if k != "title":
-                row[k.upper()] = v
-
-        # if "description" not in row:
-        #     row["DESCRIPTION"] = None
-
-        params_list.append(row)
+    params_list = tool.output_params
 
     # Check if params_list is empty
     if not params_list:
-        LOG.warning("No parameters found in the output schema.")
-        raise ValueError("No parameters found in the output schema.")
+        LOG.warning(NO_OUTPUT_PARAMS_MESSAGE)
+        raise ValueError(NO_OUTPUT_PARAMS_MESSAGE)
     else:
         df = pd.DataFrame(params_list)
 
@@ -103,24 +72,18 @@ def style_tool_name_column(val):
     return "font-weight: bold"
 
 
-def get_annotations(tool: dict) -> (pd.DataFrame, str):
+def get_annotations(tool: ToolRecord) -> (pd.DataFrame, str):
     """
         Get the annotations of a tool as a list of rows.
-        :param tool: Tool dictionary containing the annotations
+        :param tool: ToolRecord of the tool
         :return: Annotations as a DataFrame
     """
-    result = "OK"
-    LOG.info(f"Getting annotations for tool: {tool.get("NAME", "Unknown Tool")}")
-
-    model = tool.get("MODEL_JSON", "{}")
-    # Convert JSON string to json object
-    model_json = json.loads(model)
+    LOG.info(f"Getting annotations for tool: {tool.name}")
 
-    annotations = model_json.get("annotations", {})
-    # required_params = input_schema.get("required", [])
+    annotations = tool.annotations
     if not annotations:
-        LOG.warning("No annotations found in the tool model.")
-        raise ValueError("No annotations found in the tool model.")
+        LOG.warning(NO_ANNOTATIONS_MESSAGE)
+        raise ValueError(NO_ANNOTATIONS_MESSAGE)
 
 
     annotations_dict = [{
@@ -130,11 +93,7 @@ def get_annotations(tool: dict) -> (pd.DataFrame, str):
         "IDEMPOTENT HINT": annotations.get("idempotentHint", None),
         "OPEN WORLD HINT": annotations.get("openWorldHint", None),
     }]
-
-    for k, v in annotations_dict[0].items():
-        if v is None:
-            result = "MISSING/INCOMPLETE"
-            break
+    result = check_annotations(tool)
 
     df = pd.DataFrame(annotations_dict)
     df1 = (df.style.map(style_highlight_red_if_none))
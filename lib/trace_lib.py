@@ -0,0 +1,219 @@
+import asyncio
+import contextlib
+import contextvars
+import datetime
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+
+LOG = logging.getLogger(os.path.splitext(os.path.basename(__file__))[0])
+
+TRACE_DIR = os.getenv("MXP_TRACE_DIR", "traces")  # Directory the JSON exporter writes to (one file per trace)
+TRACE_MAX_FILES = 200  # Number of most recent trace files kept by the exporter
+
+# Span that new spans are attached to. Context variables are copied into asyncio tasks, worker
+# threads (asyncio.to_thread) and coroutines submitted with lib.async_lib.run_async, so a span
+# opened on a Streamlit page is the parent of the spans opened by the library code it calls.
+_CURRENT_SPAN = contextvars.ContextVar("mxp_current_span", default=None)
+
+
+class Span:
+    """One timed operation of a trace, with attributes such as token counts and payload sizes."""
+
+    __slots__ = ("name", "trace", "span_id", "parent_id", "start_time", "end_time", "attributes", "status")
+
+    def __init__(self, name: str, trace: "Trace" = None, parent_id: str = None, attributes: dict = None):
+        self.name = name
+        self.trace = trace
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent_id
+        self.start_time = time.perf_counter()
+        self.end_time = None
+        self.attributes = dict(attributes or {})
+        self.status = "OK"
+
+    def set_attribute(self, key: str, value):
+        """Set one attribute of the span."""
+        self.attributes[key] = value
+
+    def set_attributes(self, **attributes):
+        """Set several attributes of the span."""
+        self.attributes.update(attributes)
+
+    @property
+    def duration(self) -> float:
+        """Duration of the span in seconds (up to now if the span has not ended)."""
+        end_time = self.end_time if self.end_time is not None else time.perf_counter()
+        return end_time - self.start_time
+
+    def to_dict(self) -> dict:
+        """
+        Convert the span to a JSON-serializable dictionary. Times are in milliseconds relative
+        to the start of the trace.
+        """
+        origin = self.trace.start_time if self.trace is not None else self.start_time
+        end_time = self.end_time if self.end_time is not None else time.perf_counter()
+        return {
+            "name": self.name,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_ms": (self.start_time - origin) * 1000,
+            "end_ms": (end_time - origin) * 1000,
+            "duration_ms": (end_time - self.start_time) * 1000,
+            "status": self.status,
+            "attributes": self.attributes,
+        }
+
+
+class Trace:
+    """A tree of spans that belong to one end-to-end operation (e.g. one playground run)."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.trace_id = uuid.uuid4().hex
+        self.start_time = time.perf_counter()
+        self.started_at = datetime.datetime.now(datetime.timezone.utc)
+        self.spans = []
+        self._lock = threading.Lock()
+
+    def add_span(self, span: Span):
+        """Register a span with the trace. Spans can be added from any thread."""
+        with self._lock:
+            self.spans.append(span)
+
+    def to_dict(self) -> dict:
+        """Convert the trace to a JSON-serializable dictionary."""
+        with self._lock:
+            spans = list(self.spans)
+        return {
+            "trace_id": self.trace_id,
+            "name": self.name,
+            "started_at": self.started_at.isoformat(),
+            "spans": [span.to_dict() for span in sorted(spans, key=lambda s: s.start_time)],
+        }
+
+
+def get_current_span():
+    """
+    Get the span that is active in the current context.
+    :return: Active span, or None outside of a trace
+    """
+    return _CURRENT_SPAN.get()
+
+
+@contextlib.contextmanager
+def _activate(span: Span):
+    """Make the span current for the enclosed block, marking it as failed if the block raises."""
+    previous = _CURRENT_SPAN.get()
+    # Restore by value rather than with a token: async generators may be resumed in a different context
+    _CURRENT_SPAN.set(span)
+    try:
+        yield span
+    except (asyncio.CancelledError, GeneratorExit):
+        span.status = "CANCELLED"
+        raise
+    except Exception as e:
+        span.status = "ERROR"
+        span.set_attribute("error", f"{type(e).__name__}: {e}")
+        raise
+    finally:
+        span.end_time = time.perf_counter()
+        _CURRENT_SPAN.set(previous)
+
+
+@contextlib.contextmanager
+def start_trace(name: str, export: bool = True, **attributes):
+    """
+    Start a new trace with a root span. Spans opened with `span()` inside the block (including
+    in coroutines and threads started from it) are recorded as its descendants.
+    :param name: Name of the trace and its root span
+    :param export: Write the trace to TRACE_DIR as JSON when the block exits
+    :param attributes: Attributes of the root span
+    :return: Trace object
+    """
+    trace = Trace(name)
+    root = Span(name, trace=trace, attributes=attributes)
+    trace.add_span(root)
+    try:
+        with _activate(root):
+            yield trace
+    finally:
+        if export:
+            try:
+                export_trace(trace)
+            except OSError as e:
+                LOG.warning(f"Could not export trace {trace.trace_id}: {e}")
+
+
+@contextlib.contextmanager
+def span(name: str, **attributes):
+    """
+    Open a child span of the current span. Outside of a trace the span is not recorded, so
+    library code can be instrumented unconditionally.
+    :param name: Name of the span
+    :param attributes: Initial attributes of the span
+    :return: Span object
+    """
+    parent = _CURRENT_SPAN.get()
+    if parent is None or parent.trace is None:
+        yield Span(name, attributes=attributes)
+        return
+
+    child = Span(name, trace=parent.trace, parent_id=parent.span_id, attributes=attributes)
+    parent.trace.add_span(child)
+    with _activate(child):
+        yield child
+
+
+def export_trace(trace: Trace, directory: str = TRACE_DIR) -> str:
+    """
+    Write a trace to a JSON file and prune the oldest files beyond TRACE_MAX_FILES.
+    :param trace: Trace to export
+    :param directory: Directory to write to
+    :return: Path of the written file
+    """
+    os.makedirs(directory, exist_ok=True)
+    file_name = f"{trace.started_at.strftime('%Y%m%dT%H%M%S')}_{trace.trace_id}.json"
+    file_path = os.path.join(directory, file_name)
+    with open(file_path, "w", encoding="utf-8") as f:
+        json.dump(trace.to_dict(), f, indent=2, default=str)
+    LOG.info(f"Exported trace {trace.trace_id} to {file_path}")
+
+    trace_files = sorted(entry for entry in os.listdir(directory) if entry.endswith(".json"))
+    for old_file in trace_files[:-TRACE_MAX_FILES]:
+        with contextlib.suppress(OSError):
+            os.remove(os.path.join(directory, old_file))
+    return file_path
+
+
+def get_waterfall_rows(trace: Trace) -> list:
+    """
+    Flatten a trace into waterfall rows (depth-first, children ordered by start time).
+    :param trace: Trace to flatten
+    :return: List of rows with the span name (indented by depth), start/end/duration in ms and attributes
+    """
+    span_dicts = trace.to_dict()["spans"]
+    children = {}
+    for span_dict in span_dicts:
+        children.setdefault(span_dict["parent_id"], []).append(span_dict)
+
+    rows = []
+
+    def _visit(parent_id, depth):
+        for span_dict in children.get(parent_id, []):
+            rows.append({
+                "ORDER": len(rows),
+                "SPAN": f"{'· ' * depth}{span_dict['name']}",
+                "START (MS)": round(span_dict["start_ms"], 1),
+                "END (MS)": round(span_dict["end_ms"], 1),
+                "DURATION (MS)": round(span_dict["duration_ms"], 1),
+                "STATUS": span_dict["status"],
+                "ATTRIBUTES": json.dumps(span_dict["attributes"], default=str),
+            })
+            _visit(span_dict["span_id"], depth + 1)
+
+    _visit(None, 0)
+    return rows